@@ -53,8 +53,20 @@ class PyCostmap2D:
         self.origin_y = occupancy_map.info.origin.position.y
         self.global_frame_id = occupancy_map.header.frame_id
         self.costmap_timestamp = occupancy_map.header.stamp
-        # Extract costmap
-        self.costmap = np.array(occupancy_map.data, dtype=np.uint8)
+        # Extract costmap, viewing the message data without copying it when
+        # it is a writable buffer of bytes, such as the array of an
+        # OccupancyGrid received by rclpy. setCost then also changes the
+        # message data
+        try:
+            buffer = memoryview(occupancy_map.data)
+        except TypeError:
+            buffer = None
+        if buffer is not None and buffer.itemsize == 1:
+            self.costmap = np.frombuffer(buffer, dtype=np.uint8)
+            if buffer.readonly:
+                self.costmap = self.costmap.copy()
+        else:
+            self.costmap = np.array(occupancy_map.data, dtype=np.uint8)
 
     def getSizeInCellsX(self):
         """Get map width in cells."""
@@ -92,6 +104,17 @@ class PyCostmap2D:
         """Get costmap timestamp."""
         return self.costmap_timestamp
 
+    def getCostmapArray(self) -> np.ndarray:
+        """
+        Get the costmap as a 2D array.
+
+        Returns
+        -------
+            np.ndarray: (size_y, size_x) view of the costs, indexed by [my, mx]
+
+        """
+        return self.costmap.reshape(self.size_y, self.size_x)
+
     def getCostXY(self, mx: int, my: int) -> np.uint8:
         """
         Get the cost of a cell in the costmap using map coordinate XY.
@@ -123,6 +146,22 @@ class PyCostmap2D:
         """
         return self.costmap[index]
 
+    def getCosts(self, mxs, mys) -> np.ndarray:
+        """
+        Get the costs of many cells in the costmap using map coordinates XY.
+
+        Args
+        ----
+            mxs (np.ndarray): map coordinates X of the cells to get cost
+            mys (np.ndarray): map coordinates Y of the cells to get cost
+
+        Returns
+        -------
+            np.ndarray: np.uint8 costs of the cells, shaped like mxs and mys
+
+        """
+        return self.getCostmapArray()[np.asarray(mys), np.asarray(mxs)]
+
     def setCost(self, mx: int, my: int, cost: np.uint8) -> None:
         """
         Set the cost of a cell in the costmap using map coordinate XY.
@@ -160,6 +199,26 @@ class PyCostmap2D:
         wy = self.origin_y + (my + 0.5) * self.resolution
         return (wx, wy)
 
+    def mapToWorldArray(self, mxs, mys):
+        """
+        Get the world coordinates XY of many cells using map coordinates XY.
+
+        Args
+        ----
+            mxs (np.ndarray): map coordinates X to get world coordinates
+            mys (np.ndarray): map coordinates Y to get world coordinates
+
+        Returns
+        -------
+            tuple of np.ndarray: wxs, wys
+            wxs (np.ndarray) [m]: world coordinates X
+            wys (np.ndarray) [m]: world coordinates Y
+
+        """
+        wxs = self.origin_x + (np.asarray(mxs) + 0.5) * self.resolution
+        wys = self.origin_y + (np.asarray(mys) + 0.5) * self.resolution
+        return (wxs, wys)
+
     def worldToMapValidated(self, wx: float, wy: float):
         """
         Get the map coordinate XY using world coordinate XY.
@@ -185,6 +244,36 @@ class PyCostmap2D:
             return (mx, my)
         return (None, None)
 
+    def worldToMapArray(self, wxs, wys):
+        """
+        Get the map coordinates XY of many points using world coordinates XY.
+
+        Args
+        ----
+            wxs (np.ndarray) [m]: world coordinates X to get map coordinates
+            wys (np.ndarray) [m]: world coordinates Y to get map coordinates
+
+        Returns
+        -------
+            tuple of np.ndarray: mxs, mys, valid
+            mxs (np.ndarray): int map coordinates X
+            mys (np.ndarray): int map coordinates Y
+            valid (np.ndarray): bool, False where worldToMapValidated would
+                return (None, None). mxs and mys are not inside the map there
+
+        """
+        wxs = np.asarray(wxs, dtype=np.float64)
+        wys = np.asarray(wys, dtype=np.float64)
+        mxs = np.floor_divide(wxs - self.origin_x, self.resolution)
+        mys = np.floor_divide(wys - self.origin_y, self.resolution)
+        valid = (
+            (wxs >= self.origin_x)
+            & (wys >= self.origin_y)
+            & (mxs < self.size_x)
+            & (mys < self.size_y)
+        )
+        return (mxs.astype(np.int64), mys.astype(np.int64), valid)
+
     def getIndex(self, mx: int, my: int) -> int:
         """
         Get the index of the cell using map coordinate XY.
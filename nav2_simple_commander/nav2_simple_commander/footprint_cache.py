@@ -0,0 +1,190 @@
+#! /usr/bin/env python3
+# Copyright 2021 Samsung Research America
+# Copyright 2022 Afif Swaidan
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+This is a Python3 API for a Footprint Cache.
+
+It precomputes the cells covered by a footprint
+at a number of headings, so that checking the footprint
+at a Pose only needs its cell and heading bin.
+"""
+
+from math import pi
+
+from geometry_msgs.msg import Polygon
+from nav2_simple_commander.line_iterator import LineIterator
+import numpy as np
+
+
+class FootprintCache:
+    """
+    FootprintCache.
+
+    FootprintCache Class for the cells covered by a footprint rotated to each
+    of a number of evenly spaced heading bins. The cells are offsets from
+    the cell of the Pose, computed with the Pose at the center of its cell,
+    so they may differ from the exact footprint by up to half a cell
+    """
+
+    def __init__(
+        self, footprint, resolution: float, num_of_bins=72, include_interior=False
+    ):
+        """
+        Initialize the FootprintCache Object.
+
+        Args
+        ----
+            footprint (Polygon or np.ndarray): the footprint, or an (M, 2)
+                array of the x and y of its points
+            resolution (float) [m/cell]: resolution of the costmaps to check
+            num_of_bins (int): Optional, number of heading bins, defaults to 72
+            include_interior (bool): Optional, also cover the cells with their
+                center inside the footprint, defaults to False
+
+        Raises
+        ------
+            ValueError: When the footprint has less than 2 points, or the
+                resolution or num_of_bins is not positive
+
+        """
+        if isinstance(footprint, Polygon):
+            footprint = [[point.x, point.y] for point in footprint.points]
+        footprint = np.asarray(footprint, dtype=np.float64).reshape(-1, 2)
+
+        if len(footprint) < 2:
+            raise ValueError('footprint must have at least 2 points')
+
+        if resolution <= 0:
+            raise ValueError('resolution must be a positive number')
+
+        if num_of_bins <= 0:
+            raise ValueError('num_of_bins must be a positive number')
+
+        self.footprint = footprint
+        self.resolution = resolution
+        self.num_of_bins = num_of_bins
+        self.include_interior = include_interior
+        self.bin_size = 2.0 * pi / num_of_bins
+
+        offsets = [self.getOffsets(i * self.bin_size) for i in range(num_of_bins)]
+
+        # Pad every bin to the same number of cells by repeating its first
+        # cell, which does not change the maximum cost of the bin
+        num_of_cells = max(len(bin_offsets) for bin_offsets in offsets)
+        self.offsets_x = np.empty((num_of_bins, num_of_cells), dtype=np.int64)
+        self.offsets_y = np.empty((num_of_bins, num_of_cells), dtype=np.int64)
+        for i, bin_offsets in enumerate(offsets):
+            self.offsets_x[i] = bin_offsets[0, 0]
+            self.offsets_y[i] = bin_offsets[0, 1]
+            self.offsets_x[i, : len(bin_offsets)] = bin_offsets[:, 0]
+            self.offsets_y[i, : len(bin_offsets)] = bin_offsets[:, 1]
+
+    def getOffsets(self, theta: float) -> np.ndarray:
+        """
+        Get the cells covered by the footprint rotated to a heading.
+
+        Args
+        ----
+            theta (float): absolute rotation angle of the footprint
+
+        Returns
+        -------
+            np.ndarray: (K, 2) int offsets of the covered cells from the cell
+                of the Pose, sorted by x and then y
+
+        """
+        cos_th = np.cos(theta)
+        sin_th = np.sin(theta)
+
+        # Points in cells from the center of the cell of the Pose
+        xs = (self.footprint[:, 0] * cos_th - self.footprint[:, 1] * sin_th) / (
+            self.resolution
+        )
+        ys = (self.footprint[:, 0] * sin_th + self.footprint[:, 1] * cos_th) / (
+            self.resolution
+        )
+        mxs = np.floor(xs + 0.5).astype(np.int64)
+        mys = np.floor(ys + 0.5).astype(np.int64)
+
+        cells = [
+            np.column_stack(
+                LineIterator.cellArrays(
+                    mxs[i], mys[i], mxs[(i + 1) % len(mxs)], mys[(i + 1) % len(mys)]
+                )
+            )
+            for i in range(len(mxs))
+        ]
+
+        if self.include_interior:
+            # Even-odd test of the cell centers in the bounding box
+            grid_xs, grid_ys = np.meshgrid(
+                np.arange(mxs.min(), mxs.max() + 1),
+                np.arange(mys.min(), mys.max() + 1),
+                indexing='ij',
+            )
+            px = grid_xs.reshape(-1, 1)
+            py = grid_ys.reshape(-1, 1)
+            x2s = np.roll(xs, -1)
+            y2s = np.roll(ys, -1)
+
+            with np.errstate(divide='ignore', invalid='ignore'):
+                crosses = ((ys > py) != (y2s > py)) & (
+                    px < xs + (py - ys) * (x2s - xs) / (y2s - ys)
+                )
+
+            inside = np.count_nonzero(crosses, axis=1) % 2 == 1
+            cells.append(np.column_stack((px[inside, 0], py[inside, 0])))
+
+        return np.unique(np.concatenate(cells), axis=0)
+
+    def getBins(self, thetas) -> np.ndarray:
+        """
+        Get the heading bins closest to rotation angles.
+
+        Args
+        ----
+            thetas (np.ndarray): absolute rotation angles
+
+        Returns
+        -------
+            np.ndarray: int heading bins of the angles
+
+        """
+        return np.mod(
+            np.round(np.asarray(thetas, dtype=np.float64) / self.bin_size), self.num_of_bins
+        ).astype(np.int64)
+
+    def getCells(self, mxs, mys, thetas):
+        """
+        Get the cells covered by the footprint at many Poses.
+
+        Args
+        ----
+            mxs (np.ndarray): (N,) map coordinates X of the cells of the Poses
+            mys (np.ndarray): (N,) map coordinates Y of the cells of the Poses
+            thetas (np.ndarray): (N,) absolute rotation angles of the footprint
+
+        Returns
+        -------
+            tuple of np.ndarray: xs, ys
+            xs (np.ndarray): (N, K) int map coordinates X of the covered cells
+            ys (np.ndarray): (N, K) int map coordinates Y of the covered cells
+
+        """
+        bins = self.getBins(thetas)
+        xs = np.asarray(mxs, dtype=np.int64)[:, np.newaxis] + self.offsets_x[bins]
+        ys = np.asarray(mys, dtype=np.int64)[:, np.newaxis] + self.offsets_y[bins]
+        return (xs, ys)
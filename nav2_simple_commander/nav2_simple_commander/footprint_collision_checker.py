@@ -21,11 +21,13 @@ It provides the needed methods to manipulate the coordinates
 and calculate the cost of a Footprint
 """
 
-from math import cos, sin
+from math import atan2, cos, sin
 
 from geometry_msgs.msg import Point32, Polygon
 from nav2_simple_commander.costmap_2d import PyCostmap2D
+from nav2_simple_commander.footprint_cache import FootprintCache
 from nav2_simple_commander.line_iterator import LineIterator
+import numpy as np
 
 NO_INFORMATION = 255
 LETHAL_OBSTACLE = 254
@@ -47,13 +49,15 @@ class FootprintCollisionChecker:
         self.costmap_ = None
         pass
 
-    def footprintCost(self, footprint: Polygon):
+    def footprintCost(self, footprint: Polygon, traversal='step'):
         """
         Iterate over all the points in a footprint and check for collision.
 
         Args
         ----
             footprint (Polygon): The footprint to calculate the collision cost for
+            traversal (str): Optional, How the edges are walked, see lineCost,
+                defaults to 'step'
 
         Returns
         -------
@@ -81,16 +85,21 @@ class FootprintCollisionChecker:
             if x1 is None or y1 is None:
                 return LETHAL_OBSTACLE
 
-            footprint_cost = max(float(self.lineCost(x0, x1, y0, y1)), footprint_cost)
+            footprint_cost = max(
+                float(self.lineCost(x0, x1, y0, y1, traversal=traversal)), footprint_cost
+            )
             x0 = x1
             y0 = y1
 
             if footprint_cost == LETHAL_OBSTACLE:
                 return footprint_cost
 
-        return max(float(self.lineCost(xstart, x1, ystart, y1)), footprint_cost)
+        return max(
+            float(self.lineCost(xstart, x1, ystart, y1, traversal=traversal)),
+            footprint_cost,
+        )
 
-    def lineCost(self, x0, x1, y0, y1, step_size=0.5):
+    def lineCost(self, x0, x1, y0, y1, step_size=0.5, traversal='step'):
         """
         Iterate over all the points along a line and check for collision.
 
@@ -101,6 +110,12 @@ class FootprintCollisionChecker:
             x1 (float): Abscissa of the final point in map coordinates
             y1 (float): Ordinate of the final point in map coordinates
             step_size (float): Optional, Increments' resolution, defaults to 0.5
+            traversal (str): Optional, How the line is walked, defaults to 'step'
+                'step': LineIterator points step_size apart
+                'cells': every cell once with LineIterator.cells, the
+                    coordinates must be int
+                'array': the same cells as 'cells' looked up at once with
+                    LineIterator.cellArrays
 
         Returns
         -------
@@ -108,7 +123,34 @@ class FootprintCollisionChecker:
             line_cost (float): The maximum cost found in the line points
 
         """
+        if traversal == 'array':
+            xs, ys = LineIterator.cellArrays(x0, y0, x1, y1)
+            if self.costmap_ is None:
+                raise ValueError(
+                    'Costmap not specified, use setCostmap to specify the costmap first'
+                )
+            costs = self.costmap_.getCosts(xs, ys)
+            if (costs == LETHAL_OBSTACLE).any():
+                return LETHAL_OBSTACLE
+            return float(costs.max())
+
         line_cost = 0.0
+
+        if traversal == 'cells':
+            for mx, my in LineIterator.cells(x0, y0, x1, y1):
+                point_cost = self.pointCost(mx, my)
+
+                if point_cost == LETHAL_OBSTACLE:
+                    return point_cost
+
+                if line_cost < point_cost:
+                    line_cost = point_cost
+
+            return line_cost
+
+        if traversal != 'step':
+            raise ValueError(f'Unsupported traversal: {traversal}')
+
         point_cost = -1.0
         line_iterator = LineIterator(x0, y0, x1, y1, step_size)
 
@@ -186,7 +228,9 @@ class FootprintCollisionChecker:
         self.costmap_ = costmap
         return None
 
-    def footprintCostAtPose(self, x: float, y: float, theta: float, footprint: Polygon):
+    def footprintCostAtPose(
+        self, x: float, y: float, theta: float, footprint: Polygon, traversal='step'
+    ):
         """
         Get the cost of a footprint at a specific Pose in map coordinates.
 
@@ -196,6 +240,8 @@ class FootprintCollisionChecker:
             y (float): map coordinate Y
             theta (float): absolute rotation angle of the footprint
             footprint (Polygon): the footprint to calculate its cost at the given Pose
+            traversal (str): Optional, How the edges are walked, see lineCost,
+                defaults to 'step'
 
         Returns
         -------
@@ -217,4 +263,305 @@ class FootprintCollisionChecker:
             )
             oriented_footprint.points.append(new_pt)
 
-        return self.footprintCost(oriented_footprint)
+        return self.footprintCost(oriented_footprint, traversal)
+
+    def footprintCostsAtPoses(self, poses, footprint, step_size=0.5):
+        """
+        Get the cost of a footprint at many Poses in map coordinates at once.
+
+        Gives the same costs as calling footprintCostAtPose for every pose,
+        but rotates the footprint, samples its edges and looks up the cells
+        of all the poses with numpy instead of one point at a time.
+        Edges whose ends fall in the same cell are checked as that single
+        cell rather than raising a ValueError.
+
+        With a FootprintCache, the cost is the maximum cost of the cached
+        cells of the nearest heading bin at the cell of each Pose, or
+        LETHAL_OBSTACLE if one of them is lethal.
+
+        Args
+        ----
+            poses (np.ndarray): (N, 3) array of the x, y and theta of each Pose
+            footprint (Polygon, np.ndarray or FootprintCache): the footprint,
+                an (M, 2) array of the x and y of its points, or its cells
+            step_size (float): Optional, Increments' resolution along the
+                edges in cells, defaults to 0.5
+
+        Returns
+        -------
+            np.ndarray: (N,) array of the cost of the footprint at each Pose,
+                LETHAL_OBSTACLE where a collision was found or a point of the
+                footprint is outside of the costmap
+
+        """
+        mxs, mys, in_map = self._getFootprintCells(poses, footprint, step_size)
+        cells = self.costmap_.getCosts(mxs, mys)
+
+        if isinstance(footprint, FootprintCache):
+            costs = np.where(
+                (cells == LETHAL_OBSTACLE).any(axis=1),
+                LETHAL_OBSTACLE,
+                cells.max(axis=1, initial=FREE_SPACE),
+            )
+            return np.where(in_map, costs, LETHAL_OBSTACLE).astype(np.float64)
+
+        edge_costs = np.where(
+            (cells == LETHAL_OBSTACLE).any(axis=2), LETHAL_OBSTACLE, cells.max(axis=2)
+        )
+
+        # footprintCost stops at the first edge of at least LETHAL_OBSTACLE,
+        # which only differs from the maximum when that edge is lethal
+        high = edge_costs >= LETHAL_OBSTACLE
+        first_high = edge_costs[np.arange(len(in_map)), np.argmax(high, axis=1)]
+        costs = np.where(high.any(axis=1), first_high, edge_costs.max(axis=1))
+
+        return np.where(in_map, costs, LETHAL_OBSTACLE).astype(np.float64)
+
+    def pathCost(self, path, footprint, num_of_bins=72):
+        """
+        Get the cost of the area swept by a footprint along a whole path.
+
+        The footprint is rasterized once per heading bin by a FootprintCache,
+        and once per distinct cell and heading bin of the path's Poses. The
+        union of their cells is looked up in the costmap at once, so that a
+        cell shared by neighboring poses is only looked up once. A pose is
+        lethal if its footprint covers a LETHAL_OBSTACLE cell or leaves the
+        costmap.
+
+        Args
+        ----
+            path (Path or np.ndarray): the path, or an (N, 3) array of the
+                x, y and theta of each of its Poses
+            footprint (Polygon, np.ndarray or FootprintCache): the footprint,
+                an (M, 2) array of the x and y of its points, or its cells
+            num_of_bins (int): Optional, number of heading bins of the
+                FootprintCache built for a footprint that is not one,
+                defaults to 72
+
+        Returns
+        -------
+            tuple: max_cost, mean_cost, first_lethal_index
+            max_cost (float): The maximum cost of the swept cells,
+                LETHAL_OBSTACLE if the footprint leaves the costmap
+            mean_cost (float): The mean cost of the swept cells inside the
+                costmap, LETHAL_OBSTACLE if there are none
+            first_lethal_index (int): The index of the first lethal pose,
+                None if no pose is lethal
+
+        """
+        if self.costmap_ is None:
+            raise ValueError(
+                'Costmap not specified, use setCostmap to specify the costmap first'
+            )
+
+        poses = self._getPathPoses(path)
+
+        if len(poses) == 0:
+            return (float(FREE_SPACE), float(FREE_SPACE), None)
+
+        if not isinstance(footprint, FootprintCache):
+            footprint = FootprintCache(footprint, self.costmap_.resolution, num_of_bins)
+
+        # Poses in the same cell and heading bin cover the same cells
+        mxs, mys, valid = self.costmap_.worldToMapArray(poses[:, 0], poses[:, 1])
+        placements = np.stack([mxs, mys, footprint.getBins(poses[:, 2]), valid], axis=1)
+        _, first_poses, placement_of_pose = np.unique(
+            placements, axis=0, return_index=True, return_inverse=True
+        )
+        xs, ys, in_map = self._getCachedFootprintCells(poses[first_poses], footprint)
+
+        # Look up the cost of every swept cell once
+        indices = self.costmap_.getIndex(xs[in_map], ys[in_map])
+        swept_indices, inverse = np.unique(indices, return_inverse=True)
+        swept_costs = self.costmap_.getCosts(
+            swept_indices % self.costmap_.size_x, swept_indices // self.costmap_.size_x
+        )
+
+        lethal = ~in_map
+        lethal[in_map] = (swept_costs == LETHAL_OBSTACLE)[
+            inverse.reshape(indices.shape)
+        ].any(axis=1)
+        lethal = lethal[placement_of_pose.reshape(-1)]
+
+        if not in_map.all():
+            max_cost = float(max(swept_costs.max(initial=0), LETHAL_OBSTACLE))
+        else:
+            max_cost = float(swept_costs.max())
+
+        if len(swept_costs) > 0:
+            mean_cost = float(swept_costs.mean())
+        else:
+            mean_cost = float(LETHAL_OBSTACLE)
+
+        first_lethal_index = int(np.argmax(lethal)) if lethal.any() else None
+
+        return (max_cost, mean_cost, first_lethal_index)
+
+    def _getPathPoses(self, path):
+        """
+        Get the x, y and theta of every Pose of a path.
+
+        Args
+        ----
+            path (Path or np.ndarray): the path, or an (N, 3) array of the
+                x, y and theta of each of its Poses
+
+        Returns
+        -------
+            np.ndarray: (N, 3) array of the x, y and theta of each Pose
+
+        """
+        if not hasattr(path, 'poses'):
+            return np.asarray(path, dtype=np.float64).reshape(-1, 3)
+
+        poses = np.empty((len(path.poses), 3))
+        for i, pose_stamped in enumerate(path.poses):
+            position = pose_stamped.pose.position
+            q = pose_stamped.pose.orientation
+            poses[i] = (
+                position.x,
+                position.y,
+                atan2(2.0 * (q.w * q.z + q.x * q.y), 1.0 - 2.0 * (q.y * q.y + q.z * q.z)),
+            )
+        return poses
+
+    def _getFootprintCells(self, poses, footprint, step_size):
+        """
+        Get the cells along the edges of a footprint at many Poses.
+
+        The edges are walked in the same order and with the same points as
+        footprintCost walks them with LineIterator. Samples past the end of
+        an edge repeat its last cell.
+
+        Args
+        ----
+            poses (np.ndarray): (N, 3) array of the x, y and theta of each Pose
+            footprint (Polygon, np.ndarray or FootprintCache): the footprint,
+                an (M, 2) array of the x and y of its points, or its cells
+            step_size (float): Increments' resolution along the edges in cells
+
+        Returns
+        -------
+            tuple of np.ndarray: mxs, mys, in_map
+            mxs (np.ndarray): (N, M, S) int map coordinates X of the samples
+                of every edge at every Pose, (N, K) for the cells of a
+                FootprintCache
+            mys (np.ndarray): int map coordinates Y of the samples
+            in_map (np.ndarray): (N,) bool, False where a point of the
+                footprint is outside of the costmap. The samples of those
+                Poses are all cell (0, 0)
+
+        """
+        if self.costmap_ is None:
+            raise ValueError(
+                'Costmap not specified, use setCostmap to specify the costmap first'
+            )
+
+        if step_size <= 0:
+            raise ValueError('step_size must be a positive number')
+
+        poses = np.asarray(poses, dtype=np.float64).reshape(-1, 3)
+
+        if isinstance(footprint, FootprintCache):
+            return self._getCachedFootprintCells(poses, footprint)
+
+        if isinstance(footprint, Polygon):
+            footprint = [[point.x, point.y] for point in footprint.points]
+        footprint = np.asarray(footprint, dtype=np.float64).reshape(-1, 2)
+
+        if len(footprint) < 2:
+            raise ValueError('footprint must have at least 2 points')
+
+        # Points of the footprint at every pose, (N, M)
+        cos_th = np.cos(poses[:, 2:3])
+        sin_th = np.sin(poses[:, 2:3])
+        wxs = poses[:, 0:1] + (footprint[:, 0] * cos_th - footprint[:, 1] * sin_th)
+        wys = poses[:, 1:2] + (footprint[:, 0] * sin_th + footprint[:, 1] * cos_th)
+
+        mxs, mys, valid = self.costmap_.worldToMapArray(wxs, wys)
+        in_map = valid.all(axis=1)
+
+        # Footprints with a point outside of the map are in collision, so
+        # their points are moved to cell (0, 0) to keep the lookups valid
+        mxs = np.where(in_map[:, np.newaxis], mxs, 0).astype(np.float64)
+        mys = np.where(in_map[:, np.newaxis], mys, 0).astype(np.float64)
+
+        # The edges of footprintCost: each point to the next one, then the
+        # first point to the last one, (N, M)
+        x0s = np.concatenate((mxs[:, :-1], mxs[:, :1]), axis=1)
+        y0s = np.concatenate((mys[:, :-1], mys[:, :1]), axis=1)
+        x1s = np.concatenate((mxs[:, 1:], mxs[:, -1:]), axis=1)
+        y1s = np.concatenate((mys[:, 1:], mys[:, -1:]), axis=1)
+
+        # Walk every edge like LineIterator: along x unless it is vertical,
+        # clamping the samples past its end to the end point
+        vertical = x0s == x1s
+        num_of_steps = int(
+            np.ceil(
+                max(np.abs(x1s - x0s).max(initial=0), np.abs(y1s - y0s).max(initial=0))
+                / step_size
+            )
+        )
+        offsets = np.arange(num_of_steps + 1) * step_size
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            slopes = (y1s - y0s) / (x1s - x0s)
+            intercepts = y1s - slopes * x1s
+
+        xs = np.where(
+            (x1s > x0s)[..., np.newaxis],
+            np.minimum(x0s[..., np.newaxis] + offsets, x1s[..., np.newaxis]),
+            np.maximum(x0s[..., np.newaxis] - offsets, x1s[..., np.newaxis]),
+        )
+        ys = np.where(
+            (y1s > y0s)[..., np.newaxis],
+            np.minimum(y0s[..., np.newaxis] + offsets, y1s[..., np.newaxis]),
+            np.maximum(y0s[..., np.newaxis] - offsets, y1s[..., np.newaxis]),
+        )
+        with np.errstate(invalid='ignore'):
+            line_ys = np.round(
+                slopes[..., np.newaxis] * xs + intercepts[..., np.newaxis], 5
+            )
+        xs = np.round(xs, 5)
+        ys = np.where(vertical[..., np.newaxis], np.round(ys, 5), line_ys)
+        ys[..., 0] = y0s
+
+        # Map coordinates are never negative, so truncating floors them
+        return (xs.astype(np.int64), ys.astype(np.int64), in_map)
+
+    def _getCachedFootprintCells(self, poses, footprint_cache: FootprintCache):
+        """
+        Get the cached cells of a footprint at many Poses.
+
+        Args
+        ----
+            poses (np.ndarray): (N, 3) array of the x, y and theta of each Pose
+            footprint_cache (FootprintCache): the cells of the footprint
+
+        Returns
+        -------
+            tuple of np.ndarray: mxs, mys, in_map
+            mxs (np.ndarray): (N, K) int map coordinates X of the cells
+            mys (np.ndarray): (N, K) int map coordinates Y of the cells
+            in_map (np.ndarray): (N,) bool, False where a cell is outside of
+                the costmap. The cells of those Poses are all cell (0, 0)
+
+        """
+        if not np.isclose(footprint_cache.resolution, self.costmap_.resolution):
+            raise ValueError(
+                f'FootprintCache resolution {footprint_cache.resolution} does not '
+                f'match the costmap resolution {self.costmap_.resolution}'
+            )
+
+        mxs, mys, in_map = self.costmap_.worldToMapArray(poses[:, 0], poses[:, 1])
+        xs, ys = footprint_cache.getCells(mxs, mys, poses[:, 2])
+        in_map &= (
+            (xs >= 0).all(axis=1)
+            & (ys >= 0).all(axis=1)
+            & (xs < self.costmap_.size_x).all(axis=1)
+            & (ys < self.costmap_.size_y).all(axis=1)
+        )
+
+        xs = np.where(in_map[:, np.newaxis], xs, 0)
+        ys = np.where(in_map[:, np.newaxis], ys, 0)
+        return (xs, ys, in_map)
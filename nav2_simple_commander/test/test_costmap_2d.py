@@ -0,0 +1,84 @@
+# Copyright 2022 Afif Swaidan
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import unittest
+
+from nav2_simple_commander.costmap_2d import PyCostmap2D
+from nav_msgs.msg import OccupancyGrid
+import numpy as np
+
+
+class TestCostmap2D(unittest.TestCase):
+
+    def setUp(self):
+        # Create test grid 4 pixels wide by 3 pixels long, at 0.5 meters per pixel
+        # Map origin is at (1,2) of world coordinates
+        self.occupancyGrid_ = OccupancyGrid()
+        self.occupancyGrid_.info.resolution = 0.5
+        self.occupancyGrid_.info.width = 4
+        self.occupancyGrid_.info.height = 3
+        self.occupancyGrid_.info.origin.position.x = 1.0
+        self.occupancyGrid_.info.origin.position.y = 2.0
+        self.occupancyGrid_.data = list(range(12))
+        self.occupancyGrid_.data[11] = -1
+        self.costmap_ = PyCostmap2D(self.occupancyGrid_)
+
+    def test_getCostmapArray(self):
+        # Test if the 2D array is indexed by [my, mx]
+        costmap_array = self.costmap_.getCostmapArray()
+        self.assertEqual(costmap_array.shape, (3, 4))
+        self.assertEqual(costmap_array[1, 2], self.costmap_.getCostXY(2, 1))
+        self.assertEqual(costmap_array[1, 2], 6)
+        # Unknown cells have the NO_INFORMATION cost
+        self.assertEqual(costmap_array[2, 3], 255)
+        # Setting a cost is seen through the 2D array
+        self.costmap_.setCost(0, 2, 100)
+        self.assertEqual(costmap_array[2, 0], 100)
+
+    def test_getCosts(self):
+        # Test if the costs match the costs of each cell
+        mxs = np.array([[0, 3], [2, 1]])
+        mys = np.array([[0, 1], [2, 2]])
+        costs = self.costmap_.getCosts(mxs, mys)
+        self.assertEqual(costs.shape, (2, 2))
+        self.assertEqual(costs.tolist(), [[0, 7], [10, 9]])
+        self.assertRaises(IndexError, self.costmap_.getCosts, [4], [0])
+
+    def test_worldToMapArray(self):
+        # Test if the map coordinates match worldToMapValidated
+        wxs = [0.9, 1.0, 1.2, 2.6, 3.0, 2.9, 1.5]
+        wys = [2.0, 1.9, 2.4, 3.4, 2.0, 3.5, 3.49]
+        mxs, mys, valid = self.costmap_.worldToMapArray(wxs, wys)
+        for wx, wy, mx, my, is_valid in zip(wxs, wys, mxs, mys, valid):
+            if is_valid:
+                self.assertEqual(self.costmap_.worldToMapValidated(wx, wy), (mx, my))
+            else:
+                self.assertEqual(
+                    self.costmap_.worldToMapValidated(wx, wy), (None, None)
+                )
+        self.assertEqual(
+            valid.tolist(), [False, False, True, True, False, False, True]
+        )
+
+    def test_mapToWorldArray(self):
+        # Test if the world coordinates match mapToWorld
+        mxs = np.array([0, 3, 2])
+        mys = np.array([0, 1, 2])
+        wxs, wys = self.costmap_.mapToWorldArray(mxs, mys)
+        for mx, my, wx, wy in zip(mxs, mys, wxs, wys):
+            self.assertEqual(self.costmap_.mapToWorld(mx, my), (wx, wy))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,121 @@
+# Copyright 2022 Afif Swaidan
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from math import pi
+import unittest
+
+from nav2_simple_commander.costmap_2d import PyCostmap2D
+from nav2_simple_commander.footprint_cache import FootprintCache
+from nav2_simple_commander.footprint_collision_checker import FootprintCollisionChecker
+from nav_msgs.msg import OccupancyGrid
+import numpy as np
+
+LETHAL_OBSTACLE = 254
+
+# Rectangular footprint 2m x 1m
+FOOTPRINT = [[1.0, 0.5], [1.0, -0.5], [-1.0, -0.5], [-1.0, 0.5]]
+
+
+class TestFootprintCache(unittest.TestCase):
+
+    def test_value_error(self):
+        # Test if a value error raised when passing invalid arguments
+        self.assertRaises(ValueError, FootprintCache, [[0.0, 0.0]], 1.0)
+        self.assertRaises(ValueError, FootprintCache, FOOTPRINT, 0.0)
+        self.assertRaises(ValueError, FootprintCache, FOOTPRINT, 1.0, 0)
+
+    def test_getOffsets(self):
+        # Test if the outline cells are offsets from the cell of the Pose
+        footprint_cache = FootprintCache(FOOTPRINT, 0.5, 4)
+        offsets = footprint_cache.getOffsets(0.0)
+        self.assertEqual(offsets.min(axis=0).tolist(), [-2, -1])
+        self.assertEqual(offsets.max(axis=0).tolist(), [2, 1])
+        # Only the 3 cells in the middle are not on the outline
+        self.assertEqual(len(offsets), 5 * 3 - 3)
+        # Test if the footprint is rotated by a quarter turn
+        offsets = footprint_cache.getOffsets(pi / 2)
+        self.assertEqual(offsets.min(axis=0).tolist(), [-1, -2])
+        self.assertEqual(offsets.max(axis=0).tolist(), [1, 2])
+        # Test if the interior is covered as well
+        footprint_cache = FootprintCache(FOOTPRINT, 0.5, 4, include_interior=True)
+        self.assertEqual(len(footprint_cache.getOffsets(0.0)), 5 * 3)
+
+    def test_getBins(self):
+        # Test if angles go to the nearest heading bin
+        footprint_cache = FootprintCache(FOOTPRINT, 0.5, 8)
+        self.assertEqual(
+            footprint_cache.getBins([0.0, 0.3, 0.5, pi, -pi / 4, 2 * pi]).tolist(),
+            [0, 0, 1, 4, 7, 0],
+        )
+        # Test if the cells of a Pose use the offsets of its bin
+        xs, ys = footprint_cache.getCells([5], [7], [pi / 2])
+        self.assertEqual(xs[0].min(), 4)
+        self.assertEqual(xs[0].max(), 6)
+        self.assertEqual(ys[0].min(), 5)
+        self.assertEqual(ys[0].max(), 9)
+
+    def test_footprintCostsAtPoses(self):
+        # Test if the cached footprint cost is calculated correctly
+        # Create test grid 10 pixels wide by 10 pixels long, at 1 meters per pixel
+        # AKA 10 meters x 10 meters
+        occupancyGrid_ = OccupancyGrid()
+        occupancyGrid_.info.resolution = 1.0
+        occupancyGrid_.info.width = 10
+        occupancyGrid_.info.height = 10
+        occupancyGrid_.info.origin.position.x = 0.0
+        occupancyGrid_.info.origin.position.y = 0.0
+        map_data = [0] * 10 * 10
+        map_data[44] = 100
+        # OccupancyGrid data is int8, so LETHAL_OBSTACLE is stored as -2
+        map_data[77] = LETHAL_OBSTACLE - 256
+        occupancyGrid_.data = map_data
+        costmap_ = PyCostmap2D(occupancyGrid_)
+        fcc_ = FootprintCollisionChecker()
+        fcc_.setCostmap(costmap_)
+        # Create rectangular footprint 4m x 2m
+        footprint = [[2.0, 1.0], [2.0, -1.0], [-2.0, -1.0], [-2.0, 1.0]]
+        footprint_cache = FootprintCache(footprint, 1.0, 16)
+        interior_cache = FootprintCache(footprint, 1.0, 16, include_interior=True)
+        poses = np.array(
+            [
+                [2.5, 2.5, 0.0],
+                [4.5, 3.5, 0.0],
+                [4.5, 4.5, 0.0],
+                [7.5, 5.5, pi / 2],
+                [7.5, 6.5, pi / 2],
+                [0.5, 5.5, 0.0],
+            ]
+        )
+        self.assertEqual(
+            fcc_.footprintCostsAtPoses(poses, footprint_cache).tolist(),
+            [0.0, 100.0, 0.0, 254.0, 0.0, 254.0],
+        )
+        # The cells at the center of the footprint are only checked with the
+        # interior
+        self.assertEqual(
+            fcc_.footprintCostsAtPoses(poses, interior_cache).tolist(),
+            [0.0, 100.0, 100.0, 254.0, 254.0, 254.0],
+        )
+        self.assertEqual(fcc_.pathCost(poses[:3], interior_cache)[2], None)
+        # Test if a value error raised when the resolutions do not match
+        self.assertRaises(
+            ValueError,
+            fcc_.footprintCostsAtPoses,
+            poses,
+            FootprintCache(footprint, 0.5, 16),
+        )
+
+
+if __name__ == '__main__':
+    unittest.main()
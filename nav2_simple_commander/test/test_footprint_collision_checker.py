@@ -14,10 +14,13 @@
 
 import unittest
 
-from geometry_msgs.msg import Point32, Polygon
+from math import cos, sin
+
+from geometry_msgs.msg import Point32, Polygon, PoseStamped
 from nav2_simple_commander.costmap_2d import PyCostmap2D
 from nav2_simple_commander.footprint_collision_checker import FootprintCollisionChecker
-from nav_msgs.msg import OccupancyGrid
+from nav_msgs.msg import OccupancyGrid, Path
+import numpy as np
 
 LETHAL_OBSTACLE = 254
 
@@ -29,6 +32,7 @@ class TestFootprintCollisionChecker(unittest.TestCase):
         fcc_ = FootprintCollisionChecker()
         self.assertRaises(ValueError, fcc_.worldToMapValidated, 0.0, 0.0)
         self.assertRaises(ValueError, fcc_.pointCost, 0.0, 0.0)
+        self.assertRaises(ValueError, fcc_.pathCost, [[0.0, 0.0, 0.0]], [[1.0, 1.0]])
 
     def test_pointCost(self):
         # Test if point cost is calculated correctly
@@ -87,6 +91,16 @@ class TestFootprintCollisionChecker(unittest.TestCase):
         fcc_.setCostmap(costmap_)
         self.assertRaises(IndexError, fcc_.lineCost, 0, 15, 0, 9, 1)
         self.assertEqual(fcc_.lineCost(0, 9, 0, 9, 1), 0.0)
+        # Test if the integer cell traversals give the same costs
+        map_data[33] = 100
+        occupancyGrid_.data = map_data
+        costmap_ = PyCostmap2D(occupancyGrid_)
+        fcc_.setCostmap(costmap_)
+        for traversal in ['step', 'cells', 'array']:
+            self.assertEqual(fcc_.lineCost(0, 9, 0, 9, traversal=traversal), 100.0)
+            self.assertEqual(fcc_.lineCost(0, 9, 0, 2, traversal=traversal), 0.0)
+        self.assertRaises(IndexError, fcc_.lineCost, 0, 15, 0, 9, traversal='array')
+        self.assertRaises(ValueError, fcc_.lineCost, 0, 9, 0, 9, traversal='unknown')
 
     def test_footprintCost(self):
         # Test if footprint cost is calculated correctly
@@ -147,6 +161,109 @@ class TestFootprintCollisionChecker(unittest.TestCase):
         footprint.points.append(point)
         self.assertEqual(fcc_.footprintCost(footprint), LETHAL_OBSTACLE)
 
+    def test_footprintCostsAtPoses(self):
+        # Test if the batch costs match the cost at each pose
+        # Create test grid 10 pixels wide by 10 pixels long, at 1 meters per pixel
+        # AKA 10 meters x 10 meters
+        occupancyGrid_ = OccupancyGrid()
+        occupancyGrid_.info.resolution = 1.0
+        occupancyGrid_.info.width = 10
+        occupancyGrid_.info.height = 10
+        occupancyGrid_.info.origin.position.x = 0.0
+        occupancyGrid_.info.origin.position.y = 0.0
+        map_data = [0] * 10 * 10
+        # Create in the map center a full box of cost value 100
+        for i in range(24, 28):
+            map_data[i] = 100
+            map_data[i + 10] = 100
+            map_data[i + 20] = 100
+            map_data[i + 30] = 100
+            map_data[i + 40] = 100
+        # OccupancyGrid data is int8, so LETHAL_OBSTACLE is stored as -2
+        map_data[77] = LETHAL_OBSTACLE - 256
+        occupancyGrid_.data = map_data
+        costmap_ = PyCostmap2D(occupancyGrid_)
+        fcc_ = FootprintCollisionChecker()
+        fcc_.setCostmap(costmap_)
+        # Create rectangular footprint 2m x 1m
+        footprint = Polygon()
+        for x, y in [(1.0, 0.5), (1.0, -0.5), (-1.0, -0.5), (-1.0, 0.5)]:
+            point = Point32()
+            point.x = x
+            point.y = y
+            footprint.points.append(point)
+        poses = np.array(
+            [
+                [1.5, 1.5, 0.0],
+                [5.0, 3.0, 0.0],
+                [5.0, 5.0, 1.2],
+                [7.5, 7.5, 0.3],
+                [0.5, 5.0, 0.0],
+                [9.5, 9.5, -2.0],
+            ]
+        )
+        expected = [
+            fcc_.footprintCostAtPose(x, y, theta, footprint)
+            for x, y, theta in poses.tolist()
+        ]
+        self.assertEqual(expected, [0.0, 100.0, 100.0, 254.0, 254.0, 254.0])
+        self.assertEqual(fcc_.footprintCostsAtPoses(poses, footprint).tolist(), expected)
+        # The footprint can also be given as an array of points
+        footprint_array = [[point.x, point.y] for point in footprint.points]
+        self.assertEqual(
+            fcc_.footprintCostsAtPoses(poses, footprint_array).tolist(), expected
+        )
+
+    def test_pathCost(self):
+        # Test if the cost of the area swept along a path is calculated correctly
+        # Create test grid 10 pixels wide by 10 pixels long, at 1 meters per pixel
+        # AKA 10 meters x 10 meters
+        occupancyGrid_ = OccupancyGrid()
+        occupancyGrid_.info.resolution = 1.0
+        occupancyGrid_.info.width = 10
+        occupancyGrid_.info.height = 10
+        occupancyGrid_.info.origin.position.x = 0.0
+        occupancyGrid_.info.origin.position.y = 0.0
+        map_data = [0] * 10 * 10
+        map_data[44] = 100
+        # OccupancyGrid data is int8, so LETHAL_OBSTACLE is stored as -2
+        map_data[47] = LETHAL_OBSTACLE - 256
+        occupancyGrid_.data = map_data
+        costmap_ = PyCostmap2D(occupancyGrid_)
+        fcc_ = FootprintCollisionChecker()
+        fcc_.setCostmap(costmap_)
+        # Create square footprint 2m x 2m
+        footprint = [[1.0, 1.0], [1.0, -1.0], [-1.0, -1.0], [-1.0, 1.0]]
+        # Create a path along the row y = 4, turning half way
+        path = Path()
+        for i, theta in enumerate([0.0, 0.0, 0.0, 0.5, 0.5, 0.5]):
+            pose = PoseStamped()
+            pose.pose.position.x = 1.5 + i
+            pose.pose.position.y = 4.5
+            pose.pose.orientation.z = sin(theta / 2.0)
+            pose.pose.orientation.w = cos(theta / 2.0)
+            path.poses.append(pose)
+        max_cost, mean_cost, first_lethal_index = fcc_.pathCost(path, footprint)
+        self.assertEqual(max_cost, LETHAL_OBSTACLE)
+        self.assertEqual(first_lethal_index, 5)
+        self.assertGreater(mean_cost, 0.0)
+        self.assertLess(mean_cost, 100.0)
+        # Stop the path before the lethal cell
+        path.poses = path.poses[:4]
+        max_cost, mean_cost, first_lethal_index = fcc_.pathCost(path, footprint)
+        self.assertEqual(max_cost, 100.0)
+        self.assertIsNone(first_lethal_index)
+        # The 16 swept cells are the edges of the footprint at every pose
+        self.assertEqual(mean_cost, 100.0 / 16.0)
+        # Repeated poses sweep the same cells
+        path.poses = [pose for pose in path.poses for _ in range(3)]
+        self.assertEqual(fcc_.pathCost(path, footprint), (100.0, 100.0 / 16.0, None))
+        # Poses outside of the map are lethal
+        poses = [[5.5, 4.5, 0.0], [9.5, 4.5, 0.0]]
+        self.assertEqual(
+            fcc_.pathCost(poses, footprint), (float(LETHAL_OBSTACLE), 12.5, 1)
+        )
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -12,10 +12,11 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
-from cmath import sqrt
+from math import sqrt
 import unittest
 
 from nav2_simple_commander.line_iterator import LineIterator
+import numpy as np
 
 
 class TestLineIterator(unittest.TestCase):
@@ -103,6 +104,35 @@ class TestLineIterator(unittest.TestCase):
             self.assertEqual(lt.getY(), 5)
             lt.advance()
 
+    def test_cells(self):
+        # Test if every cell of the line is visited once, in order
+        self.assertEqual(
+            list(LineIterator.cells(0, 0, 5, 2)),
+            [(0, 0), (1, 0), (2, 1), (3, 1), (4, 2), (5, 2)],
+        )
+        self.assertEqual(
+            list(LineIterator.cells(2, 0, 0, -4)),
+            [(2, 0), (1, -1), (1, -2), (0, -3), (0, -4)],
+        )
+        self.assertEqual(list(LineIterator.cells(0, 3, 0, 1)), [(0, 3), (0, 2), (0, 1)])
+        # Test if a line from a cell to itself gives that cell
+        self.assertEqual(list(LineIterator.cells(2, 2, 2, 2)), [(2, 2)])
+        # Test if a type error raised when passing non integer cells
+        self.assertRaises(TypeError, list, LineIterator.cells(0, 0, 1.5, 1))
+
+    def test_cell_arrays(self):
+        # Test if the arrays hold the same cells as the iterator
+        for x0, y0, x1, y1 in [(0, 0, 5, 2), (2, 0, 0, -4), (3, -7, -6, 4), (2, 2, 2, 2)]:
+            xs, ys = LineIterator.cellArrays(x0, y0, x1, y1)
+            self.assertEqual(
+                list(zip(xs.tolist(), ys.tolist())),
+                list(LineIterator.cells(x0, y0, x1, y1)),
+            )
+        # Test if neighboring cells of a line are adjacent
+        xs, ys = LineIterator.cellArrays(-3, 11, 17, -2)
+        self.assertTrue((np.maximum(np.abs(np.diff(xs)), np.abs(np.diff(ys))) == 1).all())
+        self.assertRaises(TypeError, LineIterator.cellArrays, 0, 0, 1.5, 1)
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,374 @@
+# Copyright (c) 2021, Matthew Booker
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License. Reserved.
+
+import argparse
+from concurrent.futures import ProcessPoolExecutor
+import cProfile
+from datetime import datetime
+import itertools
+import json
+import multiprocessing
+from pathlib import Path
+import platform
+import resource
+import sys
+import time
+
+import constants
+from lattice_generator import LatticeGenerator
+
+import numpy as np
+
+DEFAULT_HEADINGS = [16, 32, 64, 72, 80]
+DEFAULT_RESOLUTIONS = [0.1, 0.05, 0.025]
+DEFAULT_MOTION_MODELS = ['ackermann', 'diff', 'omni']
+
+PROFILERS = ['cprofile', 'pyinstrument']
+
+
+def handle_arg_parsing():
+    """
+    Handle the parsing of arguments.
+
+    Returns
+    -------
+    argparse.Namespace
+        An object containing all parsed arguments
+
+    """
+    parser = argparse.ArgumentParser(
+        description='Benchmark the lattice primitive generator over a '
+        'matrix of configs'
+    )
+    parser.add_argument(
+        '--headings',
+        type=int,
+        nargs='+',
+        default=DEFAULT_HEADINGS,
+        help='The numbers of headings to benchmark',
+    )
+    parser.add_argument(
+        '--resolutions',
+        type=float,
+        nargs='+',
+        default=DEFAULT_RESOLUTIONS,
+        help='The grid resolutions to benchmark',
+    )
+    parser.add_argument(
+        '--motion-models',
+        nargs='+',
+        choices=DEFAULT_MOTION_MODELS,
+        default=DEFAULT_MOTION_MODELS,
+        help='The motion models to benchmark',
+    )
+    parser.add_argument(
+        '--turning-radius',
+        type=float,
+        default=0.5,
+        help='The turning radius used for every config',
+    )
+    parser.add_argument(
+        '--stopping-threshold',
+        type=int,
+        default=5,
+        help='The stopping threshold used for every config',
+    )
+    parser.add_argument(
+        '--jobs',
+        type=int,
+        default=1,
+        help='The number of worker processes used by each run',
+    )
+    parser.add_argument(
+        '--report',
+        type=Path,
+        default='./benchmark.json',
+        help='The file the benchmark results are written to',
+    )
+    parser.add_argument(
+        '--profile',
+        choices=PROFILERS,
+        default=None,
+        help='Profile every run with the given profiler',
+    )
+    parser.add_argument(
+        '--profile-dir',
+        type=Path,
+        default='./profiles',
+        help='The folder the profiles are saved to',
+    )
+
+    return parser.parse_args()
+
+
+def create_config_matrix(
+    headings: list,
+    resolutions: list,
+    motion_models: list,
+    turning_radius: float,
+    stopping_threshold: int,
+) -> list:
+    """
+    Create a config for every combination of the benchmarked parameters.
+
+    Args:
+    ----
+    headings: list
+        The numbers of headings to benchmark
+    resolutions: list
+        The grid resolutions to benchmark
+    motion_models: list
+        The motion models to benchmark
+    turning_radius: float
+        The turning radius used for every config
+    stopping_threshold: int
+        The stopping threshold used for every config
+
+    Returns
+    -------
+    list
+        A list of config dicts in the format of config.json
+
+    """
+    return [
+        {
+            'motion_model': motion_model,
+            'turning_radius': turning_radius,
+            'grid_resolution': grid_resolution,
+            'stopping_threshold': stopping_threshold,
+            'num_of_headings': num_of_headings,
+        }
+        for num_of_headings, grid_resolution, motion_model in itertools.product(
+            headings, resolutions, motion_models
+        )
+    ]
+
+
+def get_peak_rss_mb() -> float:
+    """
+    Return the peak resident set size of this process and its children.
+
+    Returns
+    -------
+    float
+        The peak resident set size in megabytes
+
+    """
+    peak_rss = max(
+        resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+        resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss,
+    )
+
+    # ru_maxrss is given in bytes on macOS and in kilobytes elsewhere
+    if sys.platform == 'darwin':
+        return peak_rss / 1e6
+
+    return peak_rss / 1e3
+
+
+def get_profile_path(profile_dir: Path, config: dict, profiler: str) -> Path:
+    """
+    Return the path a run's profile is saved to.
+
+    Args:
+    ----
+    profile_dir: Path
+        The folder the profiles are saved to
+    config: dict
+        The config of the profiled run
+    profiler: str
+        The profiler used for the run
+
+    Returns
+    -------
+    Path
+        The path of the profile
+
+    """
+    suffix = '.prof' if profiler == 'cprofile' else '.html'
+    name = (
+        f"{config['motion_model']}_{config['num_of_headings']}_"
+        f"{config['grid_resolution']}"
+    )
+
+    return profile_dir / (name + suffix)
+
+
+def run_benchmark(
+    config: dict, jobs: int = 1, profiler: str = None, profile_path: Path = None
+) -> dict:
+    """
+    Run the lattice generator for a config and measure it.
+
+    The peak resident set size covers the whole process, so each config
+    should be run in a fresh process through benchmark_config.
+
+    Args:
+    ----
+    config: dict
+        The config to generate the lattice for
+    jobs: int
+        The number of worker processes used by the generator
+    profiler: str
+        One of PROFILERS to profile the run with, or None
+    profile_path: Path
+        The file the profile is saved to
+
+    Returns
+    -------
+    dict
+        The config along with the measurements of the run
+
+    """
+    lattice_gen = LatticeGenerator(config)
+
+    if profiler == 'cprofile':
+        profile = cProfile.Profile()
+        profile.enable()
+    elif profiler == 'pyinstrument':
+        from pyinstrument import Profiler
+
+        profile = Profiler()
+        profile.start()
+
+    start = time.perf_counter()
+    minimal_set_trajectories = lattice_gen.run(jobs)
+    wall_time = time.perf_counter() - start
+
+    if profiler == 'cprofile':
+        profile.disable()
+        profile.dump_stats(profile_path)
+    elif profiler == 'pyinstrument':
+        profile.stop()
+        Path(profile_path).write_text(profile.output_html())
+
+    statistics = lattice_gen.statistics
+
+    return {
+        'config': config,
+        'wall_time': wall_time,
+        'peak_rss_mb': get_peak_rss_mb(),
+        'candidate_trajectories': statistics['candidate_trajectories'],
+        'sampled_trajectories': statistics['sampled_trajectories'],
+        'kept_trajectories': statistics['kept_trajectories'],
+        'rtree_queries': statistics['rtree_queries'],
+        'rtree_candidates': statistics['rtree_candidates'],
+        'number_of_trajectories': sum(
+            len(trajectories) for trajectories in minimal_set_trajectories.values()
+        ),
+    }
+
+
+def benchmark_config(
+    config: dict, jobs: int = 1, profiler: str = None, profile_path: Path = None
+) -> dict:
+    """
+    Run the benchmark for a config in a fresh process.
+
+    Running each config in its own process keeps the peak resident set
+    size of one config from hiding that of the next.
+
+    Args:
+    ----
+    config: dict
+        The config to generate the lattice for
+    jobs: int
+        The number of worker processes used by the generator
+    profiler: str
+        One of PROFILERS to profile the run with, or None
+    profile_path: Path
+        The file the profile is saved to
+
+    Returns
+    -------
+    dict
+        The config along with the measurements of the run
+
+    """
+    with ProcessPoolExecutor(
+        max_workers=1, mp_context=multiprocessing.get_context('spawn')
+    ) as executor:
+        return executor.submit(
+            run_benchmark, config, jobs, profiler, profile_path
+        ).result()
+
+
+def create_report(results: list, jobs: int) -> dict:
+    """
+    Create the report of a benchmark run.
+
+    Args:
+    ----
+    results: list
+        The result of every benchmarked config
+    jobs: int
+        The number of worker processes used by each run
+
+    Returns
+    -------
+    dict
+        The results along with the environment they were measured in
+
+    """
+    return {
+        'version': constants.VERSION,
+        'date_generated': datetime.today().strftime('%Y-%m-%d'),
+        'environment': {
+            'python': platform.python_version(),
+            'numpy': np.__version__,
+            'machine': platform.machine(),
+            'processor': platform.processor(),
+            'jobs': jobs,
+        },
+        'results': results,
+    }
+
+
+if __name__ == '__main__':
+
+    args = handle_arg_parsing()
+
+    configs = create_config_matrix(
+        args.headings,
+        args.resolutions,
+        args.motion_models,
+        args.turning_radius,
+        args.stopping_threshold,
+    )
+
+    if args.profile is not None:
+        args.profile_dir.mkdir(exist_ok=True)
+
+    results = []
+    for config in configs:
+        profile_path = None
+        if args.profile is not None:
+            profile_path = get_profile_path(args.profile_dir, config, args.profile)
+
+        result = benchmark_config(config, args.jobs, args.profile, profile_path)
+        results.append(result)
+
+        print(
+            f"{config['motion_model']:>9} headings={config['num_of_headings']:<3} "
+            f"resolution={config['grid_resolution']:<6} "
+            f"time={result['wall_time']:.2f}s "
+            f"peak_rss={result['peak_rss_mb']:.1f}MB "
+            f"kept={result['kept_trajectories']}/{result['candidate_trajectories']} "
+            f"rtree_queries={result['rtree_queries']} "
+            f"rtree_candidates={result['rtree_candidates']}"
+        )
+
+        # Write the report after every config so a partial run is kept
+        with open(args.report, 'w') as report_file:
+            json.dump(create_report(results, args.jobs), report_file, indent='\t')
@@ -13,3 +13,8 @@
 # limitations under the License. Reserved.
 
 VERSION = 1.0
+
+# Version of the entries stored by TrajectoryCache. Bump it whenever a
+# change to the generator changes the trajectories or minimal sets it
+# creates, so entries from before the change are not reused
+CACHE_VERSION = 2
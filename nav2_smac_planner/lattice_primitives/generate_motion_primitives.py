@@ -13,16 +13,28 @@
 # limitations under the License. Reserved.
 
 import argparse
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime
 import json
 import logging
 from pathlib import Path
+import shutil
+import tempfile
+from textwrap import indent
 import time
+from typing import Iterable, Tuple
 
 import constants
+from heading_table import HeadingTable
+import lattice_binary
 from lattice_generator import LatticeGenerator
+import swept_cells
+from trajectory import Trajectory
+from trajectory_cache import TrajectoryCache
 
-import matplotlib.pyplot as plt
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.collections import LineCollection
+from matplotlib.figure import Figure
 import numpy as np
 
 
@@ -55,6 +67,13 @@ def handle_arg_parsing():
         default='./output.json',
         help='The output file containing the ' 'trajectory data',
     )
+    parser.add_argument(
+        '--binary-output',
+        type=Path,
+        default=None,
+        help='An optional binary file to also write the '
+        'trajectory data to',
+    )
     parser.add_argument(
         '--visualizations',
         type=Path,
@@ -62,8 +81,56 @@ def handle_arg_parsing():
         help='The output folder where the '
         'visualizations of the trajectories will be saved',
     )
+    parser.add_argument(
+        '--visualization-format',
+        choices=['png', 'svg'],
+        default='png',
+        help='Save an image for every start heading (png) or a single '
+        'overview of all trajectories (svg)',
+    )
+    parser.add_argument(
+        '--jobs',
+        type=int,
+        default=1,
+        help='The number of worker processes used to search '
+        'the start headings and render the visualizations in parallel',
+    )
+    parser.add_argument(
+        '--cache',
+        type=Path,
+        default=None,
+        help='An optional cache file used to reuse generated '
+        'trajectories across runs',
+    )
+    parser.add_argument(
+        '--resume-from',
+        type=Path,
+        default=None,
+        help='A previously generated output file to continue '
+        'the search from',
+    )
+    parser.add_argument(
+        '--stream',
+        action='store_true',
+        help='Write the output file while the trajectories are '
+        'generated instead of holding them all in memory. '
+        'Visualizations are not saved in this mode',
+    )
+    parser.add_argument(
+        '--footprint',
+        type=str,
+        default=None,
+        help='An optional footprint polygon, e.g. "[[0.5, 0.3], [0.5, -0.3], '
+        '[-0.5, -0.3], [-0.5, 0.3]]". The cells swept by the footprint '
+        'are written with every trajectory',
+    )
+
+    args = parser.parse_args()
 
-    return parser.parse_args()
+    if args.stream and args.binary_output is not None:
+        parser.error('--binary-output can not be used with --stream')
+
+    return args
 
 
 def create_heading_angle_list(minimal_set_trajectories: dict) -> list:
@@ -73,7 +140,7 @@ def create_heading_angle_list(minimal_set_trajectories: dict) -> list:
     Args:
     ----
     minimal_set_trajectories: dict
-        The minimal spanning set
+        The minimal spanning set, or any iterable of its start angles
 
     Returns
     -------
@@ -81,8 +148,7 @@ def create_heading_angle_list(minimal_set_trajectories: dict) -> list:
         A sorted list of heading angles
 
     """
-    heading_angles = set(minimal_set_trajectories.keys())
-    return sorted(heading_angles, key=lambda x: (x < 0, x))
+    return HeadingTable(minimal_set_trajectories).output_headings
 
 
 def read_config(config_path) -> dict:
@@ -106,7 +172,9 @@ def read_config(config_path) -> dict:
     return config
 
 
-def create_header(config: dict, minimal_set_trajectories: dict) -> dict:
+def create_header(
+    config: dict, minimal_set_trajectories: dict, footprint: np.array = None
+) -> dict:
     """
     Create a dict containing all the fields to populate the header with.
 
@@ -115,7 +183,9 @@ def create_header(config: dict, minimal_set_trajectories: dict) -> dict:
     config: dict
         The dict containing user specified parameters
     minimal_set_trajectories: dict
-        The minimal spanning set
+        The minimal spanning set, or any iterable of its start angles
+    footprint: np.array(V, 2)
+        The footprint polygon the swept cells are found for, if any
 
     Returns
     -------
@@ -140,117 +210,419 @@ def create_header(config: dict, minimal_set_trajectories: dict) -> dict:
 
     header_dict['lattice_metadata']['heading_angles'] = adjusted_heading_angles
 
+    if footprint is not None:
+        header_dict['lattice_metadata']['footprint'] = footprint.tolist()
+
     return header_dict
 
 
-def write_to_json(
-    output_path: Path, minimal_set_trajectories: dict, config: dict
-) -> None:
+def create_trajectory_info(
+    trajectory_id: int,
+    trajectory: Trajectory,
+    heading_lookup: dict,
+    footprint: np.array = None,
+    grid_resolution: float = None,
+) -> dict:
     """
-    Write the minimal spanning set to an output file.
+    Create the dict written to an output file for a single trajectory.
+
+    Args:
+    ----
+    trajectory_id: int
+        The id of the trajectory in the output file
+    trajectory: Trajectory
+        The trajectory to write
+    heading_lookup: dict
+        A mapping from heading angle to its index in the heading angle list
+    footprint: np.array(V, 2)
+        If given, the cells swept by this footprint polygon are added as
+        runs of cells
+    grid_resolution: float
+        The size of a cell in meters, used with the footprint
+
+    Returns
+    -------
+    dict
+        The fields of the primitive
+
+    """
+    traj_info = {}
+    traj_info['trajectory_id'] = trajectory_id
+    traj_info['start_angle_index'] = heading_lookup[trajectory.parameters.start_angle]
+    traj_info['end_angle_index'] = heading_lookup[trajectory.parameters.end_angle]
+    traj_info['left_turn'] = bool(trajectory.parameters.left_turn)
+    traj_info['trajectory_radius'] = trajectory.parameters.turning_radius
+    traj_info['trajectory_length'] = round(trajectory.parameters.total_length, 5)
+    traj_info['arc_length'] = round(trajectory.parameters.arc_length, 5)
+    traj_info['straight_length'] = round(
+        trajectory.parameters.start_straight_length
+        + trajectory.parameters.end_straight_length,
+        5,
+    )
+    traj_info['poses'] = trajectory.path.to_output_format()
+
+    if footprint is not None:
+        # The footprint also sweeps the cells between the start pose, which
+        # is not part of the path, and the first pose
+        poses = [[0.0, 0.0, trajectory.parameters.start_angle]] + traj_info['poses']
+        cells = swept_cells.get_swept_cells(poses, footprint, grid_resolution)
+        traj_info['swept_cells'] = swept_cells.encode_runs(cells)
+
+    return traj_info
+
+
+def create_output_dict(
+    minimal_set_trajectories: dict, config: dict, footprint: np.array = None
+) -> dict:
+    """
+    Create the dict of everything written to an output file.
 
     Args:
     ----
-    output_path: Path
-        The output file for the json data
     minimal_set_trajectories: dict
         The minimal spanning set
     config: dict
         The dict containing user specified parameters
+    footprint: np.array(V, 2)
+        If given, the cells swept by this footprint polygon are added to
+        every primitive
 
-    """
-    output_dict = create_header(config, minimal_set_trajectories)
+    Returns
+    -------
+    dict
+        The header fields along with the list of primitives
 
-    trajectory_start_angles = list(minimal_set_trajectories.keys())
+    """
+    output_dict = create_header(config, minimal_set_trajectories, footprint)
 
-    heading_angle_list = create_heading_angle_list(minimal_set_trajectories)
-    heading_lookup = {angle: idx for idx, angle in enumerate(heading_angle_list)}
+    heading_table = HeadingTable(minimal_set_trajectories)
+    heading_lookup = heading_table.output_index
 
     idx = 0
-    for start_angle in sorted(trajectory_start_angles, key=lambda x: (x < 0, x)):
+    for start_angle in heading_table.output_headings:
 
         for trajectory in sorted(
             minimal_set_trajectories[start_angle], key=lambda x: x.parameters.end_angle
         ):
 
-            traj_info = {}
-            traj_info['trajectory_id'] = idx
-            traj_info['start_angle_index'] = heading_lookup[
-                trajectory.parameters.start_angle
-            ]
-            traj_info['end_angle_index'] = heading_lookup[
-                trajectory.parameters.end_angle
-            ]
-            traj_info['left_turn'] = bool(trajectory.parameters.left_turn)
-            traj_info['trajectory_radius'] = trajectory.parameters.turning_radius
-            traj_info['trajectory_length'] = round(
-                trajectory.parameters.total_length, 5
-            )
-            traj_info['arc_length'] = round(trajectory.parameters.arc_length, 5)
-            traj_info['straight_length'] = round(
-                trajectory.parameters.start_straight_length
-                + trajectory.parameters.end_straight_length,
-                5,
+            traj_info = create_trajectory_info(
+                idx, trajectory, heading_lookup, footprint, config['grid_resolution']
             )
-            traj_info['poses'] = trajectory.path.to_output_format()
 
             output_dict['primitives'].append(traj_info)
             idx += 1
 
     output_dict['lattice_metadata']['number_of_trajectories'] = idx
 
+    return output_dict
+
+
+def write_to_json(
+    output_path: Path,
+    minimal_set_trajectories: dict,
+    config: dict,
+    footprint: np.array = None,
+) -> None:
+    """
+    Write the minimal spanning set to an output file.
+
+    Args:
+    ----
+    output_path: Path
+        The output file for the json data
+    minimal_set_trajectories: dict
+        The minimal spanning set
+    config: dict
+        The dict containing user specified parameters
+    footprint: np.array(V, 2)
+        If given, the cells swept by this footprint polygon are added to
+        every primitive
+
+    """
+    output_dict = create_output_dict(minimal_set_trajectories, config, footprint)
+
+    write_output_dict_to_json(output_path, output_dict)
+
+
+def write_output_dict_to_json(output_path: Path, output_dict: dict) -> None:
+    """
+    Write an output dict to an output file.
+
+    Args:
+    ----
+    output_path: Path
+        The output file for the json data
+    output_dict: dict
+        The contents of the output file, as created by create_output_dict
+
+    """
     with open(output_path, 'w') as output_file:
         json.dump(output_dict, output_file, indent='\t')
 
 
+def write_to_json_stream(
+    output_path: Path,
+    heading_trajectories: Iterable[Tuple[float, list]],
+    config: dict,
+    heading_angles: list,
+    footprint: np.array = None,
+) -> None:
+    """
+    Write the minimal spanning set to an output file as it is generated.
+
+    Each primitive is serialized as soon as its start angle is produced, so
+    only the trajectories of a single start angle are held in memory. The
+    primitives are buffered in a temporary file until the total number of
+    trajectories for the header is known. The result is identical to the
+    file written by write_to_json.
+
+    Args:
+    ----
+    output_path: Path
+        The output file for the json data
+    heading_trajectories: Iterable[Tuple[float, list]]
+        The start angles and their trajectories in the order they are
+        written, as yielded by LatticeGenerator.run_streaming
+    config: dict
+        The dict containing user specified parameters
+    heading_angles: list
+        Every start angle in the minimal spanning set
+    footprint: np.array(V, 2)
+        If given, the cells swept by this footprint polygon are added to
+        every primitive
+
+    """
+    heading_lookup = HeadingTable(heading_angles).output_index
+
+    with tempfile.TemporaryFile('w+') as primitives_file:
+        idx = 0
+        for _, trajectories in heading_trajectories:
+
+            for trajectory in sorted(
+                trajectories, key=lambda x: x.parameters.end_angle
+            ):
+                traj_info = create_trajectory_info(
+                    idx,
+                    trajectory,
+                    heading_lookup,
+                    footprint,
+                    config['grid_resolution'],
+                )
+
+                primitives_file.write(',\n' if idx > 0 else '\n')
+                primitives_file.write(indent(json.dumps(traj_info, indent='\t'), '\t\t'))
+                idx += 1
+
+        header_dict = create_header(config, heading_angles, footprint)
+        header_dict['lattice_metadata']['number_of_trajectories'] = idx
+        del header_dict['primitives']
+
+        # Splice the buffered primitives into the header so the layout
+        # matches json.dump of the complete output dict
+        header = json.dumps(header_dict, indent='\t')[: -len('\n}')]
+
+        with open(output_path, 'w') as output_file:
+            output_file.write(header)
+            output_file.write(',\n\t"primitives": [')
+
+            if idx > 0:
+                primitives_file.seek(0)
+                shutil.copyfileobj(primitives_file, output_file)
+                output_file.write('\n\t')
+
+            output_file.write(']\n}')
+
+
+def write_to_binary(output_path: Path, output_dict: dict) -> None:
+    """
+    Write an output dict to a binary lattice file.
+
+    Args:
+    ----
+    output_path: Path
+        The output file for the binary data
+    output_dict: dict
+        The contents of the output file, as created by create_output_dict
+
+    """
+    lattice_binary.write_binary(output_path, output_dict)
+
+
+def get_visualization_limit(minimal_set_trajectories: dict) -> float:
+    """
+    Return the half width of the area shown by the visualizations.
+
+    Args:
+    ----
+    minimal_set_trajectories: dict
+        The minimal spanning set
+
+    Returns
+    -------
+    float
+        The largest x or y coordinate of any trajectory with a margin
+
+    """
+    limit = max(
+        max(np.abs(trajectory.path.xs).max(), np.abs(trajectory.path.ys).max())
+        for trajectories in minimal_set_trajectories.values()
+        for trajectory in trajectories
+    )
+
+    return 1.05 * limit
+
+
+def get_trajectory_segments(trajectories: Iterable[Trajectory]) -> list:
+    """
+    Return the path of each trajectory as an array of points.
+
+    Args:
+    ----
+    trajectories: Iterable[Trajectory]
+        The trajectories to draw
+
+    Returns
+    -------
+    list
+        An (N, 2) array of the x and y coordinates of each trajectory
+
+    """
+    return [
+        np.column_stack((trajectory.path.xs, trajectory.path.ys))
+        for trajectory in trajectories
+    ]
+
+
+def save_trajectory_image(output_path: Path, segments: list, limit: float) -> None:
+    """
+    Draw the paths of a group of trajectories and save it as an image.
+
+    All paths are drawn as a single LineCollection on a figure that is not
+    managed by pyplot, so images can be rendered in separate processes.
+
+    Args:
+    ----
+    output_path: Path
+        The image file to write
+    segments: list
+        The (N, 2) array of points of each trajectory
+    limit: float
+        The half width of the area shown in the image
+
+    """
+    figure = Figure()
+    FigureCanvasAgg(figure)
+
+    axes = figure.add_subplot()
+    axes.add_collection(LineCollection(segments, colors='b'))
+    axes.set_xlim(-limit, limit)
+    axes.set_ylim(-limit, limit)
+    axes.set_aspect('equal')
+    axes.grid(True)
+
+    figure.savefig(output_path)
+
+
 def save_visualizations(
-    visualizations_folder: Path, minimal_set_trajectories: dict
+    visualizations_folder: Path, minimal_set_trajectories: dict, jobs: int = 1
 ) -> None:
     """
     Draw the visualizations for every trajectory and save it as an image.
 
+    One image shows every trajectory and one image is saved for each start
+    angle between 0 and 90 degrees.
+
     Args:
     ----
     visualizations_folder: Path
         The path to the folder for where to save the images
     minimal_set_trajectories: dict
         The minimal spanning set
+    jobs: int
+        The number of worker processes used to render the images. A value
+        of 1 renders them serially
 
     """
     # Create the directory if it doesnt exist
     visualizations_folder.mkdir(exist_ok=True)
 
-    for start_angle in minimal_set_trajectories.keys():
+    limit = get_visualization_limit(minimal_set_trajectories)
 
-        for trajectory in minimal_set_trajectories[start_angle]:
-            plt.plot(trajectory.path.xs, trajectory.path.ys, 'b')
+    output_paths = [visualizations_folder / 'all_trajectories.png']
+    heading_segments = [
+        get_trajectory_segments(
+            trajectory
+            for trajectories in minimal_set_trajectories.values()
+            for trajectory in trajectories
+        )
+    ]
 
-    plt.grid(True)
-    plt.axis('square')
-    left_x, right_x = plt.xlim()
-    left_y, right_y = plt.ylim()
+    for start_angle, trajectories in minimal_set_trajectories.items():
+
+        if start_angle < 0 or start_angle > np.pi / 2:
+            continue
 
-    output_path = visualizations_folder / 'all_trajectories.png'
-    plt.savefig(output_path)
-    plt.clf()
+        angle_in_deg = np.rad2deg(start_angle)
+
+        output_paths.append(visualizations_folder / f'{angle_in_deg}.png')
+        heading_segments.append(get_trajectory_segments(trajectories))
+
+    limits = [limit] * len(output_paths)
+
+    if jobs > 1:
+        with ProcessPoolExecutor(max_workers=jobs) as executor:
+            list(
+                executor.map(
+                    save_trajectory_image, output_paths, heading_segments, limits
+                )
+            )
+    else:
+        list(map(save_trajectory_image, output_paths, heading_segments, limits))
 
-    for start_angle in minimal_set_trajectories.keys():
 
+def save_svg_overview(output_path: Path, minimal_set_trajectories: dict) -> None:
+    """
+    Save a single SVG image that shows every trajectory.
+
+    The trajectories of each start angle are grouped and titled with the
+    start angle, so a browser shows the start angle when hovering over a
+    trajectory. Writing the SVG directly avoids rendering any images.
+
+    Args:
+    ----
+    output_path: Path
+        The SVG file to write
+    minimal_set_trajectories: dict
+        The minimal spanning set
+
+    """
+    limit = get_visualization_limit(minimal_set_trajectories)
+
+    lines = [
+        '<svg xmlns="http://www.w3.org/2000/svg" width="800" height="800" '
+        f'viewBox="{-limit:.5f} {-limit:.5f} {2 * limit:.5f} {2 * limit:.5f}">',
+        # Flip the y axis so that y points up
+        f'<g transform="scale(1, -1)" fill="none" stroke="blue" '
+        f'stroke-width="{limit / 400:.5f}">',
+    ]
+
+    for start_angle in sorted(minimal_set_trajectories.keys()):
         angle_in_deg = np.rad2deg(start_angle)
 
-        if start_angle < 0 or start_angle > np.pi / 2:
-            continue
+        lines.append(f'<g><title>start angle {angle_in_deg:.2f} degrees</title>')
 
         for trajectory in minimal_set_trajectories[start_angle]:
-            plt.plot(trajectory.path.xs, trajectory.path.ys, 'b')
-            plt.xlim(left_x, right_x)
-            plt.ylim(left_y, right_y)
+            points = ' '.join(
+                f'{x:.4f},{y:.4f}' for x, y in zip(trajectory.path.xs, trajectory.path.ys)
+            )
+            lines.append(f'<polyline points="{points}"/>')
+
+        lines.append('</g>')
 
-        plt.grid(True)
+    lines.extend(['</g>', '</svg>'])
 
-        output_path = visualizations_folder / f'{angle_in_deg}.png'
-        plt.savefig(output_path)
-        plt.clf()
+    with open(output_path, 'w') as svg_file:
+        svg_file.write('\n'.join(lines) + '\n')
 
 
 if __name__ == '__main__':
@@ -258,10 +630,53 @@ if __name__ == '__main__':
     args = handle_arg_parsing()
     config = read_config(args.config)
 
-    start = time.time()
-    lattice_gen = LatticeGenerator(config)
-    minimal_set_trajectories = lattice_gen.run()
-    print(f'Finished Generating. Took {time.time() - start} seconds')
+    cache = TrajectoryCache(args.cache) if args.cache is not None else None
 
-    write_to_json(args.output, minimal_set_trajectories, config)
-    save_visualizations(args.visualizations, minimal_set_trajectories)
+    footprint = None
+    if args.footprint is not None:
+        footprint = swept_cells.parse_footprint(args.footprint)
+
+    resume_from = None
+    if args.resume_from is not None:
+        with open(args.resume_from) as resume_file:
+            resume_from = json.load(resume_file)
+
+    start = time.time()
+    lattice_gen = LatticeGenerator(config, cache)
+
+    if args.stream:
+        write_to_json_stream(
+            args.output,
+            lattice_gen.run_streaming(args.jobs, resume_from),
+            config,
+            lattice_gen.headings,
+            footprint,
+        )
+        print(f'Finished Generating. Took {time.time() - start} seconds')
+
+        if cache is not None:
+            cache.close()
+
+    else:
+        minimal_set_trajectories = lattice_gen.run(args.jobs, resume_from)
+        print(f'Finished Generating. Took {time.time() - start} seconds')
+
+        if cache is not None:
+            cache.close()
+
+        # The swept cells are only computed once for both output files
+        output_dict = create_output_dict(minimal_set_trajectories, config, footprint)
+        write_output_dict_to_json(args.output, output_dict)
+
+        if args.binary_output is not None:
+            write_to_binary(args.binary_output, output_dict)
+
+        if args.visualization_format == 'svg':
+            args.visualizations.mkdir(exist_ok=True)
+            save_svg_overview(
+                args.visualizations / 'overview.svg', minimal_set_trajectories
+            )
+        else:
+            save_visualizations(
+                args.visualizations, minimal_set_trajectories, args.jobs
+            )
@@ -0,0 +1,350 @@
+# Copyright (c) 2021, Matthew Booker
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License. Reserved.
+
+from enum import Enum
+from typing import Iterable
+
+import numpy as np
+
+# The heading scheme used when the config does not give one
+DEFAULT_HEADING_SCHEME = 'square'
+
+# Slack used when matching a reflected heading to a heading of the table
+FLIP_TOLERANCE = 1e-9
+
+# Slack used when matching a heading to the direction of a grid point
+GRID_TOLERANCE = 1e-6
+
+
+def _get_grid_angles(max_offset: int) -> np.array:
+    """
+    Return the directions of the grid points around the origin.
+
+    Args:
+    max_offset: int
+        The largest absolute value of the x and y of the grid points
+
+    Returns
+    -------
+    np.array
+        The angle in radians of every grid point other than the origin
+
+    """
+    offsets = np.arange(-max_offset, max_offset + 1)
+    xs, ys = np.meshgrid(offsets, offsets)
+    nonzero = (xs != 0) | (ys != 0)
+
+    return np.arctan2(ys[nonzero], xs[nonzero])
+
+
+def _get_grid_differences(headings: list, grid_angles: np.array) -> np.array:
+    """Return the angle between every heading and every grid direction."""
+    return np.abs(
+        np.mod(np.array(headings)[:, np.newaxis] - grid_angles + np.pi, 2 * np.pi)
+        - np.pi
+    )
+
+
+class HeadingTable:
+    """
+    The discrete headings of a lattice along with lookup tables for them.
+
+    Headings are kept in the range (-pi, pi] and sorted in increasing
+    order. The index of every heading, its index in the order used by the
+    output file and its reflections are computed once, so looking any of
+    them up does not search the list of headings.
+    """
+
+    class Flip(Enum):
+        """An Enum used for determining how a heading should be flipped."""
+
+        X = 1
+        Y = 2
+        BOTH = 3
+        DIAGONAL = 4
+
+    def __init__(self, headings: Iterable[float]):
+        """Init the lookup tables from a collection of headings in radians."""
+        self.headings = sorted(set(headings))
+
+        # The output file lists the headings from 0 up to 2 pi
+        self.output_headings = sorted(self.headings, key=lambda x: (x < 0, x))
+
+        self.index = {heading: idx for idx, heading in enumerate(self.headings)}
+        self.output_index = {
+            heading: idx for idx, heading in enumerate(self.output_headings)
+        }
+
+        self._flips = {
+            flip_type: self._get_flip_indices(flip_type) for flip_type in self.Flip
+        }
+
+    def __len__(self) -> int:
+        """Return the number of headings."""
+        return len(self.headings)
+
+    def __contains__(self, heading: float) -> bool:
+        """Return whether heading is one of the headings of the table."""
+        return heading in self.index
+
+    def _get_flip_indices(self, flip_type: Flip) -> list:
+        """
+        Find the index of the reflection of every heading.
+
+        Args:
+        flip_type: Flip
+            Whether to flip across the X axis, Y axis, both, or the
+            diagonal y = x
+
+        Returns
+        -------
+        list
+            The index of the reflected heading for each heading, or None
+            where the reflection is not one of the headings
+
+        """
+        headings = np.array(self.headings)
+
+        if flip_type == self.Flip.X:
+            flipped = np.pi - headings
+        elif flip_type == self.Flip.Y:
+            flipped = -headings
+        elif flip_type == self.Flip.BOTH:
+            flipped = headings + np.pi
+        elif flip_type == self.Flip.DIAGONAL:
+            flipped = np.pi / 2 - headings
+        else:
+            raise Exception(f'Unsupported flip type: {flip_type}')
+
+        # Match every reflection to the closest heading on the circle
+        differences = np.abs(
+            np.mod(flipped[:, np.newaxis] - headings + np.pi, 2 * np.pi) - np.pi
+        )
+        closest = np.argmin(differences, axis=1)
+        matched = differences[np.arange(len(headings)), closest] <= FLIP_TOLERANCE
+
+        return [
+            int(idx) if is_matched else None for idx, is_matched in zip(closest, matched)
+        ]
+
+    def is_symmetric(self) -> bool:
+        """
+        Return whether the headings are symmetric under every flip.
+
+        The lattice generator only searches start headings between 0 and
+        90 degrees and creates the others by flipping them, which requires
+        the reflection of every heading to be a heading as well.
+        """
+        return all(None not in flip_indices for flip_indices in self._flips.values())
+
+    def get_off_grid_headings(self, max_offset: int) -> list:
+        """
+        Return the headings that do not point at a grid point.
+
+        A heading points at a grid point if a straight line along it passes
+        through a point (i, j) of integers. The search only ends for
+        headings that do, since every other heading keeps finding
+        trajectories closer to its straight line on later wave fronts.
+
+        Args:
+        max_offset: int
+            The largest absolute value of i and j that is checked
+
+        Returns
+        -------
+        list
+            The headings that do not point at a grid point
+
+        """
+        differences = _get_grid_differences(self.headings, _get_grid_angles(max_offset))
+
+        return [
+            heading
+            for heading, difference in zip(self.headings, differences.min(axis=1))
+            if difference > GRID_TOLERANCE
+        ]
+
+    def flip(self, heading: float, flip_type: Flip) -> float:
+        """
+        Return the reflection of a heading.
+
+        Args:
+        heading: float
+            The heading to flip
+        flip_type: Flip
+            Whether to flip across the X axis, Y axis, both, or the
+            diagonal y = x
+
+        Returns
+        -------
+        float
+            The heading of the table that is the appropriate flip
+
+        """
+        flipped_idx = self._flips[flip_type][self.index[heading]]
+
+        if flipped_idx is None:
+            raise ValueError(f'The {flip_type.name} flip of {heading} is not a heading')
+
+        return self.headings[flipped_idx]
+
+    def step(self, heading: float, steps: int) -> float:
+        """
+        Return the heading a number of places away around the circle.
+
+        Args:
+        heading: float
+            The heading to step from
+        steps: int
+            The number of headings to step to the left. Negative values
+            step to the right
+
+        Returns
+        -------
+        float
+            The heading steps places away from heading
+
+        """
+        return self.headings[(self.index[heading] + steps) % len(self.headings)]
+
+    def rotate(self, heading: float, quarter_turns: int) -> float:
+        """
+        Return the heading a number of 90 degree turns away.
+
+        Args:
+        heading: float
+            The heading to rotate
+        quarter_turns: int
+            The number of 90 degree turns to the left. Negative values
+            turn to the right
+
+        Returns
+        -------
+        float
+            The rotated heading
+
+        """
+        # Each quadrant of a symmetric table holds a quarter of the headings
+        return self.step(heading, quarter_turns * (len(self.headings) // 4))
+
+
+def get_square_headings(num_of_headings: int) -> list:
+    """
+    Create headings that point to the perimeter of a square.
+
+    Does not uniformly generate headings but instead generates a set of
+    discrete headings that is better suited for straight line trajectories.
+
+    Args:
+    num_of_headings: int
+        The number of headings to discretize a 360 degree turn into
+
+    Returns
+    -------
+    list
+        A list of headings in radians
+
+    """
+    max_val = int(num_of_headings / 8)
+
+    outer_edge_x = []
+    outer_edge_y = []
+
+    # Generate points that lie on the perimeter of the surface
+    # of a square with sides of length max_val
+    for i in range(-max_val, max_val + 1):
+        outer_edge_x.extend([i, i])
+        outer_edge_y.extend([-max_val, max_val])
+
+        if i != max_val and i != -max_val:
+            outer_edge_x.extend([-max_val, max_val])
+            outer_edge_y.extend([i, i])
+
+    return sorted([np.arctan2(j, i) for i, j in zip(outer_edge_x, outer_edge_y)])
+
+
+def snap_to_grid(headings: list, max_offset: int) -> list:
+    """
+    Replace headings that point at a grid point by its exact direction.
+
+    Straight line trajectories are only found along headings that exactly
+    match the direction of a grid point, so headings that are computed or
+    written with limited precision are replaced by that direction.
+
+    Args:
+    headings: list
+        The headings in radians
+    max_offset: int
+        The largest absolute value of the x and y of the grid points
+
+    Returns
+    -------
+    list
+        The snapped headings in radians
+
+    """
+    grid_angles = _get_grid_angles(max_offset)
+    differences = _get_grid_differences(headings, grid_angles)
+    closest = np.argmin(differences, axis=1)
+
+    return [
+        float(grid_angles[idx]) if difference[idx] <= GRID_TOLERANCE else heading
+        for heading, idx, difference in zip(headings, closest, differences)
+    ]
+
+
+def create_heading_table(config: dict) -> HeadingTable:
+    """
+    Create the heading table described by a config.
+
+    The optional heading_scheme field selects how the headings are
+    created. "square" (the default) points them to the perimeter of a
+    square and "custom" uses the headings field of the config, a list of
+    headings in radians.
+
+    Args:
+    config: dict
+        The dict containing user specified parameters
+
+    Returns
+    -------
+    HeadingTable
+        The headings of the lattice
+
+    """
+    num_of_headings = config['num_of_headings']
+    heading_scheme = config.get('heading_scheme', DEFAULT_HEADING_SCHEME)
+
+    if heading_scheme == 'square':
+        headings = get_square_headings(num_of_headings)
+    elif heading_scheme == 'custom':
+        headings = snap_to_grid(
+            [
+                float(np.arctan2(np.sin(heading), np.cos(heading)))
+                for heading in config['headings']
+            ],
+            num_of_headings,
+        )
+    else:
+        raise ValueError(f'Unsupported heading scheme: {heading_scheme}')
+
+    heading_table = HeadingTable(headings)
+
+    if len(heading_table) != num_of_headings:
+        raise ValueError(
+            f'The {heading_scheme} heading scheme created {len(heading_table)} '
+            f'unique headings, expected num_of_headings = {num_of_headings}'
+        )
+
+    return heading_table
@@ -20,33 +20,31 @@ def normalize_angle(angle):
     Normalize the angle to between [0, 2pi).
 
     Args:
-    angle: float
-        The angle to normalize in radians
+    angle: float or np.array
+        The angle to normalize in radians. Arrays are normalized
+        element-wise
 
     Returns
     -------
     The normalized angle in the range [0,2pi)
 
     """
-    while angle >= 2 * np.pi:
-        angle -= 2 * np.pi
-
-    while angle < 0:
-        angle += 2 * np.pi
-
-    return angle
+    return np.mod(angle, 2 * np.pi)
 
 
 def angle_difference(angle_1, angle_2, left_turn=None):
     """
     Calculate the difference between two angles based on a given direction.
 
+    All arguments may be arrays, in which case they are broadcast against
+    each other and the differences are computed element-wise.
+
     Args:
-    angle_1: float
+    angle_1: float or np.array
         The starting angle in radians
-    angle_2: float
+    angle_2: float or np.array
         The ending angle in radians
-    left_turn: bool
+    left_turn: bool or np.array
         The direction of turn. True if left, false if right
         and None if smallest angular difference should be
         returned
@@ -57,23 +55,19 @@ def angle_difference(angle_1, angle_2, left_turn=None):
     the specified turn direction
 
     """
-    if left_turn is None:
-        dif = abs(angle_1 - angle_2)
-
-        return dif if dif <= np.pi else 2 * np.pi - dif
-
-    elif left_turn:
-
-        if angle_2 >= angle_1:
-            return abs(angle_1 - angle_2)
-        else:
-            return 2 * np.pi - abs(angle_1 - angle_2)
+    dif = np.abs(np.subtract(angle_1, angle_2))
 
+    if left_turn is None:
+        is_direct = dif <= np.pi
     else:
-        if angle_1 >= angle_2:
-            return abs(angle_1 - angle_2)
-        else:
-            return 2 * np.pi - abs(angle_1 - angle_2)
+        is_direct = np.where(
+            left_turn,
+            np.greater_equal(angle_2, angle_1),
+            np.greater_equal(angle_1, angle_2),
+        )
+
+    # Indexing with () unwraps the result to a scalar for scalar inputs
+    return np.where(is_direct, dif, 2 * np.pi - dif)[()]
 
 
 def interpolate_yaws(start_angle, end_angle, left_turn, steps):
@@ -81,11 +75,11 @@ def interpolate_yaws(start_angle, end_angle, left_turn, steps):
     Create equally spaced yaws between two angles.
 
     Args:
-    start_angle: float
+    start_angle: float or np.array
         The starting angle
-    end_angle: float
+    end_angle: float or np.array
         The ending angle
-    left_turn: bool
+    left_turn: bool or np.array
         The direction of turn. True if left, False otherwise
     steps: int
         The number of yaws to generate between start and end
@@ -94,20 +88,19 @@ def interpolate_yaws(start_angle, end_angle, left_turn, steps):
     Returns
     -------
     An array of yaws starting at start angle and ending at end
-    angle with steps number of angles between them
+    angle with steps number of angles between them. When any of the
+    angles are arrays, the yaws of each pair lie along the last axis
 
     """
-    if left_turn:
-        if start_angle > end_angle:
-            end_angle += 2 * np.pi
-    else:
-        if end_angle > start_angle:
-            end_angle -= 2 * np.pi
+    end_angle = np.where(
+        left_turn,
+        np.where(np.greater(start_angle, end_angle), end_angle + 2 * np.pi, end_angle),
+        np.where(np.greater(end_angle, start_angle), end_angle - 2 * np.pi, end_angle),
+    )
 
-    yaws = np.linspace(start_angle, end_angle, steps)
-    yaws = np.vectorize(normalize_angle)(yaws)
+    yaws = np.linspace(start_angle, end_angle, steps, axis=-1)
 
-    return yaws
+    return normalize_angle(yaws)
 
 
 def get_rotation_matrix(angle):
@@ -0,0 +1,399 @@
+# Copyright (c) 2021, Matthew Booker
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License. Reserved.
+
+"""
+Quality and coverage metrics for lattice primitive files.
+
+Works on the contents of an output file written by write_to_json. The
+reachability check treats the lattice as a graph over discrete
+(x, y, heading) cells where every primitive moves from the cell of its
+start to the cell of its end pose, and expands it breadth first.
+"""
+
+import argparse
+import json
+from pathlib import Path
+from typing import Tuple
+
+import numpy as np
+
+
+def get_branching_factors(output: dict) -> np.array:
+    """
+    Count the primitives that begin at each heading.
+
+    Args:
+    ----
+    output: dict
+        The contents of an output file
+
+    Returns
+    -------
+    np.array(num_of_headings,)
+        The number of primitives for each start angle index
+
+    """
+    num_of_headings = len(output['lattice_metadata']['heading_angles'])
+    start_angle_indices = [
+        primitive['start_angle_index'] for primitive in output['primitives']
+    ]
+
+    return np.bincount(start_angle_indices, minlength=num_of_headings)
+
+
+def get_length_statistics(output: dict) -> dict:
+    """
+    Summarize the lengths of the primitives.
+
+    Args:
+    ----
+    output: dict
+        The contents of an output file
+
+    Returns
+    -------
+    dict
+        The total, mean, min and max trajectory length in meters
+
+    """
+    lengths = np.array(
+        [primitive['trajectory_length'] for primitive in output['primitives']]
+    )
+
+    if len(lengths) == 0:
+        return {'total': 0.0, 'mean': 0.0, 'min': 0.0, 'max': 0.0}
+
+    return {
+        'total': float(lengths.sum()),
+        'mean': float(lengths.mean()),
+        'min': float(lengths.min()),
+        'max': float(lengths.max()),
+    }
+
+
+def get_primitive_offsets(output: dict) -> Tuple[np.array, np.array, np.array]:
+    """
+    Find the cell each primitive moves by.
+
+    Args:
+    ----
+    output: dict
+        The contents of an output file
+
+    Returns
+    -------
+    tuple
+        The start angle index (N,), the offset in cells of the end pose
+        (N, 2) and the end angle index (N,) of every primitive
+
+    """
+    grid_resolution = output['lattice_metadata']['grid_resolution']
+    primitives = output['primitives']
+
+    start_angle_indices = np.array(
+        [primitive['start_angle_index'] for primitive in primitives], dtype=np.int64
+    )
+    end_angle_indices = np.array(
+        [primitive['end_angle_index'] for primitive in primitives], dtype=np.int64
+    )
+    end_points = np.array(
+        [primitive['poses'][-1][:2] for primitive in primitives], dtype=np.float64
+    ).reshape(-1, 2)
+
+    offsets = np.round(end_points / grid_resolution).astype(np.int64)
+
+    return start_angle_indices, offsets, end_angle_indices
+
+
+def _sorted_unique(keys: np.array) -> np.array:
+    """
+    Return the sorted unique values of an integer array.
+
+    Sorting and comparing neighbours is considerably faster than np.unique
+    for the large arrays of cell keys created by the reachability check.
+
+    Args:
+    ----
+    keys: np.array(N,)
+        The integer keys
+
+    Returns
+    -------
+    np.array
+        The sorted unique keys
+
+    """
+    keys = np.sort(keys)
+
+    if len(keys) == 0:
+        return keys
+
+    return keys[np.concatenate(([True], keys[1:] != keys[:-1]))]
+
+
+def _breadth_first_search(
+    output: dict, expansions: int, window: int, start_angle_index: int
+) -> Tuple[np.array, np.array]:
+    """
+    Expand the lattice breadth first from the origin.
+
+    Every expansion applies all primitives of its heading to every cell
+    reached in the previous expansion at once. Cells are identified by a
+    single integer key so that already visited cells can be removed
+    with a binary search over the sorted visited keys.
+
+    Args:
+    ----
+    output: dict
+        The contents of an output file
+    expansions: int
+        The number of expansions to run
+    window: int
+        Only cells at most this many cells away from the origin along x
+        and y are expanded. None does not limit the search
+    start_angle_index: int
+        The heading of the cell the search begins from
+
+    Returns
+    -------
+    tuple
+        The x, y and heading (M, 3) of every reached cell and the number
+        of cells reached after each expansion (expansions + 1,)
+
+    """
+    num_of_headings = len(output['lattice_metadata']['heading_angles'])
+    start_angle_indices, offsets, end_angle_indices = get_primitive_offsets(output)
+
+    if window is None:
+        window = expansions * int(np.abs(offsets).max(initial=0))
+
+    width = 2 * window + 1
+
+    # Sort the primitives by start heading so those of each heading are
+    # a contiguous block
+    order = np.argsort(start_angle_indices, kind='stable')
+    branching_factors = np.bincount(start_angle_indices, minlength=num_of_headings)
+    block_starts = np.cumsum(branching_factors) - branching_factors
+
+    def encode(xs, ys, headings):
+        return ((xs + window) * width + (ys + window)) * num_of_headings + headings
+
+    def decode(keys):
+        cells = keys // num_of_headings
+        return cells // width - window, cells % width - window, keys % num_of_headings
+
+    frontier_xs = np.array([0])
+    frontier_ys = np.array([0])
+    frontier_headings = np.array([start_angle_index])
+
+    visited = encode(frontier_xs, frontier_ys, frontier_headings)
+    reachable = [len(visited)]
+
+    for _ in range(expansions):
+        # Pair every frontier cell with each primitive of its heading
+        counts = branching_factors[frontier_headings]
+        cell_idx = np.repeat(np.arange(len(counts)), counts)
+        block_offsets = np.arange(len(cell_idx)) - np.repeat(
+            np.cumsum(counts) - counts, counts
+        )
+        primitive_idx = order[block_starts[frontier_headings[cell_idx]] + block_offsets]
+
+        xs = frontier_xs[cell_idx] + offsets[primitive_idx, 0]
+        ys = frontier_ys[cell_idx] + offsets[primitive_idx, 1]
+        headings = end_angle_indices[primitive_idx]
+
+        in_window = (np.abs(xs) <= window) & (np.abs(ys) <= window)
+
+        keys = _sorted_unique(
+            encode(xs[in_window], ys[in_window], headings[in_window])
+        )
+
+        positions = np.minimum(np.searchsorted(visited, keys), len(visited) - 1)
+        new_keys = keys[visited[positions] != keys]
+        visited = np.sort(np.concatenate((visited, new_keys)))
+
+        frontier_xs, frontier_ys, frontier_headings = decode(new_keys)
+
+        reachable.append(len(visited))
+
+    return np.column_stack(decode(visited)), np.array(reachable)
+
+
+def compute_reachability(
+    output: dict, expansions: int, window: int = None, start_angle_index: int = 0
+) -> np.array:
+    """
+    Count the cells reachable from the origin within a number of expansions.
+
+    Args:
+    ----
+    output: dict
+        The contents of an output file
+    expansions: int
+        The number of expansions to run
+    window: int
+        Only cells at most this many cells away from the origin along x
+        and y are expanded. None does not limit the search
+    start_angle_index: int
+        The heading of the cell the search begins from
+
+    Returns
+    -------
+    np.array(expansions + 1,)
+        The number of (x, y, heading) cells reached after each expansion,
+        starting with the origin alone
+
+    """
+    _, reachable = _breadth_first_search(
+        output, expansions, window, start_angle_index
+    )
+
+    return reachable
+
+
+def get_reachable_cells(
+    output: dict, expansions: int, window: int = None, start_angle_index: int = 0
+) -> np.array:
+    """
+    Find the cells reachable from the origin within a number of expansions.
+
+    Args:
+    ----
+    output: dict
+        The contents of an output file
+    expansions: int
+        The number of expansions to run
+    window: int
+        Only cells at most this many cells away from the origin along x
+        and y are expanded. None does not limit the search
+    start_angle_index: int
+        The heading of the cell the search begins from
+
+    Returns
+    -------
+    np.array(M, 3)
+        The x and y offset in cells and the heading index of every
+        reachable cell
+
+    """
+    cells, _ = _breadth_first_search(output, expansions, window, start_angle_index)
+
+    return cells
+
+
+def analyze(output: dict, expansions: int = 10, window: int = None) -> dict:
+    """
+    Compute the quality and coverage metrics of a lattice.
+
+    Args:
+    ----
+    output: dict
+        The contents of an output file
+    expansions: int
+        The number of expansions used by the reachability check
+    window: int
+        The half width in cells of the grid used by the reachability
+        check. None does not limit the search
+
+    Returns
+    -------
+    dict
+        The metrics of the lattice
+
+    """
+    metadata = output['lattice_metadata']
+    num_of_headings = len(metadata['heading_angles'])
+
+    branching_factors = get_branching_factors(output)
+    reachable = compute_reachability(output, expansions, window)
+
+    report = {
+        'lattice_metadata': metadata,
+        'number_of_primitives': len(output['primitives']),
+        'branching_factor': branching_factors.tolist(),
+        'mean_branching_factor': float(branching_factors.mean()),
+        'trajectory_length': get_length_statistics(output),
+        'expansions': expansions,
+        'reachable_cells': reachable.tolist(),
+    }
+
+    # The share of the window's cells is only meaningful if it is bounded
+    if window is not None:
+        report['window'] = window
+        report['coverage'] = reachable[-1] / ((2 * window + 1) ** 2 * num_of_headings)
+
+    return report
+
+
+def handle_arg_parsing():
+    """
+    Handle the parsing of arguments.
+
+    Returns
+    -------
+    argparse.Namespace
+        An object containing all parsed arguments
+
+    """
+    parser = argparse.ArgumentParser(
+        description='Report quality and coverage metrics of a lattice primitive file'
+    )
+    parser.add_argument('input', type=Path, help='The output file to analyze')
+    parser.add_argument(
+        '--expansions',
+        type=int,
+        default=10,
+        help='The number of expansions used by the reachability check',
+    )
+    parser.add_argument(
+        '--window',
+        type=int,
+        default=None,
+        help='Limit the reachability check to cells at most this many cells '
+        'from the origin and report the share of them that is reached',
+    )
+    parser.add_argument(
+        '--report',
+        type=Path,
+        default=None,
+        help='Also write the metrics to this JSON file',
+    )
+
+    return parser.parse_args()
+
+
+if __name__ == '__main__':
+
+    args = handle_arg_parsing()
+
+    with open(args.input) as input_file:
+        output = json.load(input_file)
+
+    report = analyze(output, args.expansions, args.window)
+
+    print(f"primitives={report['number_of_primitives']}")
+    print(f"branching_factor={report['branching_factor']}")
+    print(f"mean_branching_factor={report['mean_branching_factor']:.2f}")
+    print(
+        f"trajectory_length total={report['trajectory_length']['total']:.3f} "
+        f"mean={report['trajectory_length']['mean']:.3f}"
+    )
+    print(f"reachable_cells={report['reachable_cells']}")
+
+    if 'coverage' in report:
+        print(f"coverage={report['coverage']:.4f}")
+
+    if args.report is not None:
+        with open(args.report, 'w') as report_file:
+            json.dump(report, report_file, indent='\t')
@@ -0,0 +1,416 @@
+# Copyright (c) 2021, Matthew Booker
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License. Reserved.
+
+"""
+Compact binary container for lattice primitive files.
+
+All values are little-endian. The file is laid out as:
+
+    header          HEADER_DTYPE
+    metadata        UTF-8 JSON of every field except the primitives,
+                    padded to a multiple of 8 bytes
+    primitive table PRIMITIVE_DTYPE for each primitive
+    poses           float32 x, y, yaw for every pose of every primitive
+    swept runs      int32 x, y, length for every run of swept cells of
+                    every primitive
+
+The poses of primitive i are rows pose_offset to pose_offset + pose_count
+of the pose array and its swept cell runs are rows swept_run_offset to
+swept_run_offset + swept_run_count of the run array, so the whole file
+can be memory mapped and read without parsing. has_swept_cells is 1 if
+the primitives have swept cells and 0 otherwise.
+"""
+
+import argparse
+import json
+from pathlib import Path
+
+import numpy as np
+
+MAGIC = b'NAV2LATB'
+FORMAT_VERSION = 2
+
+HEADER_DTYPE = np.dtype(
+    [
+        ('magic', 'S8'),
+        ('format_version', '<u4'),
+        ('metadata_size', '<u4'),
+        ('number_of_primitives', '<u4'),
+        ('number_of_poses', '<u4'),
+        ('number_of_swept_runs', '<u4'),
+        ('has_swept_cells', '<u4'),
+    ]
+)
+
+PRIMITIVE_DTYPE = np.dtype(
+    [
+        ('trajectory_id', '<u4'),
+        ('start_angle_index', '<u4'),
+        ('end_angle_index', '<u4'),
+        ('left_turn', '<u4'),
+        ('trajectory_radius', '<f4'),
+        ('trajectory_length', '<f4'),
+        ('arc_length', '<f4'),
+        ('straight_length', '<f4'),
+        ('pose_offset', '<u4'),
+        ('pose_count', '<u4'),
+        ('swept_run_offset', '<u4'),
+        ('swept_run_count', '<u4'),
+    ]
+)
+
+POSE_DTYPE = np.dtype('<f4')
+
+SWEPT_RUN_DTYPE = np.dtype('<i4')
+
+# The fields of a primitive that the binary format stores
+PRIMITIVE_KEYS = {
+    'trajectory_id',
+    'start_angle_index',
+    'end_angle_index',
+    'left_turn',
+    'trajectory_radius',
+    'trajectory_length',
+    'arc_length',
+    'straight_length',
+    'poses',
+    'swept_cells',
+}
+
+# Number of decimals the positions and lengths are written with in JSON
+JSON_DECIMALS = 5
+
+
+def _pad_to_alignment(size: int, alignment: int = 8) -> int:
+    """Return size rounded up to the next multiple of alignment."""
+    return -(-size // alignment) * alignment
+
+
+def write_binary(output_path: Path, output_dict: dict) -> None:
+    """
+    Write the contents of a lattice output file in the binary format.
+
+    Args:
+    ----
+    output_path: Path
+        The binary file to write
+    output_dict: dict
+        The contents of a lattice output file, as written by write_to_json
+
+    Raises
+    ------
+    ValueError
+        If a primitive has a field the binary format does not store, or
+        only some of the primitives have swept cells
+
+    """
+    primitives = output_dict['primitives']
+
+    unsupported_keys = set().union(*(primitive.keys() for primitive in primitives))
+    unsupported_keys -= PRIMITIVE_KEYS
+
+    if unsupported_keys:
+        raise ValueError(
+            'The binary format can not store the primitive fields: '
+            f'{", ".join(sorted(unsupported_keys))}'
+        )
+
+    has_swept_cells = [('swept_cells' in primitive) for primitive in primitives]
+
+    if any(has_swept_cells) and not all(has_swept_cells):
+        raise ValueError('Either every primitive or none of them must have swept_cells')
+
+    metadata = {key: value for key, value in output_dict.items() if key != 'primitives'}
+    metadata_bytes = json.dumps(metadata).encode('utf-8')
+    metadata_bytes += b' ' * (_pad_to_alignment(len(metadata_bytes)) - len(metadata_bytes))
+
+    table = np.zeros(len(primitives), dtype=PRIMITIVE_DTYPE)
+
+    pose_offset = 0
+    swept_run_offset = 0
+    for row, primitive in zip(table, primitives):
+        row['trajectory_id'] = primitive['trajectory_id']
+        row['start_angle_index'] = primitive['start_angle_index']
+        row['end_angle_index'] = primitive['end_angle_index']
+        row['left_turn'] = primitive['left_turn']
+        row['trajectory_radius'] = primitive['trajectory_radius']
+        row['trajectory_length'] = primitive['trajectory_length']
+        row['arc_length'] = primitive['arc_length']
+        row['straight_length'] = primitive['straight_length']
+        row['pose_offset'] = pose_offset
+        row['pose_count'] = len(primitive['poses'])
+        row['swept_run_offset'] = swept_run_offset
+        row['swept_run_count'] = len(primitive.get('swept_cells', []))
+
+        pose_offset += len(primitive['poses'])
+        swept_run_offset += len(primitive.get('swept_cells', []))
+
+    poses = np.zeros((pose_offset, 3), dtype=POSE_DTYPE)
+    for row, primitive in zip(table, primitives):
+        if row['pose_count'] > 0:
+            poses[row['pose_offset']:row['pose_offset'] + row['pose_count']] = primitive[
+                'poses'
+            ]
+
+    swept_runs = np.zeros((swept_run_offset, 3), dtype=SWEPT_RUN_DTYPE)
+    for row, primitive in zip(table, primitives):
+        if row['swept_run_count'] > 0:
+            start = row['swept_run_offset']
+            swept_runs[start:start + row['swept_run_count']] = primitive['swept_cells']
+
+    header = np.zeros(1, dtype=HEADER_DTYPE)
+    header['magic'] = MAGIC
+    header['format_version'] = FORMAT_VERSION
+    header['metadata_size'] = len(metadata_bytes)
+    header['number_of_primitives'] = len(primitives)
+    header['number_of_poses'] = pose_offset
+    header['number_of_swept_runs'] = swept_run_offset
+    header['has_swept_cells'] = all(has_swept_cells) and len(primitives) > 0
+
+    with open(output_path, 'wb') as output_file:
+        output_file.write(header.tobytes())
+        output_file.write(metadata_bytes)
+        output_file.write(table.tobytes())
+        output_file.write(poses.tobytes())
+        output_file.write(swept_runs.tobytes())
+
+
+class LatticeBinaryFile:
+    """
+    A memory mapped reader of a binary lattice file.
+
+    The primitive table and poses are views into the mapped file, so
+    opening a file only reads its header and metadata.
+    """
+
+    def __init__(self, file_path: Path):
+        """Map the binary lattice file at file_path."""
+        self._data = np.memmap(file_path, dtype=np.uint8, mode='r')
+
+        header = np.frombuffer(self._data, dtype=HEADER_DTYPE, count=1)[0]
+
+        if header['magic'] != MAGIC:
+            raise ValueError(f'{file_path} is not a binary lattice file')
+
+        if header['format_version'] != FORMAT_VERSION:
+            raise ValueError(
+                f'Unsupported binary lattice format version: {header["format_version"]}'
+            )
+
+        offset = HEADER_DTYPE.itemsize
+        metadata_size = int(header['metadata_size'])
+        self.metadata = json.loads(
+            self._data[offset:offset + metadata_size].tobytes().decode('utf-8')
+        )
+
+        offset += metadata_size
+        number_of_primitives = int(header['number_of_primitives'])
+        self.primitives = np.frombuffer(
+            self._data, dtype=PRIMITIVE_DTYPE, count=number_of_primitives, offset=offset
+        )
+
+        offset += PRIMITIVE_DTYPE.itemsize * number_of_primitives
+        self.poses = np.frombuffer(
+            self._data,
+            dtype=POSE_DTYPE,
+            count=3 * int(header['number_of_poses']),
+            offset=offset,
+        ).reshape(-1, 3)
+
+        offset += POSE_DTYPE.itemsize * self.poses.size
+        self.has_swept_cells = bool(header['has_swept_cells'])
+        self.swept_runs = np.frombuffer(
+            self._data,
+            dtype=SWEPT_RUN_DTYPE,
+            count=3 * int(header['number_of_swept_runs']),
+            offset=offset,
+        ).reshape(-1, 3)
+
+    def __len__(self) -> int:
+        """Return the number of primitives in the file."""
+        return len(self.primitives)
+
+    def get_poses(self, idx: int) -> np.array:
+        """
+        Return the poses of a primitive.
+
+        Args:
+        ----
+        idx: int
+            The index of the primitive in the primitive table
+
+        Returns
+        -------
+        np.array(N, 3)
+            A view of the x, y and yaw of the poses of the primitive
+
+        """
+        primitive = self.primitives[idx]
+        start = primitive['pose_offset']
+
+        return self.poses[start:start + primitive['pose_count']]
+
+    def get_swept_runs(self, idx: int) -> np.array:
+        """
+        Return the runs of swept cells of a primitive.
+
+        Args:
+        ----
+        idx: int
+            The index of the primitive in the primitive table
+
+        Returns
+        -------
+        np.array(N, 3)
+            A view of the x, y and length of the runs of swept cells of
+            the primitive, as written by swept_cells.encode_runs
+
+        """
+        primitive = self.primitives[idx]
+        start = primitive['swept_run_offset']
+
+        return self.swept_runs[start:start + primitive['swept_run_count']]
+
+    def to_dict(self) -> dict:
+        """
+        Return the contents of the file in the format written by write_to_json.
+
+        Positions and lengths are rounded back to the precision of the
+        JSON format. Yaws keep the float32 precision they are stored with.
+
+        Returns
+        -------
+        dict
+            The contents of a lattice output file
+
+        """
+        output_dict = dict(self.metadata)
+        output_dict['primitives'] = []
+
+        for idx, primitive in enumerate(self.primitives):
+            poses = self.get_poses(idx).astype(np.float64)
+            poses[:, :2] = poses[:, :2].round(JSON_DECIMALS) + 0.0
+
+            primitive_dict = {
+                'trajectory_id': int(primitive['trajectory_id']),
+                'start_angle_index': int(primitive['start_angle_index']),
+                'end_angle_index': int(primitive['end_angle_index']),
+                'left_turn': bool(primitive['left_turn']),
+                'trajectory_radius': round(
+                    float(primitive['trajectory_radius']), JSON_DECIMALS
+                ),
+                'trajectory_length': round(
+                    float(primitive['trajectory_length']), JSON_DECIMALS
+                ),
+                'arc_length': round(float(primitive['arc_length']), JSON_DECIMALS),
+                'straight_length': round(
+                    float(primitive['straight_length']), JSON_DECIMALS
+                ),
+                'poses': poses.tolist(),
+            }
+
+            if self.has_swept_cells:
+                primitive_dict['swept_cells'] = self.get_swept_runs(idx).tolist()
+
+            output_dict['primitives'].append(primitive_dict)
+
+        return output_dict
+
+
+def read_binary(file_path: Path) -> LatticeBinaryFile:
+    """
+    Open a binary lattice file.
+
+    Args:
+    ----
+    file_path: Path
+        The binary file to read
+
+    Returns
+    -------
+    LatticeBinaryFile
+        A memory mapped reader of the file
+
+    """
+    return LatticeBinaryFile(file_path)
+
+
+def json_to_binary(json_path: Path, binary_path: Path) -> None:
+    """
+    Convert a JSON lattice file to the binary format.
+
+    Args:
+    ----
+    json_path: Path
+        The JSON file to read
+    binary_path: Path
+        The binary file to write
+
+    """
+    with open(json_path) as json_file:
+        output_dict = json.load(json_file)
+
+    write_binary(binary_path, output_dict)
+
+
+def binary_to_json(binary_path: Path, json_path: Path) -> None:
+    """
+    Convert a binary lattice file to the JSON format.
+
+    Args:
+    ----
+    binary_path: Path
+        The binary file to read
+    json_path: Path
+        The JSON file to write
+
+    """
+    output_dict = read_binary(binary_path).to_dict()
+
+    with open(json_path, 'w') as json_file:
+        json.dump(output_dict, json_file, indent='\t')
+
+
+def handle_arg_parsing():
+    """
+    Handle the parsing of arguments.
+
+    Returns
+    -------
+    argparse.Namespace
+        An object containing all parsed arguments
+
+    """
+    parser = argparse.ArgumentParser(
+        description='Convert lattice primitive files between JSON and binary'
+    )
+    parser.add_argument('input', type=Path, help='The file to convert')
+    parser.add_argument('output', type=Path, help='The converted file to write')
+    parser.add_argument(
+        '--to-json',
+        action='store_true',
+        help='Convert from binary to JSON instead of from JSON to binary',
+    )
+
+    return parser.parse_args()
+
+
+if __name__ == '__main__':
+
+    args = handle_arg_parsing()
+
+    if args.to_json:
+        binary_to_json(args.input, args.output)
+    else:
+        json_to_binary(args.input, args.output)
@@ -12,8 +12,13 @@
 # See the License for the specific language governing permissions and
 # limitations under the License. Reserved.
 
-from collections import defaultdict
+from collections import Counter, defaultdict
+from concurrent.futures import ProcessPoolExecutor
 from enum import Enum
+import math
+from typing import Callable, Iterator, Tuple, Union
+
+from heading_table import create_heading_table, HeadingTable
 
 from helper import angle_difference, interpolate_yaws
 
@@ -23,8 +28,14 @@ from rtree import index
 
 from trajectory import Path, Trajectory, TrajectoryParameters
 
+from trajectory_cache import TrajectoryCache
+
 from trajectory_generator import TrajectoryGenerator
 
+# Slack used when comparing analytic trajectories against thresholds
+# to absorb floating point error
+SCREEN_TOLERANCE = 1e-9
+
 
 class LatticeGenerator:
     """
@@ -43,21 +54,52 @@ class LatticeGenerator:
         DIFF = 2
         OMNI = 3
 
-    class Flip(Enum):
-        """An Enum used for determining how a trajectory should be flipped."""
+    Flip = HeadingTable.Flip
+
+    def __init__(self, config: dict, cache: TrajectoryCache = None):
+        """
+        Init the lattice generator from the user supplied config.
+
+        Trajectories and minimal sets are read from and stored in the
+        optional cache so they are not recomputed across runs.
+        """
+        self.config = config
+        self.cache = cache
+
+        # Counts of the work done by the search, used for benchmarking
+        self.statistics = Counter()
 
-        X = 1
-        Y = 2
-        BOTH = 3
+        # Minimal sets of the quadrant 1 start headings and trajectories of
+        # the start headings requested through run_heading, kept so they
+        # are only computed once. They are cleared at the start of every
+        # run so a run never reuses results of another search
+        self._quadrant1_end_poses = {}
+        self._heading_trajectories = {}
 
-    def __init__(self, config: dict):
-        """Init the lattice generator from the user supplied config."""
         self.trajectory_generator = TrajectoryGenerator(config)
         self.grid_resolution = config['grid_resolution']
         self.turning_radius = config['turning_radius']
         self.stopping_threshold = config['stopping_threshold']
         self.num_of_headings = config['num_of_headings']
-        self.headings = self._get_heading_discretization(config['num_of_headings'])
+        self.heading_table = create_heading_table(config)
+        self.headings = self.heading_table.headings
+
+        if not self.heading_table.is_symmetric():
+            raise ValueError(
+                'The headings must be symmetric about the x and y axes and the '
+                'diagonal y = x since only quadrant 1 is searched'
+            )
+
+        off_grid_headings = self.heading_table.get_off_grid_headings(
+            self.num_of_headings
+        )
+        if off_grid_headings:
+            raise ValueError(
+                'The search does not end for headings that do not point at a '
+                'grid point: '
+                + ', '.join(f'{np.rad2deg(heading):.2f}' for heading in off_grid_headings)
+                + ' degrees'
+            )
 
         self.motion_model = self.MotionModel[config['motion_model'].upper()]
 
@@ -101,40 +143,6 @@ class LatticeGenerator:
 
         return np.array(positions)
 
-    def _get_heading_discretization(self, number_of_headings: int) -> list:
-        """
-        Calculate the heading discretization based on the number of headings.
-
-        Does not uniformly generate headings but instead generates a set of
-        discrete headings that is better suited for straight line trajectories.
-
-        Args:
-        number_of_headings: int
-            The number of headings to discretize a 360 degree turn into
-
-        Returns
-        -------
-        list
-            A list of headings in radians
-
-        """
-        max_val = int(number_of_headings / 8)
-
-        outer_edge_x = []
-        outer_edge_y = []
-
-        # Generate points that lie on the perimeter of the surface
-        # of a square with sides of length max_val
-        for i in range(-max_val, max_val + 1):
-            outer_edge_x.extend([i, i])
-            outer_edge_y.extend([-max_val, max_val])
-
-            if i != max_val and i != -max_val:
-                outer_edge_x.extend([-max_val, max_val])
-                outer_edge_y.extend([i, i])
-
-        return sorted([np.arctan2(j, i) for i, j in zip(outer_edge_x, outer_edge_y)])
-
     def _point_to_line_distance(self, p1: np.array, p2: np.array, q: np.array) -> float:
         """
         Return the shortest distance from a point to a line segment.
@@ -165,579 +173,2083 @@ class LatticeGenerator:
 
         return np.linalg.norm(q - projected_point)
 
-    def _is_minimal_trajectory(
-        self, trajectory: Trajectory, prior_end_poses: index.Rtree
-    ) -> bool:
+    def _points_to_segments_distance(
+        self, p1s: np.array, p2s: np.array, qs: np.array
+    ) -> np.array:
         """
-        Determine wheter a trajectory is a minimal trajectory.
+        Return the shortest distances from many points to many line segments.
 
-        Uses an RTree for speedup.
+        This is a batched version of _point_to_line_distance that computes
+        the distance between every segment and every point at once.
 
         Args:
-        trajectory: Trajectory
-            The trajectory to check
-        prior_end_poses: RTree
-            An RTree holding the current minimal set of trajectories
+        p1s: np.array(S, 2)
+            Start points of the line segments
+        p2s: np.array(S, 2)
+            End points of the line segments
+        qs: np.array(P, 2)
+            Points to get the distance away from the line segments of
 
         Returns
         -------
-        bool
-            True if the trajectory is a minimal trajectory otherwise false
+        np.array(S, P)
+            The shortest distance between each segment and each point
 
         """
-        # Iterate over line segments in the trajectory
-        for x1, y1, x2, y2, yaw in zip(
-            trajectory.path.xs[:-1],
-            trajectory.path.ys[:-1],
-            trajectory.path.xs[1:],
-            trajectory.path.ys[1:],
-            trajectory.path.yaws[:-1],
-        ):
+        seg_x = (p2s[:, 0] - p1s[:, 0])[:, np.newaxis]
+        seg_y = (p2s[:, 1] - p1s[:, 1])[:, np.newaxis]
 
-            p1 = np.array([x1, y1])
-            p2 = np.array([x2, y2])
-
-            # Create a bounding box search region
-            # around the line segment
-            left_bb = min(x1, x2) - self.DISTANCE_THRESHOLD
-            right_bb = max(x1, x2) + self.DISTANCE_THRESHOLD
-            top_bb = max(y1, y2) + self.DISTANCE_THRESHOLD
-            bottom_bb = min(y1, y2) - self.DISTANCE_THRESHOLD
-
-            # For any previous end points in the search region we
-            # check the distance to that point and the angle
-            # difference. If they are within threshold then this
-            # trajectory can be composed from a previous trajectory
-            for prior_end_pose in prior_end_poses.intersection(
-                (left_bb, bottom_bb, right_bb, top_bb), objects='raw'
-            ):
-                if (
-                    self._point_to_line_distance(p1, p2, prior_end_pose[:-1])
-                    < self.DISTANCE_THRESHOLD
-                    and angle_difference(yaw, prior_end_pose[-1])
-                    < self.ROTATION_THRESHOLD
-                ):
-                    return False
+        rel_x = qs[np.newaxis, :, 0] - p1s[:, 0, np.newaxis]
+        rel_y = qs[np.newaxis, :, 1] - p1s[:, 1, np.newaxis]
 
-        return True
+        # Get back the l2-norm without the square root
+        l2 = seg_x * seg_x + seg_y * seg_y
+
+        # Ensure t lies in [0, 1]. Segments of zero length project every
+        # point onto their start point
+        t = np.divide(
+            rel_x * seg_x + rel_y * seg_y,
+            l2,
+            out=np.zeros(rel_x.shape),
+            where=l2 != 0,
+        )
+        t = np.clip(t, 0, 1)
 
-    def _compute_min_trajectory_length(self) -> float:
+        dist_x = qs[np.newaxis, :, 0] - (p1s[:, 0, np.newaxis] + t * seg_x)
+        dist_y = qs[np.newaxis, :, 1] - (p1s[:, 1, np.newaxis] + t * seg_y)
+
+        return np.sqrt(dist_x * dist_x + dist_y * dist_y)
+
+    def _get_trajectory_yaw_range(
+        self, trajectory_params: TrajectoryParameters
+    ) -> Tuple[float, float]:
         """
-        Compute the minimum trajectory length for the given parameters.
+        Return the range of yaws a trajectory passes through.
 
-        The minimum trajectory length is defined as the length needed
-        for the sharpest possible turn to move from 0 degrees to the next
-        discrete heading. Since the distance between headings is not uniform
-        we take the smallest possible difference.
+        Args:
+        trajectory_params: TrajectoryParameters
+            The parameters of the trajectory
 
         Returns
         -------
-        float
-            The minimal length of a trajectory
+        tuple
+            The (min_yaw, max_yaw) of the trajectory. The range is not
+            wrapped, so max_yaw may be larger than pi
 
         """
-        # Compute arc length for a turn that moves from 0 degrees to
-        # the minimum heading difference
-        heading_diff = [
-            abs(self.headings[i + 1] - self.headings[i])
-            for i in range(len(self.headings) - 1)
-        ]
+        start_angle = trajectory_params.start_angle
+        sweep = angle_difference(
+            start_angle, trajectory_params.end_angle, trajectory_params.left_turn
+        )
 
-        return self.turning_radius * min(heading_diff)
+        if trajectory_params.left_turn:
+            return start_angle, start_angle + sweep
+
+        return start_angle - sweep, start_angle
 
-    def _generate_minimal_spanning_set(self) -> dict:
+    def _query_prior_end_poses(
+        self, bounds: tuple, yaw_range: tuple, prior_end_poses: index.Rtree
+    ) -> Union[np.array, None]:
         """
-        Generate the minimal spanning set.
+        Return the prior end poses that may lie close to a region.
 
-        Iteratves over all possible trajectories and keeps only those that
-        are part of the minimal set.
+        Only end poses whose yaw is within the rotation threshold of the
+        yaw range are returned, so poses that can never overlap the
+        trajectory are filtered out by the RTree itself.
+
+        Args:
+        bounds: tuple
+            The (left, bottom, right, top) bounding box of the region
+        yaw_range: tuple
+            The (min_yaw, max_yaw) of the trajectory in the region
+        prior_end_poses: RTree
+            An RTree holding the current minimal set of trajectories
 
         Returns
         -------
-        dict
-            A dictionary where the key is the start_angle and the value is
-            a list of trajectories that begin at that angle
+        np.array(N, 3) or None
+            The x, y and yaw of every prior end pose whose bounding box
+            intersects the region, or None if there are none
 
         """
-        quadrant1_end_poses = defaultdict(list)
-
-        # Since we only compute for quadrant 1 we only need headings between
-        # 0 and 90 degrees
-        initial_headings = sorted(
-            filter(lambda x: 0 <= x and x <= np.pi / 2, self.headings)
-        )
-
-        # Use the minimum trajectory length to find the starting wave front
-        min_trajectory_length = self._compute_min_trajectory_length()
-        wave_front_start_pos = int(
-            np.round(min_trajectory_length / self.grid_resolution)
-        )
-
-        for start_heading in initial_headings:
-            iterations_without_trajectory = 0
-
-            prior_end_poses = index.Index()
+        left_bb, bottom_bb, right_bb, top_bb = bounds
 
-            wave_front_cur_pos = wave_front_start_pos
+        min_yaw = yaw_range[0] - self.ROTATION_THRESHOLD - SCREEN_TOLERANCE
+        max_yaw = yaw_range[1] + self.ROTATION_THRESHOLD + SCREEN_TOLERANCE
 
-            # To get target headings: sort headings radially and remove those
-            # that are more than 90 degrees away
-            target_headings = sorted(
-                self.headings, key=lambda x: (abs(x - start_heading), -x)
-            )
-            target_headings = list(
-                filter(lambda x: abs(start_heading - x) <= np.pi / 2, target_headings)
+        # End pose yaws are stored in (-pi, pi], so the parts of the range
+        # that wrap around are queried separately
+        if max_yaw - min_yaw >= 2 * np.pi:
+            yaw_intervals = [(-np.pi, np.pi)]
+        else:
+            yaw_intervals = [(min_yaw, max_yaw)]
+
+            if max_yaw > np.pi:
+                yaw_intervals.append((min_yaw - 2 * np.pi, max_yaw - 2 * np.pi))
+
+            if min_yaw < -np.pi:
+                yaw_intervals.append((min_yaw + 2 * np.pi, max_yaw + 2 * np.pi))
+
+        candidates = []
+        for bottom_yaw, top_yaw in yaw_intervals:
+            self.statistics['rtree_queries'] += 1
+            candidates.extend(
+                prior_end_poses.intersection(
+                    (left_bb, bottom_bb, bottom_yaw, right_bb, top_bb, top_yaw),
+                    objects='raw',
+                )
             )
 
-            while iterations_without_trajectory < self.stopping_threshold:
-                iterations_without_trajectory += 1
+        self.statistics['rtree_candidates'] += len(candidates)
 
-                # Generate x,y coordinates for current wave front
-                positions = self._get_wave_front_points(wave_front_cur_pos)
+        if not candidates:
+            return None
 
-                for target_point in positions:
-                    for target_heading in target_headings:
-                        # Use 10% of grid separation for finer granularity
-                        # when checking if trajectory overlaps another already
-                        # seen trajectory
-                        trajectory = self.trajectory_generator.generate_trajectory(
-                            target_point,
-                            start_heading,
-                            target_heading,
-                            0.1 * self.grid_resolution,
-                        )
+        return np.array(candidates)
+
+    def _overlaps_end_poses(self, trajectory: Trajectory, end_poses: np.array) -> bool:
+        """
+        Determine whether the path of a trajectory passes over any end pose.
 
-                        if trajectory is not None:
-                            # Check if path overlaps something in minimal
-                            # spanning set
-                            if self._is_minimal_trajectory(trajectory, prior_end_poses):
+        Args:
+        trajectory: Trajectory
+            The trajectory to check
+        end_poses: np.array(N, 3)
+            The x, y and yaw of the end poses to check against
 
-                                # Add end pose to minimal set
-                                new_end_pose = np.array(
-                                    [target_point[0], target_point[1], target_heading]
-                                )
+        Returns
+        -------
+        bool
+            True if the trajectory passes within threshold of an end pose
 
-                                quadrant1_end_poses[start_heading].append(
-                                    (target_point, target_heading)
-                                )
+        """
+        xs = trajectory.path.xs
+        ys = trajectory.path.ys
 
-                                # Create a new bounding box in the RTree
-                                # for this trajectory
-                                left_bb = target_point[0] - self.DISTANCE_THRESHOLD
-                                right_bb = target_point[0] + self.DISTANCE_THRESHOLD
-                                bottom_bb = target_point[1] - self.DISTANCE_THRESHOLD
-                                top_bb = target_point[1] + self.DISTANCE_THRESHOLD
+        p1s = np.column_stack((xs[:-1], ys[:-1]))
+        p2s = np.column_stack((xs[1:], ys[1:]))
 
-                                prior_end_poses.insert(
-                                    0,
-                                    (left_bb, bottom_bb, right_bb, top_bb),
-                                    new_end_pose,
-                                )
+        # For every pair of line segment and end pose we check the
+        # distance to that point and the angle difference. If any pair is
+        # within threshold then this trajectory can be composed from a
+        # previous trajectory
+        distances = self._points_to_segments_distance(p1s, p2s, end_poses[:, :-1])
 
-                                iterations_without_trajectory = 0
+        yaw_difs = angle_difference(
+            trajectory.path.yaws[:-1, np.newaxis], end_poses[np.newaxis, :, -1]
+        )
 
-                wave_front_cur_pos += 1
+        overlaps = (distances < self.DISTANCE_THRESHOLD) & (
+            yaw_difs < self.ROTATION_THRESHOLD
+        )
 
-        # Once we have found the minimal trajectory set for quadrant 1
-        # we can leverage symmetry to create the complete minimal set
-        return self._create_complete_minimal_spanning_set(quadrant1_end_poses)
+        return overlaps.any()
 
-    def _flip_angle(self, angle: float, flip_type: Flip) -> float:
+    def _is_minimal_trajectory(
+        self, trajectory: Trajectory, prior_end_poses: index.Rtree
+    ) -> bool:
         """
-        Return the the appropriate flip of the angle in self.headings.
+        Determine wheter a trajectory is a minimal trajectory.
+
+        Uses an RTree for speedup. A single query around the whole
+        trajectory gathers the nearby prior end poses, which are then
+        tested against every line segment of the trajectory at once.
 
         Args:
-        angle: float
-            The angle to flip
-        flip_type: Flip
-            Whether to flip acrpss X axis, Y axis, or both
+        trajectory: Trajectory
+            The trajectory to check
+        prior_end_poses: RTree
+            An RTree holding the current minimal set of trajectories
 
         Returns
         -------
-        float
-            The angle in self.heading that is the appropriate flip
+        bool
+            True if the trajectory is a minimal trajectory otherwise false
 
         """
-        angle_idx = self.headings.index(angle)
+        xs = trajectory.path.xs
+        ys = trajectory.path.ys
+
+        if len(xs) < 2:
+            return True
+
+        # Create a bounding box search region around the whole trajectory.
+        # Every prior end pose that lies close enough to a line segment
+        # must also lie within this region
+        left_bb = xs.min() - self.DISTANCE_THRESHOLD
+        right_bb = xs.max() + self.DISTANCE_THRESHOLD
+        top_bb = ys.max() + self.DISTANCE_THRESHOLD
+        bottom_bb = ys.min() - self.DISTANCE_THRESHOLD
+
+        candidates = self._query_prior_end_poses(
+            (left_bb, bottom_bb, right_bb, top_bb),
+            self._get_trajectory_yaw_range(trajectory.parameters),
+            prior_end_poses,
+        )
 
-        if flip_type == self.Flip.X:
-            heading_idx = (self.num_of_headings / 2 - 1) - angle_idx - 1
-        elif flip_type == self.Flip.Y:
-            heading_idx = self.num_of_headings - angle_idx - 2
-        elif flip_type == self.Flip.BOTH:
-            heading_idx = (
-                angle_idx - (self.num_of_headings / 2)
-            ) % self.num_of_headings
-        else:
-            raise Exception(f'Unsupported flip type: {flip_type}')
+        if candidates is None:
+            return True
 
-        return self.headings[int(heading_idx)]
+        return not self._overlaps_end_poses(trajectory, candidates)
 
-    def _create_complete_minimal_spanning_set(
-        self, single_quadrant_minimal_set: dict
-    ) -> dict:
+    def _get_arc_point_at(
+        self, trajectory_params: TrajectoryParameters, angle: float
+    ) -> tuple:
         """
-        Create the full minimal spanning set from a single quadrant set.
-
-        Exploits the symmetry between the quadrants to create the full set.
-        This is done by flipping every trajectory in the first quadrant across
-        either the X-axis, Y-axis, or both axes.
+        Return the point on the arc circle whose tangent has the given angle.
 
         Args:
-        single_quadrant_minimal_set: dict
-            The minimal set for quadrant 1 (positive x and positive y)
+        trajectory_params: TrajectoryParameters
+            The parameters of the trajectory whose arc is used
+        angle: float or np.array(N,)
+            The tangent angle of the point
 
         Returns
         -------
-        dict
-            The complete minimal spanning set containing the trajectories
-            in all quadrants
+        tuple
+            The x and y coordinates of the point on the circle used to
+            generate the arc
 
         """
-        all_trajectories = defaultdict(list)
-
-        for start_angle in single_quadrant_minimal_set.keys():
+        direction = 1 if trajectory_params.left_turn else -1
+        radius = trajectory_params.turning_radius
 
-            for end_point, end_angle in single_quadrant_minimal_set[start_angle]:
+        return (
+            trajectory_params.x_offset + direction * radius * np.sin(angle),
+            trajectory_params.y_offset - direction * radius * np.cos(angle),
+        )
 
-                x, y = end_point
+    def _get_screen_margins(
+        self, trajectory_params: TrajectoryParameters, sample_spacing: float
+    ) -> tuple:
+        """
+        Return how far a sampled path can stray from its analytic trajectory.
 
-                # Prevent double adding trajectories that lie on axes
-                # (i.e. start and end angle are either both 0 or both pi/2)
-                if start_angle == 0 and end_angle == 0:
-                    unflipped_start_angle = 0.0
-                    flipped_x_start_angle = np.pi
-
-                    unflipped_end_angle = 0.0
-                    flipped_x_end_angle = np.pi
-
-                    # Generate trajectories from calculated parameters
-                    unflipped_trajectory = (
-                        self.trajectory_generator.generate_trajectory(
-                            np.array([x, y]),
-                            unflipped_start_angle,
-                            unflipped_end_angle,
-                            self.grid_resolution,
-                        )
-                    )
-                    flipped_x_trajectory = (
-                        self.trajectory_generator.generate_trajectory(
-                            np.array([-x, -y]),
-                            flipped_x_start_angle,
-                            flipped_x_end_angle,
-                            self.grid_resolution,
-                        )
-                    )
+        Line segments between samples cut across the arc and take the yaw of
+        their first sample. The ends of the arc circle also do not exactly
+        meet the straight lines since the circle parameters are rounded.
 
-                    all_trajectories[
-                        unflipped_trajectory.parameters.start_angle
-                    ].append(unflipped_trajectory)
+        Args:
+        trajectory_params: TrajectoryParameters
+            The parameters of the trajectory
+        sample_spacing: float
+            The distance between samples of the path
 
-                    all_trajectories[
-                        flipped_x_trajectory.parameters.start_angle
-                    ].append(flipped_x_trajectory)
+        Returns
+        -------
+        tuple
+            The largest difference in position and in yaw between the
+            sampled path and the analytic trajectory
 
-                elif abs(start_angle) == np.pi / 2 and abs(end_angle) == np.pi / 2:
-                    unflipped_start_angle = np.pi / 2
-                    flipped_y_start_angle = -np.pi / 2
-
-                    unflipped_end_angle = np.pi / 2
-                    flipped_y_end_angle = -np.pi / 2
-
-                    # Generate trajectories from calculated parameters
-                    unflipped_trajectory = (
-                        self.trajectory_generator.generate_trajectory(
-                            np.array([-x, y]),
-                            unflipped_start_angle,
-                            unflipped_end_angle,
-                            self.grid_resolution,
-                        )
-                    )
+        """
+        distance_margin = SCREEN_TOLERANCE
+        rotation_margin = SCREEN_TOLERANCE
+
+        if trajectory_params.arc_length > 0:
+            radius = trajectory_params.turning_radius
+            start_angle = trajectory_params.start_angle
+            end_angle = start_angle + (
+                trajectory_params.arc_length / radius
+                if trajectory_params.left_turn
+                else -trajectory_params.arc_length / radius
+            )
 
-                    flipped_y_trajectory = (
-                        self.trajectory_generator.generate_trajectory(
-                            np.array([x, -y]),
-                            flipped_y_start_angle,
-                            flipped_y_end_angle,
-                            self.grid_resolution,
-                        )
-                    )
+            arc_start_x, arc_start_y = self._get_arc_point_at(
+                trajectory_params, start_angle
+            )
+            arc_end_x, arc_end_y = self._get_arc_point_at(trajectory_params, end_angle)
 
-                    all_trajectories[
-                        unflipped_trajectory.parameters.start_angle
-                    ].append(unflipped_trajectory)
-                    all_trajectories[
-                        flipped_y_trajectory.parameters.start_angle
-                    ].append(flipped_y_trajectory)
+            gap = max(
+                math.hypot(
+                    arc_start_x - trajectory_params.arc_start_point[0],
+                    arc_start_y - trajectory_params.arc_start_point[1],
+                ),
+                math.hypot(
+                    arc_end_x - trajectory_params.arc_end_point[0],
+                    arc_end_y - trajectory_params.arc_end_point[1],
+                ),
+            )
 
-                else:
-                    unflipped_start_angle = start_angle
-                    flipped_x_start_angle = self._flip_angle(start_angle, self.Flip.X)
-                    flipped_y_start_angle = self._flip_angle(start_angle, self.Flip.Y)
-                    flipped_xy_start_angle = self._flip_angle(
-                        start_angle, self.Flip.BOTH
-                    )
+            distance_margin += sample_spacing**2 / radius + gap
+            rotation_margin += sample_spacing / radius
 
-                    unflipped_end_angle = end_angle
-                    flipped_x_end_angle = self._flip_angle(end_angle, self.Flip.X)
-                    flipped_y_end_angle = self._flip_angle(end_angle, self.Flip.Y)
-                    flipped_xy_end_angle = self._flip_angle(end_angle, self.Flip.BOTH)
+        return distance_margin, rotation_margin
 
-                    # Generate trajectories from calculated parameters
-                    unflipped_trajectory = (
-                        self.trajectory_generator.generate_trajectory(
-                            np.array([x, y]),
-                            unflipped_start_angle,
-                            unflipped_end_angle,
-                            self.grid_resolution,
-                        )
-                    )
-                    flipped_x_trajectory = (
-                        self.trajectory_generator.generate_trajectory(
-                            np.array([-x, y]),
-                            flipped_x_start_angle,
-                            flipped_x_end_angle,
-                            self.grid_resolution,
-                        )
-                    )
-                    flipped_y_trajectory = (
-                        self.trajectory_generator.generate_trajectory(
-                            np.array([x, -y]),
-                            flipped_y_start_angle,
-                            flipped_y_end_angle,
-                            self.grid_resolution,
-                        )
-                    )
-                    flipped_xy_trajectory = (
-                        self.trajectory_generator.generate_trajectory(
-                            np.array([-x, -y]),
-                            flipped_xy_start_angle,
-                            flipped_xy_end_angle,
-                            self.grid_resolution,
-                        )
-                    )
+    def _get_trajectory_bounds(self, trajectory_params: TrajectoryParameters) -> tuple:
+        """
+        Return the bounding box of a trajectory from its parameters.
 
-                    all_trajectories[
-                        unflipped_trajectory.parameters.start_angle
-                    ].append(unflipped_trajectory)
-                    all_trajectories[
-                        flipped_x_trajectory.parameters.start_angle
-                    ].append(flipped_x_trajectory)
-                    all_trajectories[
-                        flipped_y_trajectory.parameters.start_angle
-                    ].append(flipped_y_trajectory)
-                    all_trajectories[
-                        flipped_xy_trajectory.parameters.start_angle
-                    ].append(flipped_xy_trajectory)
+        Args:
+        trajectory_params: TrajectoryParameters
+            The parameters of the trajectory
 
-        return all_trajectories
+        Returns
+        -------
+        tuple
+            The (left, bottom, right, top) bounding box of the trajectory
 
-    def _handle_motion_model(self, spanning_set: dict) -> dict:
         """
-        Add the appropriate motions for the user supplied motion model.
-
-        Ackerman: No additional trajectories
+        xs = [
+            0.0,
+            trajectory_params.arc_start_point[0],
+            trajectory_params.arc_end_point[0],
+            trajectory_params.end_point[0],
+        ]
+        ys = [
+            0.0,
+            trajectory_params.arc_start_point[1],
+            trajectory_params.arc_end_point[1],
+            trajectory_params.end_point[1],
+        ]
 
-        Diff: In place turns to the right and left
+        if trajectory_params.arc_length > 0:
+            sweep = trajectory_params.arc_length / trajectory_params.turning_radius
+            start_angle = trajectory_params.start_angle
+            direction = 1 if trajectory_params.left_turn else -1
+
+            # The arc may bulge past its ends at the points furthest along
+            # each axis, so include those that lie on the arc
+            angles = [start_angle, start_angle + direction * sweep]
+            angles.extend(
+                angle
+                for angle in (0, np.pi / 2, np.pi, 3 * np.pi / 2)
+                if (direction * (angle - start_angle)) % (2 * np.pi) <= sweep
+            )
 
-        Omni: Diff + Sliding movements to right and left
+            for angle in angles:
+                x, y = self._get_arc_point_at(trajectory_params, angle)
+                xs.append(x)
+                ys.append(y)
+
+        return min(xs), min(ys), max(xs), max(ys)
+
+    def _screen_line(
+        self,
+        start_point: np.array,
+        end_point: np.array,
+        yaw: float,
+        start_position: float,
+        poses: np.array,
+        min_position: float,
+    ) -> tuple:
+        """
+        Compare poses against a straight line piece of a trajectory.
 
         Args:
-        spanning set: dict
-            The minimal spanning set
+        start_point: np.array(2,)
+            Start point of the line piece
+        end_point: np.array(2,)
+            End point of the line piece
+        yaw: float
+            The yaw along the line piece
+        start_position: float
+            The distance along the trajectory at which the line piece starts
+        poses: np.array(N, 3)
+            The poses to compare against the line piece
+        min_position: float
+            The smallest distance along the trajectory at which a probed
+            point on the line piece can overlap a pose
 
         Returns
         -------
-        dict
-            The minimal spanning set with additional trajectories based
-            on the motion model
+        tuple of np.array(N,)
+            The distance to the closest point on the piece, the smallest angle
+            difference anywhere on the piece, and the distance and angle
+            difference of the point probed for an overlap
 
         """
-        if self.motion_model == self.MotionModel.ACKERMANN:
-            return spanning_set
+        seg_x = end_point[0] - start_point[0]
+        seg_y = end_point[1] - start_point[1]
+        length_sq = seg_x * seg_x + seg_y * seg_y
 
-        elif self.motion_model == self.MotionModel.DIFF:
-            diff_spanning_set = self._add_in_place_turns(spanning_set)
-            return diff_spanning_set
+        rel_x = poses[:, 0] - start_point[0]
+        rel_y = poses[:, 1] - start_point[1]
 
-        elif self.motion_model == self.MotionModel.OMNI:
-            omni_spanning_set = self._add_in_place_turns(spanning_set)
-            omni_spanning_set = self._add_horizontal_motions(omni_spanning_set)
-            return omni_spanning_set
+        yaw_difs = angle_difference(poses[:, -1], yaw)
+
+        if length_sq == 0:
+            distances = np.hypot(rel_x, rel_y)
+            probe_distances = (
+                distances if start_position >= min_position else np.full_like(distances, np.inf)
+            )
+            return distances, yaw_difs, probe_distances, yaw_difs
+
+        ts = (rel_x * seg_x + rel_y * seg_y) / length_sq
+        closest_ts = np.clip(ts, 0, 1)
+        distances = np.hypot(rel_x - closest_ts * seg_x, rel_y - closest_ts * seg_y)
 
+        # The probed point is the closest point past min_position
+        min_t = max(0, (min_position - start_position) / math.sqrt(length_sq))
+
+        if min_t <= 0:
+            probe_distances = distances
+        elif min_t <= 1:
+            probe_ts = np.clip(ts, min_t, 1)
+            probe_distances = np.hypot(
+                rel_x - probe_ts * seg_x, rel_y - probe_ts * seg_y
+            )
         else:
-            print('No handling implemented for Motion Model: ' + f'{self.motion_model}')
-            raise NotImplementedError
+            probe_distances = np.full_like(distances, np.inf)
 
-    def _add_in_place_turns(self, spanning_set: dict) -> dict:
-        """
-        Add in place turns to the spanning set.
+        return distances, yaw_difs, probe_distances, yaw_difs
 
-        In place turns are trajectories with only a rotational component and
-        only shift a single angular heading step
+    def _screen_arc(
+        self,
+        trajectory_params: TrajectoryParameters,
+        poses: np.array,
+        rotation_limit: float,
+        min_position: float,
+    ) -> tuple:
+        """
+        Compare poses against the arc piece of a trajectory.
 
         Args:
-        spanning_set: dict
-            The minimal spanning set
+        trajectory_params: TrajectoryParameters
+            The parameters of the trajectory whose arc is compared
+        poses: np.array(N, 3)
+            The poses to compare against the arc
+        rotation_limit: float
+            The largest angle difference at which a probed point on the
+            arc can overlap a pose
+        min_position: float
+            The smallest distance along the trajectory at which a probed
+            point on the arc can overlap a pose
 
         Returns
         -------
-        dict
-            The minimal spanning set containing additional in place turns
-            for each start angle
+        tuple of np.array(N,)
+            The distance to the closest point on the arc, the smallest angle
+            difference anywhere on the arc, and the distance and angle
+            difference of the point probed for an overlap
 
         """
-        all_angles = sorted(spanning_set.keys())
+        direction = 1 if trajectory_params.left_turn else -1
+        radius = trajectory_params.turning_radius
+        sweep = trajectory_params.arc_length / radius
+        start_angle = trajectory_params.start_angle
+
+        rel_x = poses[:, 0] - trajectory_params.x_offset
+        rel_y = poses[:, 1] - trajectory_params.y_offset
+
+        # How far along the sweep of the arc lie the point on the circle
+        # closest to each pose and the yaw of each pose
+        closest_offsets = np.mod(
+            direction * np.arctan2(direction * rel_x, -direction * rel_y)
+            - direction * start_angle,
+            2 * np.pi,
+        )
+        yaw_offsets = np.mod(direction * (poses[:, -1] - start_angle), 2 * np.pi)
+
+        # Poses whose closest point on the circle is not on the arc are
+        # closest to one of the ends of the arc
+        distances = np.where(
+            closest_offsets <= sweep,
+            np.abs(np.hypot(rel_x, rel_y) - radius),
+            np.minimum(
+                self._arc_point_distances(trajectory_params, poses, 0),
+                self._arc_point_distances(trajectory_params, poses, sweep),
+            ),
+        )
 
-        for idx, start_angle in enumerate(all_angles):
-            prev_angle_idx = idx - 1 if idx - 1 >= 0 else len(all_angles) - 1
-            next_angle_idx = idx + 1 if idx + 1 < len(all_angles) else 0
+        # The yaw along the arc sweeps from the start angle to the end angle
+        min_yaw_difs = np.where(
+            yaw_offsets <= sweep,
+            0,
+            np.minimum(yaw_offsets - sweep, 2 * np.pi - yaw_offsets),
+        )
 
-            prev_angle = all_angles[prev_angle_idx]
-            next_angle = all_angles[next_angle_idx]
+        # The best point on the arc to probe for an overlap is the one closest
+        # to each pose among the points whose yaw is within rotation_limit of
+        # the yaw of the pose and that lie past min_position. The distance to
+        # the pose grows moving away from the closest point along the circle,
+        # so this is the closest point clamped into that range
+        signed_yaw_offsets = np.where(
+            yaw_offsets > np.pi + sweep / 2, yaw_offsets - 2 * np.pi, yaw_offsets
+        )
+        lower_offsets = np.maximum(
+            signed_yaw_offsets - rotation_limit,
+            max(0, (min_position - trajectory_params.start_straight_length) / radius),
+        )
+        upper_offsets = np.minimum(signed_yaw_offsets + rotation_limit, sweep)
+        probe_offsets = np.clip(
+            signed_yaw_offsets
+            + np.mod(closest_offsets - signed_yaw_offsets + np.pi, 2 * np.pi)
+            - np.pi,
+            lower_offsets,
+            upper_offsets,
+        )
 
-            left_turn_params = TrajectoryParameters.no_arc(
-                end_point=np.array([0, 0]),
-                start_angle=start_angle,
-                end_angle=next_angle,
-            )
-            right_turn_params = TrajectoryParameters.no_arc(
-                end_point=np.array([0, 0]),
-                start_angle=start_angle,
-                end_angle=prev_angle,
-            )
+        probe_distances = np.where(
+            lower_offsets <= upper_offsets,
+            self._arc_point_distances(trajectory_params, poses, probe_offsets),
+            np.inf,
+        )
+        probe_yaw_difs = np.abs(
+            np.mod(signed_yaw_offsets - probe_offsets + np.pi, 2 * np.pi) - np.pi
+        )
 
-            # Calculate number of steps needed to rotate by roughly 10 degrees
-            # for each pose
-            angle_dif = angle_difference(start_angle, next_angle)
-            steps = int(round(angle_dif / np.deg2rad(10))) + 1
+        return distances, min_yaw_difs, probe_distances, probe_yaw_difs
 
-            position = np.full(steps, 0)
-            left_yaws = interpolate_yaws(start_angle, next_angle, True, steps)
-            right_yaws = interpolate_yaws(start_angle, prev_angle, False, steps)
+    def _arc_point_distances(
+        self, trajectory_params: TrajectoryParameters, poses: np.array, offsets
+    ) -> np.array:
+        """
+        Return the distances from poses to points along the arc.
 
-            left_turn_path = Path(xs=position, ys=position, yaws=left_yaws)
-            right_turn_path = Path(xs=position, ys=position, yaws=right_yaws)
+        Args:
+        trajectory_params: TrajectoryParameters
+            The parameters of the trajectory whose arc is used
+        poses: np.array(N, 3)
+            The poses to get the distances of
+        offsets: float or np.array(N,)
+            The angular offsets of the points from the start of the arc
 
-            left_turn = Trajectory(parameters=left_turn_params, path=left_turn_path)
-            right_turn = Trajectory(parameters=right_turn_params, path=right_turn_path)
+        Returns
+        -------
+        np.array(N,)
+            The distance between each pose and its point on the arc
 
-            spanning_set[start_angle].append(left_turn)
-            spanning_set[start_angle].append(right_turn)
+        """
+        direction = 1 if trajectory_params.left_turn else -1
+        x, y = self._get_arc_point_at(
+            trajectory_params, trajectory_params.start_angle + direction * offsets
+        )
 
-        return spanning_set
+        return np.hypot(poses[:, 0] - x, poses[:, 1] - y)
 
-    def _add_horizontal_motions(self, spanning_set: dict) -> dict:
+    def _screen_trajectory(
+        self,
+        trajectory_params: TrajectoryParameters,
+        end_poses: np.array,
+        sample_spacing: float,
+    ) -> Union[bool, None]:
         """
-        Add horizontal sliding motions to the spanning set.
+        Determine whether a trajectory is minimal from its parameters alone.
 
-        The horizontal sliding motions are simply straight line trajectories
-        at 90 degrees to every start angle in the spanning set. The yaw of these
-        trajectories is the same as the start angle for which it is generated.
+        Compares the end poses against the analytic straight lines and arc
+        of the trajectory instead of its sampled path. The sampled path can
+        only differ from the analytic one by a small margin in position and
+        yaw, so poses that are clearly inside or clearly outside of the
+        thresholds give the same decision as _is_minimal_trajectory. When
+        any pose is too close to call no decision is made.
 
         Args:
-        spanning_set: dict
-            The minimal spanning set
+        trajectory_params: TrajectoryParameters
+            The parameters of the trajectory to check
+        end_poses: np.array(N, 3)
+            The x, y and yaw of the prior end poses near the trajectory
+        sample_spacing: float
+            The distance between samples of the path the trajectory
+            would be sampled at
 
         Returns
         -------
-        dict
-            The minimal spanning set containing additional sliding motions
-            for each start angle
+        bool or None
+            True if the trajectory is a minimal trajectory, False if it
+            is not and None if the path needs to be sampled to decide
 
         """
-        # Calculate the offset in the headings list that represents an
-        # angle change of 90 degrees
-        idx_offset = int(self.num_of_headings / 4)
-
-        for idx, angle in enumerate(self.headings):
-
-            # Copy the straight line trajectory for the start angle that
-            # is 90 degrees to the left
-            left_angle_idx = int((idx + idx_offset) % self.num_of_headings)
-            left_angle = self.headings[left_angle_idx]
-            left_trajectories = spanning_set[left_angle]
-            left_straight_trajectory = next(
-                t for t in left_trajectories if t.parameters.end_angle == left_angle
-            )
-
-            # Copy the straight line trajectory for the start angle that
-            # is 90 degrees to the right
-            right_angle_idx = int((idx - idx_offset) % self.num_of_headings)
-            right_angle = self.headings[right_angle_idx]
-            right_trajectories = spanning_set[right_angle]
-            right_straight_trajectory = next(
-                t for t in right_trajectories if t.parameters.end_angle == right_angle
-            )
-
-            yaws = np.full(
-                len(left_straight_trajectory.path.xs), angle, dtype=np.float64
-            )
-
-            # Create a new set of parameters that represents
-            # the left sliding motion
-            parmas_l = left_straight_trajectory.parameters
-            left_motion_parameters = TrajectoryParameters(
-                parmas_l.turning_radius,
-                parmas_l.x_offset,
-                parmas_l.y_offset,
-                parmas_l.end_point,
-                angle,
-                angle,
-                parmas_l.left_turn,
-                parmas_l.arc_start_point,
-                parmas_l.arc_end_point,
-            )
-
-            # Create a new set of parameters that represents
-            # the right sliding motion
-            params_r = right_straight_trajectory.parameters
-            right_motion_parameters = TrajectoryParameters(
-                params_r.turning_radius,
-                params_r.x_offset,
-                params_r.y_offset,
-                params_r.end_point,
-                angle,
-                angle,
-                params_r.left_turn,
-                parmas_l.arc_start_point,
-                parmas_l.arc_end_point,
-            )
-
-            left_motion = Trajectory(
-                parameters=left_motion_parameters,
-                path=Path(
-                    xs=left_straight_trajectory.path.xs,
-                    ys=left_straight_trajectory.path.ys,
-                    yaws=yaws,
-                ),
+        distance_margin, rotation_margin = self._get_screen_margins(
+            trajectory_params, sample_spacing
+        )
+
+        # The sampled path only starts one sample along the trajectory
+        min_position = sample_spacing + SCREEN_TOLERANCE
+
+        pieces = [
+            self._screen_line(
+                (0.0, 0.0),
+                trajectory_params.arc_start_point,
+                trajectory_params.start_angle,
+                0,
+                end_poses,
+                min_position,
+            ),
+            self._screen_line(
+                trajectory_params.arc_end_point,
+                trajectory_params.end_point,
+                trajectory_params.end_angle,
+                trajectory_params.total_length
+                - trajectory_params.end_straight_length,
+                end_poses,
+                min_position,
+            ),
+        ]
+
+        if trajectory_params.arc_length > 0:
+            pieces.append(
+                self._screen_arc(
+                    trajectory_params,
+                    end_poses,
+                    self.ROTATION_THRESHOLD - rotation_margin,
+                    min_position,
+                )
             )
 
-            right_motion = Trajectory(
-                parameters=right_motion_parameters,
-                path=Path(
-                    xs=right_straight_trajectory.path.xs,
-                    ys=right_straight_trajectory.path.ys,
-                    yaws=yaws,
-                ),
+        clear = True
+        for distances, min_yaw_difs, probe_distances, probe_yaw_difs in pieces:
+            # A probed point well within both thresholds proves an overlap
+            if np.any(
+                (probe_distances < self.DISTANCE_THRESHOLD - distance_margin)
+                & (probe_yaw_difs < self.ROTATION_THRESHOLD - rotation_margin)
+            ):
+                return False
+
+            # A piece cannot overlap a pose that is too far away or whose
+            # yaw is too different from anywhere on the piece
+            clear = clear and np.all(
+                (distances >= self.DISTANCE_THRESHOLD + distance_margin)
+                | (min_yaw_difs >= self.ROTATION_THRESHOLD + rotation_margin)
             )
 
-            spanning_set[angle].append(left_motion)
-            spanning_set[angle].append(right_motion)
+        if clear:
+            return True
 
-        return spanning_set
+        return None
 
-    def run(self):
+    def _is_minimal_trajectory_params(
+        self,
+        trajectory_params: TrajectoryParameters,
+        prior_end_poses: index.Rtree,
+        primitive_resolution: float,
+    ) -> bool:
         """
-        Run the lattice generator.
+        Determine whether the trajectory with the given parameters is minimal.
 
-        Returns
-        -------
-        dict
+        The trajectory is first screened from its parameters and its path
+        is only sampled when the screen cannot decide.
+
+        Args:
+        trajectory_params: TrajectoryParameters
+            The parameters of the trajectory to check
+        prior_end_poses: RTree
+            An RTree holding the current minimal set of trajectories
+        primitive_resolution: float
+            The spacing between points of the path used for checking
+
+        Returns
+        -------
+        bool
+            True if the trajectory is a minimal trajectory otherwise false
+
+        """
+        total_length = trajectory_params.total_length
+        number_of_steps = np.round(total_length / primitive_resolution)
+
+        if number_of_steps >= 1:
+            sample_spacing = total_length / number_of_steps
+
+            # Gather every prior end pose that could lie close enough to the
+            # trajectory, allowing for the sampled path straying from it
+            distance_margin, _ = self._get_screen_margins(
+                trajectory_params, sample_spacing
+            )
+            search_distance = self.DISTANCE_THRESHOLD + distance_margin
+            left_bb, bottom_bb, right_bb, top_bb = self._get_trajectory_bounds(
+                trajectory_params
+            )
+
+            candidates = self._query_prior_end_poses(
+                (
+                    left_bb - search_distance,
+                    bottom_bb - search_distance,
+                    right_bb + search_distance,
+                    top_bb + search_distance,
+                ),
+                self._get_trajectory_yaw_range(trajectory_params),
+                prior_end_poses,
+            )
+
+            if candidates is None:
+                return True
+
+            is_minimal = self._screen_trajectory(
+                trajectory_params, candidates, sample_spacing
+            )
+
+            if is_minimal is not None:
+                return is_minimal
+
+            self.statistics['sampled_trajectories'] += 1
+            trajectory = self.trajectory_generator.generate_trajectory_from_parameters(
+                trajectory_params, primitive_resolution
+            )
+
+            return not self._overlaps_end_poses(trajectory, candidates)
+
+        self.statistics['sampled_trajectories'] += 1
+        trajectory = self.trajectory_generator.generate_trajectory_from_parameters(
+            trajectory_params, primitive_resolution
+        )
+
+        return self._is_minimal_trajectory(trajectory, prior_end_poses)
+
+    def _compute_min_trajectory_length(self) -> float:
+        """
+        Compute the minimum trajectory length for the given parameters.
+
+        The minimum trajectory length is defined as the length needed
+        for the sharpest possible turn to move from 0 degrees to the next
+        discrete heading. Since the distance between headings is not uniform
+        we take the smallest possible difference.
+
+        Returns
+        -------
+        float
+            The minimal length of a trajectory
+
+        """
+        # Compute arc length for a turn that moves from 0 degrees to
+        # the minimum heading difference
+        heading_diff = [
+            abs(self.headings[i + 1] - self.headings[i])
+            for i in range(len(self.headings) - 1)
+        ]
+
+        return self.turning_radius * min(heading_diff)
+
+    def _get_initial_headings(self) -> list:
+        """
+        Return the start headings that need to be searched.
+
+        Returns
+        -------
+        list
+            A sorted list of the headings between 0 and 90 degrees
+
+        """
+        # Since we only compute for quadrant 1 we only need headings between
+        # 0 and 90 degrees
+        return sorted(filter(lambda x: 0 <= x and x <= np.pi / 2, self.headings))
+
+    def _get_wave_front_start_pos(self) -> int:
+        """
+        Return the position of the first wave front to search.
+
+        Returns
+        -------
+        int
+            The number of discrete intervals of grid resolution away from
+            the origin at which the search begins
+
+        """
+        # Use the minimum trajectory length to find the starting wave front
+        min_trajectory_length = self._compute_min_trajectory_length()
+
+        return int(np.round(min_trajectory_length / self.grid_resolution))
+
+    def _get_target_headings(self, start_heading: float) -> list:
+        """
+        Return the end headings to search for a start heading.
+
+        Args:
+        start_heading: float
+            The start heading being searched
+
+        Returns
+        -------
+        list
+            The headings within 90 degrees of the start heading in the
+            order they are searched
+
+        """
+        # To get target headings: sort headings radially and remove those
+        # that are more than 90 degrees away
+        target_headings = sorted(
+            self.headings, key=lambda x: self._get_target_heading_key(start_heading, x)
+        )
+
+        return list(
+            filter(lambda x: abs(start_heading - x) <= np.pi / 2, target_headings)
+        )
+
+    def _get_target_heading_key(self, start_heading: float, target_heading: float) -> tuple:
+        """
+        Return the key that orders the target headings of a start heading.
+
+        Sorting by this key gives the order of _get_target_headings without
+        searching that list for every end pose.
+
+        Args:
+        start_heading: float
+            The start heading being searched
+        target_heading: float
+            One of the target headings of start_heading
+
+        Returns
+        -------
+        tuple
+            The distance to the start heading, ties broken by the larger
+            target heading first
+
+        """
+        return (abs(target_heading - start_heading), -target_heading)
+
+    def _get_end_pose_bounds(self, target_point: np.array, target_heading: float) -> tuple:
+        """
+        Return the box an end pose is stored with in the RTree.
+
+        Args:
+        target_point: np.array(2,)
+            The end point of the trajectory
+        target_heading: float
+            The end angle of the trajectory
+
+        Returns
+        -------
+        tuple
+            The (left, bottom, yaw, right, top, yaw) box of the end pose
+
+        """
+        left_bb = target_point[0] - self.DISTANCE_THRESHOLD
+        right_bb = target_point[0] + self.DISTANCE_THRESHOLD
+        bottom_bb = target_point[1] - self.DISTANCE_THRESHOLD
+        top_bb = target_point[1] + self.DISTANCE_THRESHOLD
+
+        return (left_bb, bottom_bb, target_heading, right_bb, top_bb, target_heading)
+
+    def _create_end_pose_index(self, end_poses: list) -> index.Rtree:
+        """
+        Create the RTree holding the end poses of a minimal set.
+
+        The RTree is three dimensional. Every end pose is stored as a box
+        of half the grid resolution around its position, with its yaw as
+        the third coordinate, so queries can be limited to the end poses
+        whose yaw is close enough to overlap a trajectory.
+
+        Args:
+        end_poses: list
+            The (end_point, end_angle) tuples to bulk load into the RTree
+
+        Returns
+        -------
+        RTree
+            An RTree holding the end poses
+
+        """
+        properties = index.Property(dimension=3)
+
+        if not end_poses:
+            return index.Index(properties=properties)
+
+        return index.Index(
+            (
+                (
+                    idx,
+                    self._get_end_pose_bounds(end_point, end_angle),
+                    np.array([end_point[0], end_point[1], end_angle]),
+                )
+                for idx, (end_point, end_angle) in enumerate(end_poses)
+            ),
+            properties=properties,
+        )
+
+    def _insert_end_pose(
+        self,
+        prior_end_poses: index.Rtree,
+        target_point: np.array,
+        target_heading: float,
+    ) -> None:
+        """
+        Add an end pose of the minimal set to the RTree.
+
+        Args:
+        prior_end_poses: RTree
+            An RTree holding the current minimal set of trajectories
+        target_point: np.array(2,)
+            The end point of the trajectory
+        target_heading: float
+            The end angle of the trajectory
+
+        """
+        new_end_pose = np.array([target_point[0], target_point[1], target_heading])
+
+        prior_end_poses.insert(
+            0, self._get_end_pose_bounds(target_point, target_heading), new_end_pose
+        )
+
+    def _search_heading(
+        self,
+        start_heading: float,
+        end_poses: list,
+        wave_front_cur_pos: int,
+        iterations_without_trajectory: int,
+    ) -> list:
+        """
+        Search the wave fronts of a start heading for minimal trajectories.
+
+        Args:
+        start_heading: float
+            The start heading to search trajectories for
+        end_poses: list
+            The (end_point, end_angle) tuples already in the minimal set
+        wave_front_cur_pos: int
+            The wave front to continue the search from
+        iterations_without_trajectory: int
+            The number of wave fronts already searched without finding
+            a trajectory
+
+        Returns
+        -------
+        list
+            A list of (end_point, end_angle) tuples in the order they were
+            added to the minimal set
+
+        """
+        end_poses = list(end_poses)
+
+        prior_end_poses = self._create_end_pose_index(end_poses)
+
+        target_headings = self._get_target_headings(start_heading)
+
+        while iterations_without_trajectory < self.stopping_threshold:
+            iterations_without_trajectory += 1
+
+            # Generate x,y coordinates for current wave front
+            positions = self._get_wave_front_points(wave_front_cur_pos)
+
+            # Solve the trajectories to every position of the wave front
+            # at once for each target heading
+            heading_params = [
+                self.trajectory_generator.generate_trajectory_parameters_batch(
+                    positions, start_heading, target_heading
+                )
+                for target_heading in target_headings
+            ]
+
+            for idx, target_point in enumerate(positions):
+                for target_heading, params_batch in zip(target_headings, heading_params):
+                    trajectory_params = params_batch.get(idx)
+
+                    if trajectory_params is not None:
+                        self.statistics['candidate_trajectories'] += 1
+
+                        # Check if path overlaps something in minimal
+                        # spanning set. Use 10% of grid separation for finer
+                        # granularity when checking if trajectory overlaps
+                        # another already seen trajectory
+                        if self._is_minimal_trajectory_params(
+                            trajectory_params,
+                            prior_end_poses,
+                            0.1 * self.grid_resolution,
+                        ):
+
+                            # Add end pose to minimal set
+                            self.statistics['kept_trajectories'] += 1
+                            end_poses.append((target_point, target_heading))
+
+                            self._insert_end_pose(
+                                prior_end_poses, target_point, target_heading
+                            )
+
+                            iterations_without_trajectory = 0
+
+            wave_front_cur_pos += 1
+
+        return end_poses
+
+    def _generate_minimal_set_for_heading(self, start_heading: float) -> list:
+        """
+        Generate the minimal set of end poses for a single start heading.
+
+        The search for each start heading is independent of every other
+        start heading, which allows them to be run in parallel.
+
+        Args:
+        start_heading: float
+            The start heading to search trajectories for
+
+        Returns
+        -------
+        list
+            A list of (end_point, end_angle) tuples in the order they were
+            added to the minimal set
+
+        """
+        return self._search_heading(
+            start_heading, [], self._get_wave_front_start_pos(), 0
+        )
+
+    def _search_with_statistics(
+        self, search_function: Callable[..., list], *args
+    ) -> Tuple[list, Counter]:
+        """
+        Run a search function and return the statistics it collected.
+
+        Worker processes search on a copy of the generator, so the
+        statistics are returned alongside the result to be merged.
+
+        Args:
+        search_function: Callable[..., list]
+            The search function to run
+        args:
+            The arguments passed to the search function
+
+        Returns
+        -------
+        tuple
+            The result of the search function and the statistics
+            collected while running it
+
+        """
+        statistics = self.statistics
+        self.statistics = Counter()
+
+        try:
+            result = search_function(*args)
+        finally:
+            search_statistics, self.statistics = self.statistics, statistics
+
+        return result, search_statistics
+
+    def _get_wave_front_index(self, end_point: np.array) -> tuple:
+        """
+        Return where an end point lies in the search order of the wave fronts.
+
+        Args:
+        end_point: np.array(2,)
+            An end point on the grid in quadrant 1
+
+        Returns
+        -------
+        tuple
+            The wave front the end point lies on and its position in the
+            points of that wave front
+
+        """
+        i, j = (int(round(coord / self.grid_resolution)) for coord in end_point)
+        wave_front_pos = max(i, j)
+
+        # Matches the order of _get_wave_front_points
+        if i == j:
+            return wave_front_pos, 2 * wave_front_pos
+        elif i == wave_front_pos:
+            return wave_front_pos, 2 * j
+        else:
+            return wave_front_pos, 2 * i + 1
+
+    def _resume_minimal_set_for_heading(
+        self, start_heading: float, end_poses: list, stopping_threshold: int
+    ) -> list:
+        """
+        Continue the search of a start heading from a previous minimal set.
+
+        A search with a larger stopping threshold only continues past the
+        last wave front of the previous search. A search with a smaller
+        stopping threshold would have stopped earlier, so the previous
+        minimal set is cut short instead. An empty minimal set with a
+        stopping threshold of 0 searches from scratch.
+
+        Args:
+        start_heading: float
+            The start heading to search trajectories for
+        end_poses: list
+            The (end_point, end_angle) tuples of the previous minimal set
+        stopping_threshold: int
+            The stopping threshold of the previous search
+
+        Returns
+        -------
+        list
+            A list of (end_point, end_angle) tuples in the order they were
+            added to the minimal set
+
+        """
+        # Restore the order in which the previous search added the end poses
+        end_poses = sorted(
+            end_poses,
+            key=lambda end_pose: (
+                self._get_wave_front_index(end_pose[0]),
+                self._get_target_heading_key(start_heading, end_pose[1]),
+            ),
+        )
+
+        last_wave_front_pos = self._get_wave_front_start_pos() - 1
+
+        for idx, (end_point, _) in enumerate(end_poses):
+            wave_front_pos, _ = self._get_wave_front_index(end_point)
+
+            if wave_front_pos - last_wave_front_pos > self.stopping_threshold:
+                return end_poses[:idx]
+
+            last_wave_front_pos = wave_front_pos
+
+        if stopping_threshold >= self.stopping_threshold:
+            return end_poses
+
+        return self._search_heading(
+            start_heading,
+            end_poses,
+            last_wave_front_pos + stopping_threshold + 1,
+            stopping_threshold,
+        )
+
+    def _get_reflection_source(self, start_heading: float) -> Union[float, None]:
+        """
+        Return the start heading whose minimal set is reflected for a heading.
+
+        A start heading above 45 degrees is created from the minimal set of
+        its reflection across the diagonal y = x. The reflected set is only
+        the one a search would find when the target headings of the two
+        searches are reflections of each other. Floating point error in the
+        headings can leave out a target heading exactly 90 degrees away on
+        one side of the diagonal only, and those start headings are searched.
+
+        Args:
+        start_heading: float
+            A start heading between 0 and 90 degrees
+
+        Returns
+        -------
+        float or None
+            The start heading whose minimal set is reflected, or None if
+            start_heading is searched
+
+        """
+        if start_heading <= np.pi / 4:
+            return None
+
+        reflected_heading = self._flip_angle(start_heading, self.Flip.DIAGONAL)
+
+        reflected_target_headings = {
+            self._flip_angle(target_heading, self.Flip.DIAGONAL)
+            for target_heading in self._get_target_headings(reflected_heading)
+        }
+
+        if reflected_target_headings != set(self._get_target_headings(start_heading)):
+            return None
+
+        return reflected_heading
+
+    def _reflect_minimal_set_for_heading(
+        self, start_heading: float, end_poses: list
+    ) -> list:
+        """
+        Create the minimal set of a start heading from its diagonal reflection.
+
+        The wave fronts and target headings of a search are symmetric
+        about the diagonal y = x, so reflecting the minimal set of the
+        reflected start heading gives the set a search of start_heading
+        would find.
+
+        Args:
+        start_heading: float
+            The start heading to create the minimal set for
+        end_poses: list
+            The (end_point, end_angle) tuples of the minimal set of the
+            reflection of start_heading across the diagonal
+
+        Returns
+        -------
+        list
+            A list of (end_point, end_angle) tuples in the order a search
+            of start_heading would add them to the minimal set
+
+        """
+        reflected_end_poses = [
+            (
+                np.array([end_point[1], end_point[0]]),
+                self._flip_angle(end_angle, self.Flip.DIAGONAL),
+            )
+            for end_point, end_angle in end_poses
+        ]
+
+        return sorted(
+            reflected_end_poses,
+            key=lambda end_pose: (
+                self._get_wave_front_index(end_pose[0]),
+                self._get_target_heading_key(start_heading, end_pose[1]),
+            ),
+        )
+
+    def _get_end_poses_from_output(self, output: dict) -> dict:
+        """
+        Recover the quadrant 1 minimal set from a previously written output.
+
+        Args:
+        output: dict
+            The contents of an output file written by write_to_json
+
+        Returns
+        -------
+        dict
+            A dictionary where the key is the start heading and the value
+            is a list of (end_point, end_angle) tuples
+
+        """
+        metadata = output['lattice_metadata']
+
+        for key in ['turning_radius', 'grid_resolution', 'num_of_headings']:
+            if metadata[key] != self.config[key]:
+                raise ValueError(
+                    f'Cannot resume from an output with {key} = {metadata[key]}, '
+                    + f'expected {self.config[key]}'
+                )
+
+        # The heading indices of the output follow the same ordering as
+        # create_heading_angle_list
+        heading_list = self.heading_table.output_headings
+
+        if not np.allclose(
+            metadata['heading_angles'], np.mod(heading_list, 2 * np.pi)
+        ):
+            raise ValueError(
+                'Cannot resume from an output with different heading_angles'
+            )
+
+        initial_headings = self._get_initial_headings()
+        end_poses = {start_heading: [] for start_heading in initial_headings}
+
+        for primitive in output['primitives']:
+            start_heading = heading_list[primitive['start_angle_index']]
+            end_angle = heading_list[primitive['end_angle_index']]
+            x, y, _ = primitive['poses'][-1]
+
+            # The searched trajectories are the forward moving ones that end
+            # in quadrant 1. Every other trajectory is one of their flips or
+            # was added for the motion model
+            if start_heading not in end_poses or primitive['trajectory_length'] == 0:
+                continue
+
+            if x < -self.DISTANCE_THRESHOLD or y < -self.DISTANCE_THRESHOLD:
+                continue
+
+            # Sliding motions keep the start heading but do not move along it
+            sideways_offset = np.cos(start_heading) * y - np.sin(start_heading) * x
+            if (
+                start_heading == end_angle
+                and abs(sideways_offset) > self.DISTANCE_THRESHOLD
+            ):
+                continue
+
+            # Snap the end point back onto the exact grid coordinates
+            # used by the wave fronts
+            end_point = np.array(
+                [
+                    self.grid_resolution * int(round(x / self.grid_resolution)),
+                    self.grid_resolution * int(round(y / self.grid_resolution)),
+                ]
+            )
+
+            end_poses[start_heading].append((end_point, end_angle))
+
+        return end_poses
+
+    def _get_prior_minimal_set(self, start_heading: float) -> tuple:
+        """
+        Return the minimal set of a start heading stored in the cache.
+
+        Args:
+        start_heading: float
+            The start heading of the minimal set
+
+        Returns
+        -------
+        tuple
+            A list of (end_point, end_angle) tuples and the stopping
+            threshold it was searched with. Without a cache, or when the
+            minimal set is not stored in it, this is an empty set searched
+            with a stopping threshold of 0, which a search starts from
+
+        """
+        if self.cache is None:
+            return [], 0
+
+        prior_minimal_set = self.cache.get_end_poses(
+            self.cache.end_poses_key(self.config, start_heading)
+        )
+
+        if prior_minimal_set is None:
+            return [], 0
+
+        return prior_minimal_set
+
+    def _put_cached_end_poses(self, start_heading: float, end_poses: list) -> None:
+        """
+        Store the minimal set of a start heading in the cache, if there is one.
+
+        A minimal set already in the cache that was searched with a larger
+        stopping threshold is kept, since it can be cut short to give the
+        minimal set of any smaller stopping threshold.
+
+        Args:
+        start_heading: float
+            The start heading of the minimal set
+        end_poses: list
+            The (end_point, end_angle) tuples of the minimal set
+
+        """
+        if self.cache is None:
+            return
+
+        _, prior_stopping_threshold = self._get_prior_minimal_set(start_heading)
+
+        if prior_stopping_threshold < self.stopping_threshold:
+            self.cache.put_end_poses(
+                self.cache.end_poses_key(self.config, start_heading),
+                end_poses,
+                self.stopping_threshold,
+            )
+
+    def _get_quadrant1_end_poses(self, start_heading: float) -> list:
+        """
+        Return the minimal set of end poses of a quadrant 1 start heading.
+
+        The minimal set is only computed the first time it is needed. Start
+        headings with a reflection source are created from its minimal set.
+        The others are searched, continuing from the minimal set in the
+        cache if there is one.
+
+        Args:
+        start_heading: float
+            A start heading between 0 and 90 degrees
+
+        Returns
+        -------
+        list
+            A list of (end_point, end_angle) tuples in the order they were
+            added to the minimal set
+
+        """
+        if start_heading in self._quadrant1_end_poses:
+            return self._quadrant1_end_poses[start_heading]
+
+        reflected_heading = self._get_reflection_source(start_heading)
+
+        if reflected_heading is not None:
+            end_poses = self._reflect_minimal_set_for_heading(
+                start_heading, self._get_quadrant1_end_poses(reflected_heading)
+            )
+        else:
+            end_poses = self._resume_minimal_set_for_heading(
+                start_heading, *self._get_prior_minimal_set(start_heading)
+            )
+            self._put_cached_end_poses(start_heading, end_poses)
+
+        self._quadrant1_end_poses[start_heading] = end_poses
+
+        return end_poses
+
+    def _generate_quadrant1_minimal_set(
+        self, jobs: int = 1, resume_from: dict = None
+    ) -> dict:
+        """
+        Generate the minimal set of end poses for quadrant 1.
+
+        Iteratves over all possible trajectories and keeps only those that
+        are part of the minimal set.
+
+        Args:
+        jobs: int
+            The number of worker processes used to search the start
+            headings. A value of 1 searches them serially
+        resume_from: dict
+            The contents of a previous output file to continue the
+            search from. None searches from scratch
+
+        Returns
+        -------
+        dict
+            A dictionary where the key is the start_angle and the value is
+            a list of (end_point, end_angle) tuples of the trajectories
+            that begin at that angle
+
+        """
+        quadrant1_end_poses = defaultdict(list)
+
+        initial_headings = self._get_initial_headings()
+
+        # Most start headings above 45 degrees are reflections of those below
+        # it across the diagonal y = x, so only the others are searched
+        diagonal_headings = [
+            start_heading
+            for start_heading in initial_headings
+            if self._get_reflection_source(start_heading) is None
+        ]
+
+        if resume_from is not None:
+            output_end_poses = self._get_end_poses_from_output(resume_from)
+            output_stopping_threshold = resume_from['lattice_metadata'][
+                'stopping_threshold'
+            ]
+
+        # The search continues from the minimal set stored in the cache, or
+        # else from the one of the previous output, instead of from scratch
+        search_headings = []
+        prior_end_poses = []
+        prior_stopping_thresholds = []
+        for start_heading in diagonal_headings:
+            end_poses, stopping_threshold = self._get_prior_minimal_set(start_heading)
+
+            if stopping_threshold == 0 and resume_from is not None:
+                end_poses = output_end_poses[start_heading]
+                stopping_threshold = output_stopping_threshold
+
+            search_headings.append(start_heading)
+            prior_end_poses.append(end_poses)
+            prior_stopping_thresholds.append(stopping_threshold)
+
+        search_args = [
+            [self._resume_minimal_set_for_heading] * len(search_headings),
+            search_headings,
+            prior_end_poses,
+            prior_stopping_thresholds,
+        ]
+
+        if jobs > 1:
+            with ProcessPoolExecutor(max_workers=jobs) as executor:
+                # map returns results in the order of search_headings so
+                # the merged set is identical to a serial run
+                search_results = list(
+                    executor.map(self._search_with_statistics, *search_args)
+                )
+        else:
+            search_results = list(map(self._search_with_statistics, *search_args))
+
+        for start_heading, (end_poses, search_statistics) in zip(
+            search_headings, search_results
+        ):
+            self._quadrant1_end_poses[start_heading] = end_poses
+            self.statistics.update(search_statistics)
+            self._put_cached_end_poses(start_heading, end_poses)
+
+        # The reflected start headings are created from the searched ones
+        for start_heading in initial_headings:
+            quadrant1_end_poses[start_heading].extend(
+                self._get_quadrant1_end_poses(start_heading)
+            )
+
+        return quadrant1_end_poses
+
+    def _generate_minimal_spanning_set(
+        self, jobs: int = 1, resume_from: dict = None
+    ) -> dict:
+        """
+        Generate the minimal spanning set.
+
+        Args:
+        jobs: int
+            The number of worker processes used to search the start
+            headings. A value of 1 searches them serially
+        resume_from: dict
+            The contents of a previous output file to continue the
+            search from. None searches from scratch
+
+        Returns
+        -------
+        dict
+            A dictionary where the key is the start_angle and the value is
+            a list of trajectories that begin at that angle
+
+        """
+        quadrant1_end_poses = self._generate_quadrant1_minimal_set(jobs, resume_from)
+
+        # Once we have found the minimal trajectory set for quadrant 1
+        # we can leverage symmetry to create the complete minimal set
+        return self._create_complete_minimal_spanning_set(quadrant1_end_poses)
+
+    def _generate_trajectory(
+        self,
+        end_point: np.array,
+        start_angle: float,
+        end_angle: float,
+        primitive_resolution: float,
+    ) -> Union[Trajectory, None]:
+        """
+        Create a trajectory, reusing it from the cache when possible.
+
+        Args:
+        end_point: np.array(2,)
+            The desired end point of the trajectory
+        start_angle: float
+            The start angle of the trajectory in radians
+        end_angle: float
+            The end angle of the trajectory in radians
+        primitive_resolution: float
+            The spacing between points along the trajectory
+
+        Returns
+        -------
+        Trajectory or None
+            If a valid trajectory exists then the Trajectory is returned,
+            otherwise None
+
+        """
+        if self.cache is None:
+            return self.trajectory_generator.generate_trajectory(
+                end_point, start_angle, end_angle, primitive_resolution
+            )
+
+        key = self.cache.trajectory_key(
+            self.config, end_point, start_angle, end_angle, primitive_resolution
+        )
+        trajectory = self.cache.get_trajectory(key)
+
+        if trajectory is None:
+            trajectory = self.trajectory_generator.generate_trajectory(
+                end_point, start_angle, end_angle, primitive_resolution
+            )
+
+            if trajectory is not None:
+                self.cache.put_trajectory(key, trajectory)
+
+        return trajectory
+
+    def _flip_angle(self, angle: float, flip_type: Flip) -> float:
+        """
+        Return the the appropriate flip of the angle in self.headings.
+
+        Args:
+        angle: float
+            The angle to flip
+        flip_type: Flip
+            Whether to flip acrpss X axis, Y axis, both, or the diagonal
+            y = x
+
+        Returns
+        -------
+        float
+            The angle in self.heading that is the appropriate flip
+
+        """
+        return self.heading_table.flip(angle, flip_type)
+
+    def _get_complete_minimal_set_end_poses(
+        self, single_quadrant_minimal_set: dict
+    ) -> dict:
+        """
+        Find the end poses of the full minimal spanning set.
+
+        Exploits the symmetry between the quadrants to create the full set.
+        This is done by flipping every end pose in the first quadrant across
+        either the X-axis, Y-axis, or both axes.
+
+        Args:
+        single_quadrant_minimal_set: dict
+            The minimal set of end poses for quadrant 1 (positive x and
+            positive y)
+
+        Returns
+        -------
+        dict
+            A dictionary where the key is the start_angle and the value is
+            a list of (end_point, end_angle) tuples of the trajectories
+            that begin at that angle, in all quadrants
+
+        """
+        all_end_poses = defaultdict(list)
+
+        for start_angle in single_quadrant_minimal_set.keys():
+
+            for end_point, end_angle in single_quadrant_minimal_set[start_angle]:
+
+                x, y = end_point
+
+                # Prevent double adding trajectories that lie on axes
+                # (i.e. start and end angle are either both 0 or both pi/2)
+                if start_angle == 0 and end_angle == 0:
+                    all_end_poses[0.0].append((np.array([x, y]), 0.0))
+                    all_end_poses[np.pi].append((np.array([-x, -y]), np.pi))
+
+                elif abs(start_angle) == np.pi / 2 and abs(end_angle) == np.pi / 2:
+                    all_end_poses[np.pi / 2].append((np.array([-x, y]), np.pi / 2))
+                    all_end_poses[-np.pi / 2].append((np.array([x, -y]), -np.pi / 2))
+
+                else:
+                    flipped_x_start_angle = self._flip_angle(start_angle, self.Flip.X)
+                    flipped_y_start_angle = self._flip_angle(start_angle, self.Flip.Y)
+                    flipped_xy_start_angle = self._flip_angle(
+                        start_angle, self.Flip.BOTH
+                    )
+
+                    flipped_x_end_angle = self._flip_angle(end_angle, self.Flip.X)
+                    flipped_y_end_angle = self._flip_angle(end_angle, self.Flip.Y)
+                    flipped_xy_end_angle = self._flip_angle(end_angle, self.Flip.BOTH)
+
+                    all_end_poses[start_angle].append((np.array([x, y]), end_angle))
+                    all_end_poses[flipped_x_start_angle].append(
+                        (np.array([-x, y]), flipped_x_end_angle)
+                    )
+                    all_end_poses[flipped_y_start_angle].append(
+                        (np.array([x, -y]), flipped_y_end_angle)
+                    )
+                    all_end_poses[flipped_xy_start_angle].append(
+                        (np.array([-x, -y]), flipped_xy_end_angle)
+                    )
+
+        return all_end_poses
+
+    def _generate_trajectories_for_heading(
+        self, start_angle: float, end_poses: list
+    ) -> list:
+        """
+        Generate the trajectories from a start angle to each end pose.
+
+        Args:
+        start_angle: float
+            The start angle of the trajectories
+        end_poses: list
+            A list of (end_point, end_angle) tuples
+
+        Returns
+        -------
+        list
+            The trajectories in the order of end_poses
+
+        """
+        return [
+            self._generate_trajectory(
+                end_point, start_angle, end_angle, self.grid_resolution
+            )
+            for end_point, end_angle in end_poses
+        ]
+
+    def _get_end_poses_for_heading(self, start_angle: float) -> list:
+        """
+        Find the end poses of the full minimal spanning set for a start angle.
+
+        Only the quadrant 1 start heading that start_angle is a flip of is
+        needed, so only its minimal set is computed.
+
+        Args:
+        start_angle: float
+            A start angle in self.headings
+
+        Returns
+        -------
+        list
+            A list of (end_point, end_angle) tuples of the trajectories that
+            begin at start_angle, in the same order as
+            _get_complete_minimal_set_end_poses
+
+        """
+        quadrant1_heading = next(
+            angle
+            for angle in [
+                start_angle,
+                self._flip_angle(start_angle, self.Flip.X),
+                self._flip_angle(start_angle, self.Flip.Y),
+                self._flip_angle(start_angle, self.Flip.BOTH),
+            ]
+            if 0 <= angle <= np.pi / 2
+        )
+
+        all_end_poses = self._get_complete_minimal_set_end_poses(
+            {quadrant1_heading: self._get_quadrant1_end_poses(quadrant1_heading)}
+        )
+
+        return all_end_poses[start_angle]
+
+    def _get_straight_trajectory(self, angle: float) -> Trajectory:
+        """
+        Return the straight line trajectory of the minimal set for an angle.
+
+        Args:
+        angle: float
+            The start and end angle of the trajectory
+
+        Returns
+        -------
+        Trajectory
+            The straight line trajectory that begins at angle
+
+        """
+        end_point = next(
+            end_point
+            for end_point, end_angle in self._get_end_poses_for_heading(angle)
+            if end_angle == angle
+        )
+
+        return self._generate_trajectory(end_point, angle, angle, self.grid_resolution)
+
+    def _create_trajectories_for_heading(self, start_angle: float) -> list:
+        """
+        Create the trajectories of the full minimal spanning set for a start angle.
+
+        Args:
+        start_angle: float
+            A start angle in self.headings
+
+        Returns
+        -------
+        list
+            The trajectories that begin at start_angle, including additional
+            motions for the specified motion model
+
+        """
+        trajectories = self._generate_trajectories_for_heading(
+            start_angle, self._get_end_poses_for_heading(start_angle)
+        )
+
+        if self.motion_model in (self.MotionModel.DIFF, self.MotionModel.OMNI):
+            trajectories.extend(
+                self._get_in_place_turns(start_angle)
+            )
+
+        if self.motion_model == self.MotionModel.OMNI:
+            trajectories.extend(
+                self._get_horizontal_motions(start_angle, self._get_straight_trajectory)
+            )
+
+        return trajectories
+
+    def _create_complete_minimal_spanning_set(
+        self, single_quadrant_minimal_set: dict
+    ) -> dict:
+        """
+        Create the full minimal spanning set from a single quadrant set.
+
+        Args:
+        single_quadrant_minimal_set: dict
+            The minimal set for quadrant 1 (positive x and positive y)
+
+        Returns
+        -------
+        dict
+            The complete minimal spanning set containing the trajectories
+            in all quadrants
+
+        """
+        all_trajectories = defaultdict(list)
+
+        all_end_poses = self._get_complete_minimal_set_end_poses(
+            single_quadrant_minimal_set
+        )
+
+        for start_angle, end_poses in all_end_poses.items():
+            all_trajectories[start_angle] = self._generate_trajectories_for_heading(
+                start_angle, end_poses
+            )
+
+        return all_trajectories
+
+    def _handle_motion_model(self, spanning_set: dict) -> dict:
+        """
+        Add the appropriate motions for the user supplied motion model.
+
+        Ackerman: No additional trajectories
+
+        Diff: In place turns to the right and left
+
+        Omni: Diff + Sliding movements to right and left
+
+        Args:
+        spanning set: dict
+            The minimal spanning set
+
+        Returns
+        -------
+        dict
+            The minimal spanning set with additional trajectories based
+            on the motion model
+
+        """
+        if self.motion_model == self.MotionModel.ACKERMANN:
+            return spanning_set
+
+        elif self.motion_model == self.MotionModel.DIFF:
+            diff_spanning_set = self._add_in_place_turns(spanning_set)
+            return diff_spanning_set
+
+        elif self.motion_model == self.MotionModel.OMNI:
+            omni_spanning_set = self._add_in_place_turns(spanning_set)
+            omni_spanning_set = self._add_horizontal_motions(omni_spanning_set)
+            return omni_spanning_set
+
+        else:
+            print('No handling implemented for Motion Model: ' + f'{self.motion_model}')
+            raise NotImplementedError
+
+    def _get_in_place_turns(self, start_angle: float) -> list:
+        """
+        Create the in place turns for a start angle.
+
+        In place turns are trajectories with only a rotational component and
+        only shift a single angular heading step
+
+        Args:
+        start_angle: float
+            The start angle of the in place turns
+
+        Returns
+        -------
+        list
+            The left and right in place turns
+
+        """
+        prev_angle = self.heading_table.step(start_angle, -1)
+        next_angle = self.heading_table.step(start_angle, 1)
+
+        left_turn_params = TrajectoryParameters.no_arc(
+            end_point=np.array([0, 0]),
+            start_angle=start_angle,
+            end_angle=next_angle,
+        )
+        right_turn_params = TrajectoryParameters.no_arc(
+            end_point=np.array([0, 0]),
+            start_angle=start_angle,
+            end_angle=prev_angle,
+        )
+
+        # Calculate number of steps needed to rotate by roughly 10 degrees
+        # for each pose
+        angle_dif = angle_difference(start_angle, next_angle)
+        steps = int(round(angle_dif / np.deg2rad(10))) + 1
+
+        position = np.full(steps, 0)
+        left_yaws = interpolate_yaws(start_angle, next_angle, True, steps)
+        right_yaws = interpolate_yaws(start_angle, prev_angle, False, steps)
+
+        left_turn_path = Path(xs=position, ys=position, yaws=left_yaws)
+        right_turn_path = Path(xs=position, ys=position, yaws=right_yaws)
+
+        left_turn = Trajectory(parameters=left_turn_params, path=left_turn_path)
+        right_turn = Trajectory(parameters=right_turn_params, path=right_turn_path)
+
+        return [left_turn, right_turn]
+
+    def _add_in_place_turns(self, spanning_set: dict) -> dict:
+        """
+        Add in place turns to the spanning set.
+
+        Args:
+        spanning_set: dict
+            The minimal spanning set
+
+        Returns
+        -------
+        dict
+            The minimal spanning set containing additional in place turns
+            for each start angle
+
+        """
+        for start_angle in spanning_set:
+            spanning_set[start_angle].extend(self._get_in_place_turns(start_angle))
+
+        return spanning_set
+
+    def _get_horizontal_motions(
+        self, angle: float, get_straight_trajectory: Callable[[float], Trajectory]
+    ) -> list:
+        """
+        Create the horizontal sliding motions for a start angle.
+
+        The horizontal sliding motions are simply straight line trajectories
+        at 90 degrees to the start angle. The yaw of these trajectories is
+        the same as the start angle for which it is generated.
+
+        Args:
+        angle: float
+            The start angle of the sliding motions
+        get_straight_trajectory: Callable[[float], Trajectory]
+            Returns the straight line trajectory of the minimal set for
+            a start angle
+
+        Returns
+        -------
+        list
+            The left and right sliding motions
+
+        """
+        # Copy the straight line trajectory for the start angle that
+        # is 90 degrees to the left
+        left_straight_trajectory = get_straight_trajectory(
+            self.heading_table.rotate(angle, 1)
+        )
+
+        # Copy the straight line trajectory for the start angle that
+        # is 90 degrees to the right
+        right_straight_trajectory = get_straight_trajectory(
+            self.heading_table.rotate(angle, -1)
+        )
+
+        yaws = np.full(len(left_straight_trajectory.path.xs), angle, dtype=np.float64)
+
+        # Create a new set of parameters that represents
+        # the left sliding motion
+        parmas_l = left_straight_trajectory.parameters
+        left_motion_parameters = TrajectoryParameters(
+            parmas_l.turning_radius,
+            parmas_l.x_offset,
+            parmas_l.y_offset,
+            parmas_l.end_point,
+            angle,
+            angle,
+            parmas_l.left_turn,
+            parmas_l.arc_start_point,
+            parmas_l.arc_end_point,
+        )
+
+        # Create a new set of parameters that represents
+        # the right sliding motion
+        params_r = right_straight_trajectory.parameters
+        right_motion_parameters = TrajectoryParameters(
+            params_r.turning_radius,
+            params_r.x_offset,
+            params_r.y_offset,
+            params_r.end_point,
+            angle,
+            angle,
+            params_r.left_turn,
+            parmas_l.arc_start_point,
+            parmas_l.arc_end_point,
+        )
+
+        left_motion = Trajectory(
+            parameters=left_motion_parameters,
+            path=Path(
+                xs=left_straight_trajectory.path.xs,
+                ys=left_straight_trajectory.path.ys,
+                yaws=yaws,
+            ),
+        )
+
+        right_motion = Trajectory(
+            parameters=right_motion_parameters,
+            path=Path(
+                xs=right_straight_trajectory.path.xs,
+                ys=right_straight_trajectory.path.ys,
+                yaws=yaws,
+            ),
+        )
+
+        return [left_motion, right_motion]
+
+    def _add_horizontal_motions(self, spanning_set: dict) -> dict:
+        """
+        Add horizontal sliding motions to the spanning set.
+
+        Args:
+        spanning_set: dict
+            The minimal spanning set
+
+        Returns
+        -------
+        dict
+            The minimal spanning set containing additional sliding motions
+            for each start angle
+
+        """
+
+        def get_straight_trajectory(angle: float) -> Trajectory:
+            return next(
+                t for t in spanning_set[angle] if t.parameters.end_angle == angle
+            )
+
+        for angle in self.headings:
+            spanning_set[angle].extend(
+                self._get_horizontal_motions(angle, get_straight_trajectory)
+            )
+
+        return spanning_set
+
+    def _clear_memos(self) -> None:
+        """
+        Forget the minimal sets and trajectories of previous runs.
+
+        They depend on the resume_from output and the stopping_threshold
+        of the run that created them, so a new run searches again, reusing
+        only what is stored in the cache.
+        """
+        self._quadrant1_end_poses.clear()
+        self._heading_trajectories.clear()
+
+    def run(self, jobs: int = 1, resume_from: dict = None):
+        """
+        Run the lattice generator.
+
+        Args:
+        jobs: int
+            The number of worker processes used to search the start
+            headings. A value of 1 searches them serially
+        resume_from: dict
+            The contents of a previous output file generated with the
+            same turning_radius, grid_resolution and num_of_headings.
+            Its minimal set is reused and the search only continues
+            where the stopping_threshold requires it
+
+        Returns
+        -------
+        dict
             The minimal spanning set including additional motions for the
             specified motion model
 
         """
-        complete_spanning_set = self._generate_minimal_spanning_set()
+        self._clear_memos()
+        complete_spanning_set = self._generate_minimal_spanning_set(jobs, resume_from)
+
+        if self.cache is not None:
+            self.cache.commit()
 
         return self._handle_motion_model(complete_spanning_set)
+
+    def run_streaming(
+        self, jobs: int = 1, resume_from: dict = None
+    ) -> Iterator[Tuple[float, list]]:
+        """
+        Run the lattice generator one start angle at a time.
+
+        The minimal set of end poses is searched up front, but the
+        trajectories of a start angle are only generated once it is
+        reached, so only the trajectories of a single start angle are held
+        in memory at a time. Start angles are yielded in the order they are
+        written to the output file: ascending from 0 to pi followed by the
+        ascending negative angles.
+
+        Args:
+        jobs: int
+            The number of worker processes used to search the start
+            headings. A value of 1 searches them serially
+        resume_from: dict
+            The contents of a previous output file to continue the
+            search from. See run
+
+        Yields
+        ------
+        tuple
+            The start angle and the list of trajectories that begin at it,
+            including additional motions for the specified motion model
+
+        """
+        self._clear_memos()
+        self._generate_quadrant1_minimal_set(jobs, resume_from)
+
+        for start_angle in sorted(self.headings, key=lambda x: (x < 0, x)):
+            yield start_angle, self._create_trajectories_for_heading(start_angle)
+
+        if self.cache is not None:
+            self.cache.commit()
+
+    def run_heading(self, start_angle: float) -> list:
+        """
+        Run the lattice generator for a single start angle.
+
+        Only the minimal set of the quadrant 1 start heading that
+        start_angle is a flip of is searched, so a single start angle can
+        be inspected without generating the whole lattice. Minimal sets
+        and trajectories are kept, so later calls for the same start angle
+        or for one of its flips do not search again.
+
+        Args:
+        start_angle: float
+            A start angle in self.headings
+
+        Returns
+        -------
+        list
+            The trajectories that begin at start_angle, identical to those
+            returned by run for the same start angle
+
+        """
+        if start_angle not in self.heading_table:
+            raise ValueError(f'{start_angle} is not one of the lattice headings')
+
+        if start_angle not in self._heading_trajectories:
+            self._heading_trajectories[start_angle] = (
+                self._create_trajectories_for_heading(start_angle)
+            )
+
+            if self.cache is not None:
+                self.cache.commit()
+
+        return self._heading_trajectories[start_angle]
@@ -0,0 +1,344 @@
+# Copyright (c) 2021, Matthew Booker
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License. Reserved.
+
+"""
+Reduce a lattice to a fixed number of primitives per start heading.
+
+Works on the contents of an output file written by write_to_json and
+measures coverage the same way as lattice_analyzer: the (x, y, heading)
+cells reachable from the origin within a number of expansions. The
+coverage of a primitive is the set of cells reached by taking it first
+and then expanding the complete lattice for the remaining expansions.
+The straight and in place turn primitives of each start heading are
+always kept, since the planner can not move forward or turn on the spot
+without them. The remaining primitives are picked greedily by how many
+cells they add to those already covered, preferring shorter primitives
+when they add the same number.
+"""
+
+import argparse
+import copy
+import json
+from pathlib import Path
+
+from lattice_analyzer import (
+    compute_reachability,
+    get_primitive_offsets,
+    get_reachable_cells,
+)
+
+import numpy as np
+
+
+def get_required_primitives(output: dict) -> np.array:
+    """
+    Find the primitives that are kept regardless of the budget.
+
+    These are the in place turns, which have no length, and the straight
+    primitives, which end along their start heading at the same heading.
+
+    Args:
+    ----
+    output: dict
+        The contents of an output file
+
+    Returns
+    -------
+    np.array(N,)
+        True for every primitive that is always kept
+
+    """
+    heading_angles = np.array(output['lattice_metadata']['heading_angles'])
+    grid_resolution = output['lattice_metadata']['grid_resolution']
+    primitives = output['primitives']
+
+    start_angle_indices, _, end_angle_indices = get_primitive_offsets(output)
+    lengths = np.array([primitive['trajectory_length'] for primitive in primitives])
+    end_points = np.array(
+        [primitive['poses'][-1][:2] for primitive in primitives], dtype=np.float64
+    ).reshape(-1, 2)
+
+    cos_th = np.cos(heading_angles[start_angle_indices])
+    sin_th = np.sin(heading_angles[start_angle_indices])
+    forward = cos_th * end_points[:, 0] + sin_th * end_points[:, 1]
+    sideways = cos_th * end_points[:, 1] - sin_th * end_points[:, 0]
+
+    is_straight = (
+        (start_angle_indices == end_angle_indices)
+        & (forward > 0)
+        & (np.abs(sideways) <= 0.5 * grid_resolution)
+    )
+
+    return (lengths == 0) | is_straight
+
+
+def rank_primitives(output: dict, expansions: int = 5, window: int = None) -> list:
+    """
+    Rank the primitives of every start heading by marginal coverage.
+
+    The primitives found by get_required_primitives are picked first. Each
+    following step picks the primitive that adds the most cells to the
+    coverage of those already picked for its start heading. Ties are
+    broken by the shorter trajectory length and then by the order in the
+    file.
+
+    Args:
+    ----
+    output: dict
+        The contents of an output file
+    expansions: int
+        The number of expansions coverage is measured over
+    window: int
+        Only cells at most this many cells away from the origin along x
+        and y are covered. None does not limit the coverage
+
+    Returns
+    -------
+    list
+        For each start angle index, a list of (primitive index, marginal
+        coverage) tuples in the order they were picked
+
+    """
+    required = get_required_primitives(output)
+    num_of_headings = len(output['lattice_metadata']['heading_angles'])
+    start_angle_indices, offsets, end_angle_indices = get_primitive_offsets(output)
+    lengths = [primitive['trajectory_length'] for primitive in output['primitives']]
+
+    if window is None:
+        window = expansions * int(np.abs(offsets).max(initial=0))
+
+    width = 2 * window + 1
+
+    # The cells reachable after a primitive are those reachable from its
+    # end heading, moved by its offset
+    reachable_cells = [
+        get_reachable_cells(output, expansions - 1, start_angle_index=end_angle_index)
+        for end_angle_index in range(num_of_headings)
+    ]
+
+    def get_coverage(idx):
+        xs = reachable_cells[end_angle_indices[idx]][:, 0] + offsets[idx, 0]
+        ys = reachable_cells[end_angle_indices[idx]][:, 1] + offsets[idx, 1]
+        headings = reachable_cells[end_angle_indices[idx]][:, 2]
+
+        in_window = (np.abs(xs) <= window) & (np.abs(ys) <= window)
+
+        return (
+            (xs[in_window] + window) * width + (ys[in_window] + window)
+        ) * num_of_headings + headings[in_window]
+
+    rankings = []
+    for start_angle_index in range(num_of_headings):
+        coverage = {
+            idx: get_coverage(idx)
+            for idx in np.flatnonzero(start_angle_indices == start_angle_index)
+        }
+        covered = np.zeros(width * width * num_of_headings, dtype=bool)
+        ranking = []
+
+        for idx in [idx for idx in coverage if required[idx]]:
+            keys = coverage.pop(idx)
+            ranking.append((int(idx), int(np.count_nonzero(~covered[keys]))))
+            covered[keys] = True
+
+        while coverage:
+            marginal_coverage = {
+                idx: int(np.count_nonzero(~covered[keys]))
+                for idx, keys in coverage.items()
+            }
+            best = max(
+                coverage,
+                key=lambda idx: (marginal_coverage[idx], -lengths[idx], -idx),
+            )
+
+            ranking.append((int(best), marginal_coverage[best]))
+            covered[coverage.pop(best)] = True
+
+        rankings.append(ranking)
+
+    return rankings
+
+
+def prune(output: dict, budget: int, expansions: int = 5, window: int = None) -> dict:
+    """
+    Keep only the highest ranked primitives of every start heading.
+
+    Args:
+    ----
+    output: dict
+        The contents of an output file
+    budget: int
+        The largest number of primitives kept for each start heading in
+        addition to its straight and in place turn primitives
+    expansions: int
+        The number of expansions coverage is measured over
+    window: int
+        Only cells at most this many cells away from the origin along x
+        and y are covered. None does not limit the coverage
+
+    Returns
+    -------
+    dict
+        The contents of an output file holding the kept primitives, in
+        their original order and with consecutive trajectory ids
+
+    """
+    required = get_required_primitives(output)
+
+    # The required primitives are ranked first and do not use the budget
+    kept = sorted(
+        idx
+        for ranking in rank_primitives(output, expansions, window)
+        for idx, _ in ranking[: budget + sum(required[idx] for idx, _ in ranking)]
+    )
+
+    pruned_output = {
+        key: copy.deepcopy(value) for key, value in output.items() if key != 'primitives'
+    }
+    pruned_output['primitives'] = []
+
+    for trajectory_id, idx in enumerate(kept):
+        primitive = dict(output['primitives'][idx], trajectory_id=trajectory_id)
+        pruned_output['primitives'].append(primitive)
+
+    pruned_output['lattice_metadata']['number_of_trajectories'] = len(kept)
+
+    return pruned_output
+
+
+def create_pruning_report(
+    output: dict, pruned_output: dict, expansions: int, window: int = None
+) -> dict:
+    """
+    Measure how much coverage was lost by pruning.
+
+    The coverage of a lattice is the sum of the cells reachable from every
+    start heading.
+
+    Args:
+    ----
+    output: dict
+        The contents of the original output file
+    pruned_output: dict
+        The contents of the pruned output file
+    expansions: int
+        The number of expansions coverage is measured over
+    window: int
+        Only cells at most this many cells away from the origin along x
+        and y are covered. None does not limit the coverage
+
+    Returns
+    -------
+    dict
+        The number of primitives and cells reachable in each expansion
+        before and after pruning, along with the share of cells lost
+
+    """
+    if window is None:
+        # Use the same grid for both lattices
+        _, offsets, _ = get_primitive_offsets(output)
+        window = expansions * int(np.abs(offsets).max(initial=0))
+
+    num_of_headings = len(output['lattice_metadata']['heading_angles'])
+    reachable = sum(
+        compute_reachability(output, expansions, window, start_angle_index)
+        for start_angle_index in range(num_of_headings)
+    )
+    pruned_reachable = sum(
+        compute_reachability(pruned_output, expansions, window, start_angle_index)
+        for start_angle_index in range(num_of_headings)
+    )
+
+    return {
+        'number_of_primitives': len(output['primitives']),
+        'pruned_number_of_primitives': len(pruned_output['primitives']),
+        'expansions': expansions,
+        'window': window,
+        'reachable_cells': reachable.tolist(),
+        'pruned_reachable_cells': pruned_reachable.tolist(),
+        'coverage_lost': float(1 - pruned_reachable[-1] / reachable[-1]),
+    }
+
+
+def handle_arg_parsing():
+    """
+    Handle the parsing of arguments.
+
+    Returns
+    -------
+    argparse.Namespace
+        An object containing all parsed arguments
+
+    """
+    parser = argparse.ArgumentParser(
+        description='Reduce a lattice primitive file to a number of '
+        'primitives per start heading'
+    )
+    parser.add_argument('input', type=Path, help='The output file to prune')
+    parser.add_argument('output', type=Path, help='The pruned output file to write')
+    parser.add_argument(
+        '--budget',
+        type=int,
+        required=True,
+        help='The largest number of primitives kept for each start heading '
+        'besides its straight and in place turn primitives',
+    )
+    parser.add_argument(
+        '--expansions',
+        type=int,
+        default=5,
+        help='The number of expansions coverage is measured over',
+    )
+    parser.add_argument(
+        '--window',
+        type=int,
+        default=None,
+        help='Only measure coverage of cells at most this many cells '
+        'from the origin',
+    )
+    parser.add_argument(
+        '--report',
+        type=Path,
+        default=None,
+        help='Also write the coverage lost to this JSON file',
+    )
+
+    return parser.parse_args()
+
+
+if __name__ == '__main__':
+
+    args = handle_arg_parsing()
+
+    with open(args.input) as input_file:
+        output = json.load(input_file)
+
+    pruned_output = prune(output, args.budget, args.expansions, args.window)
+
+    with open(args.output, 'w') as output_file:
+        json.dump(pruned_output, output_file, indent='\t')
+
+    report = create_pruning_report(output, pruned_output, args.expansions, args.window)
+
+    print(
+        f"primitives={report['number_of_primitives']} "
+        f"pruned={report['pruned_number_of_primitives']}"
+    )
+    print(f"reachable_cells={report['reachable_cells']}")
+    print(f"pruned_reachable_cells={report['pruned_reachable_cells']}")
+    print(f"coverage_lost={report['coverage_lost']:.4f}")
+
+    if args.report is not None:
+        with open(args.report, 'w') as report_file:
+            json.dump(report, report_file, indent='\t')
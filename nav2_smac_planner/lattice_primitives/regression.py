@@ -0,0 +1,536 @@
+# Copyright (c) 2021, Matthew Booker
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License. Reserved.
+
+"""
+Regression check of the lattice generator against stored golden outputs.
+
+The golden folder holds a gzipped output file for every config of a fixed
+matrix, along with a manifest of the configs and an optional note on why
+each golden output was recorded. Checking regenerates every config and
+compares the primitives with those of its golden output, so changes that
+should not alter the lattice, such as vectorized or parallel rewrites,
+can be accepted with confidence. The wall time of every config can be
+compared with that of a report written by an older version on the same
+machine.
+"""
+
+import argparse
+import gzip
+import json
+from pathlib import Path
+import sys
+import time
+
+from benchmark import create_config_matrix
+from generate_motion_primitives import create_output_dict
+from lattice_generator import LatticeGenerator
+
+import numpy as np
+
+DEFAULT_GOLDEN_DIR = Path(__file__).parent / 'golden_primitives'
+
+DEFAULT_HEADINGS = [16, 32]
+DEFAULT_RESOLUTIONS = [0.1, 0.05]
+DEFAULT_MOTION_MODELS = ['ackermann', 'diff', 'omni']
+
+MANIFEST_NAME = 'manifest.json'
+
+# Positions, yaws and lengths are written with 5 decimals
+DEFAULT_TOLERANCE = 1e-5
+
+# The number of differences reported for a single config
+MAX_DIFFERENCES = 10
+
+
+def handle_arg_parsing():
+    """
+    Handle the parsing of arguments.
+
+    Returns
+    -------
+    argparse.Namespace
+        An object containing all parsed arguments
+
+    """
+    parser = argparse.ArgumentParser(
+        description='Check the lattice primitive generator against stored '
+        'golden outputs'
+    )
+    parser.add_argument(
+        '--golden-dir',
+        type=Path,
+        default=DEFAULT_GOLDEN_DIR,
+        help='The folder holding the golden outputs and their manifest',
+    )
+    parser.add_argument(
+        '--record',
+        action='store_true',
+        help='Generate and store new golden outputs instead of checking '
+        'against the stored ones',
+    )
+    parser.add_argument(
+        '--headings',
+        type=int,
+        nargs='+',
+        default=DEFAULT_HEADINGS,
+        help='The numbers of headings to record',
+    )
+    parser.add_argument(
+        '--resolutions',
+        type=float,
+        nargs='+',
+        default=DEFAULT_RESOLUTIONS,
+        help='The grid resolutions to record',
+    )
+    parser.add_argument(
+        '--motion-models',
+        nargs='+',
+        choices=DEFAULT_MOTION_MODELS,
+        default=DEFAULT_MOTION_MODELS,
+        help='The motion models to record',
+    )
+    parser.add_argument(
+        '--turning-radius',
+        type=float,
+        default=0.5,
+        help='The turning radius used for every recorded config',
+    )
+    parser.add_argument(
+        '--stopping-threshold',
+        type=int,
+        default=5,
+        help='The stopping threshold used for every recorded config',
+    )
+    parser.add_argument(
+        '--jobs',
+        type=int,
+        default=1,
+        help='The number of worker processes used by each run',
+    )
+    parser.add_argument(
+        '--note',
+        default=None,
+        help='Why the golden outputs are recorded, stored in the manifest '
+        'next to each recorded config',
+    )
+    parser.add_argument(
+        '--tolerance',
+        type=float,
+        default=DEFAULT_TOLERANCE,
+        help='The largest difference allowed between values of the '
+        'generated and golden primitives',
+    )
+    parser.add_argument(
+        '--report',
+        type=Path,
+        default=None,
+        help='Also write the results of the check to this JSON file',
+    )
+    parser.add_argument(
+        '--baseline-report',
+        type=Path,
+        default=None,
+        help='A report written with --report, or by benchmark.py, on the '
+        'same machine, e.g. by an older version. The wall time of every '
+        'config is compared with the one in this report',
+    )
+
+    return parser.parse_args()
+
+
+def get_golden_name(config: dict) -> str:
+    """
+    Return the file name of the golden output of a config.
+
+    Args:
+    ----
+    config: dict
+        The config the golden output is generated with
+
+    Returns
+    -------
+    str
+        The file name of the gzipped output file
+
+    """
+    return (
+        f"{config['motion_model']}_{config['num_of_headings']}_"
+        f"{config['grid_resolution']}_{config['turning_radius']}_"
+        f"{config['stopping_threshold']}.json.gz"
+    )
+
+
+def generate_output(config: dict, jobs: int = 1) -> tuple:
+    """
+    Generate the output file contents of a config and time it.
+
+    Args:
+    ----
+    config: dict
+        The config to generate the lattice for
+    jobs: int
+        The number of worker processes used by the generator
+
+    Returns
+    -------
+    tuple
+        The contents of the output file and the time taken to generate
+        the lattice in seconds
+
+    """
+    start = time.perf_counter()
+    minimal_set_trajectories = LatticeGenerator(config).run(jobs)
+    wall_time = time.perf_counter() - start
+
+    return create_output_dict(minimal_set_trajectories, config), wall_time
+
+
+def read_golden_output(golden_path: Path) -> dict:
+    """
+    Read a gzipped golden output.
+
+    Args:
+    ----
+    golden_path: Path
+        The golden output file
+
+    Returns
+    -------
+    dict
+        The contents of the output file
+
+    """
+    with gzip.open(golden_path, 'rt') as golden_file:
+        return json.load(golden_file)
+
+
+def read_manifest(golden_dir: Path) -> dict:
+    """
+    Read the manifest of a golden folder.
+
+    Args:
+    ----
+    golden_dir: Path
+        The folder holding the golden outputs
+
+    Returns
+    -------
+    dict
+        The config and the optional note of every golden output, keyed by
+        its file name
+
+    """
+    with open(golden_dir / MANIFEST_NAME) as manifest_file:
+        return json.load(manifest_file)
+
+
+def record_golden_outputs(
+    configs: list, golden_dir: Path, jobs: int = 1, note: str = None
+) -> dict:
+    """
+    Generate and store the golden output of every config.
+
+    Configs already in the manifest of the golden folder that are not
+    recorded again keep their golden output and manifest entry.
+
+    Args:
+    ----
+    configs: list
+        The configs to record
+    golden_dir: Path
+        The folder the golden outputs and their manifest are written to
+    jobs: int
+        The number of worker processes used by the generator
+    note: str
+        Why the golden outputs are recorded, if given
+
+    Returns
+    -------
+    dict
+        The manifest of the golden folder
+
+    """
+    golden_dir.mkdir(parents=True, exist_ok=True)
+
+    manifest = {}
+    if (golden_dir / MANIFEST_NAME).exists():
+        manifest = read_manifest(golden_dir)
+
+    for config in configs:
+        output_dict, _ = generate_output(config, jobs)
+        name = get_golden_name(config)
+
+        # mtime=0 keeps the file identical when the output does not change
+        with open(golden_dir / name, 'wb') as golden_file:
+            with gzip.GzipFile(fileobj=golden_file, mode='wb', mtime=0) as gzip_file:
+                gzip_file.write(json.dumps(output_dict, indent='\t').encode('utf-8'))
+
+        manifest[name] = {'config': config}
+        if note is not None:
+            manifest[name]['note'] = note
+
+    with open(golden_dir / MANIFEST_NAME, 'w') as manifest_file:
+        json.dump(manifest, manifest_file, indent='\t')
+
+    return manifest
+
+
+def _compare_values(name: str, golden_value, value, tolerance: float) -> list:
+    """Return a difference if two numbers or lists of numbers differ."""
+    golden_value = np.asarray(golden_value, dtype=np.float64)
+    value = np.asarray(value, dtype=np.float64)
+
+    if golden_value.shape != value.shape:
+        return [f'{name}: shape {value.shape} != golden {golden_value.shape}']
+
+    if not np.allclose(value, golden_value, rtol=0, atol=tolerance):
+        error = np.abs(value - golden_value).max()
+        return [f'{name}: differs by up to {error:.3g}']
+
+    return []
+
+
+def compare_outputs(
+    golden_output: dict, output: dict, tolerance: float = DEFAULT_TOLERANCE
+) -> list:
+    """
+    Compare the primitives of an output with those of its golden output.
+
+    The date, version and order of the primitives are ignored. Primitives
+    are matched by trajectory id and must have the same angle indices and
+    turn direction, and lengths and poses within the tolerance.
+
+    Args:
+    ----
+    golden_output: dict
+        The contents of the golden output file
+    output: dict
+        The contents of the output file being checked
+    tolerance: float
+        The largest difference allowed between lengths, positions or
+        yaws
+
+    Returns
+    -------
+    list
+        A description of every difference found. An empty list means the
+        outputs match
+
+    """
+    differences = []
+
+    golden_metadata = golden_output['lattice_metadata']
+    metadata = output['lattice_metadata']
+
+    for key in sorted(set(golden_metadata) | set(metadata)):
+        if key not in metadata or key not in golden_metadata:
+            differences.append(f'lattice_metadata.{key}: only in one of the outputs')
+        elif key == 'heading_angles':
+            differences += _compare_values(
+                f'lattice_metadata.{key}', golden_metadata[key], metadata[key], tolerance
+            )
+        elif metadata[key] != golden_metadata[key]:
+            differences.append(
+                f'lattice_metadata.{key}: {metadata[key]} != golden {golden_metadata[key]}'
+            )
+
+    golden_primitives = {
+        primitive['trajectory_id']: primitive for primitive in golden_output['primitives']
+    }
+    primitives = {primitive['trajectory_id']: primitive for primitive in output['primitives']}
+
+    missing_ids = sorted(set(golden_primitives) - set(primitives))
+    extra_ids = sorted(set(primitives) - set(golden_primitives))
+
+    if missing_ids:
+        differences.append(f'trajectory ids missing: {missing_ids}')
+    if extra_ids:
+        differences.append(f'trajectory ids not in golden: {extra_ids}')
+
+    for trajectory_id in sorted(set(golden_primitives) & set(primitives)):
+        golden_primitive = golden_primitives[trajectory_id]
+        primitive = primitives[trajectory_id]
+        name = f'trajectory {trajectory_id}'
+
+        for key in ['start_angle_index', 'end_angle_index', 'left_turn']:
+            if primitive[key] != golden_primitive[key]:
+                differences.append(
+                    f'{name} {key}: {primitive[key]} != golden {golden_primitive[key]}'
+                )
+
+        for key in ['trajectory_radius', 'trajectory_length', 'arc_length', 'straight_length']:
+            differences += _compare_values(
+                f'{name} {key}', golden_primitive[key], primitive[key], tolerance
+            )
+
+        golden_poses = np.array(golden_primitive['poses']).reshape(-1, 3)
+        poses = np.array(primitive['poses']).reshape(-1, 3)
+
+        if golden_poses.shape != poses.shape:
+            differences.append(
+                f'{name} poses: {len(poses)} poses != golden {len(golden_poses)}'
+            )
+            continue
+
+        differences += _compare_values(
+            f'{name} positions', golden_poses[:, :2], poses[:, :2], tolerance
+        )
+
+        # Yaws close to 0 and 2 pi are the same heading
+        yaw_differences = np.mod(poses[:, 2] - golden_poses[:, 2] + np.pi, 2 * np.pi) - np.pi
+        differences += _compare_values(
+            f'{name} yaws', np.zeros(len(poses)), yaw_differences, tolerance
+        )
+
+    return differences
+
+
+def read_baseline_report(report_path: Path) -> dict:
+    """
+    Read the wall times of a previous report.
+
+    Args:
+    ----
+    report_path: Path
+        A report written by regression.py with --report, or by
+        benchmark.py
+
+    Returns
+    -------
+    dict
+        The wall time of every config in the report, keyed by its golden
+        file name
+
+    """
+    with open(report_path) as report_file:
+        report = json.load(report_file)
+
+    # benchmark.py stores its results next to the environment
+    if isinstance(report, dict):
+        report = report['results']
+
+    return {get_golden_name(result['config']): result['wall_time'] for result in report}
+
+
+def check_golden_outputs(
+    golden_dir: Path,
+    jobs: int = 1,
+    tolerance: float = DEFAULT_TOLERANCE,
+    baseline_wall_times: dict = None,
+) -> list:
+    """
+    Regenerate every golden output and compare it with the stored one.
+
+    Args:
+    ----
+    golden_dir: Path
+        The folder holding the golden outputs and their manifest
+    jobs: int
+        The number of worker processes used by the generator
+    tolerance: float
+        The largest difference allowed between lengths, positions or
+        yaws
+    baseline_wall_times: dict
+        The wall times to compare with, keyed by golden file name, as
+        read by read_baseline_report. None does not compare wall times
+
+    Returns
+    -------
+    list
+        For every golden output, its config, whether it matched, the
+        differences found and the wall time of the run. Configs with a
+        baseline wall time also hold it and the difference to it
+
+    """
+    results = []
+    for name, entry in read_manifest(golden_dir).items():
+        config = entry['config']
+
+        output_dict, wall_time = generate_output(config, jobs)
+        differences = compare_outputs(
+            read_golden_output(golden_dir / name), output_dict, tolerance
+        )
+
+        result = {
+            'config': config,
+            'passed': not differences,
+            'differences': differences,
+            'wall_time': wall_time,
+        }
+
+        if baseline_wall_times is not None and name in baseline_wall_times:
+            result['baseline_wall_time'] = baseline_wall_times[name]
+            result['wall_time_delta'] = wall_time - baseline_wall_times[name]
+
+        results.append(result)
+
+    return results
+
+
+if __name__ == '__main__':
+
+    args = handle_arg_parsing()
+
+    if args.record:
+        configs = create_config_matrix(
+            args.headings,
+            args.resolutions,
+            args.motion_models,
+            args.turning_radius,
+            args.stopping_threshold,
+        )
+        record_golden_outputs(configs, args.golden_dir, args.jobs, args.note)
+
+        for config in configs:
+            print(f'recorded {get_golden_name(config)}')
+
+        sys.exit(0)
+
+    baseline_wall_times = None
+    if args.baseline_report is not None:
+        baseline_wall_times = read_baseline_report(args.baseline_report)
+
+    results = check_golden_outputs(
+        args.golden_dir, args.jobs, args.tolerance, baseline_wall_times
+    )
+
+    for result in results:
+        config = result['config']
+
+        timing = f"time={result['wall_time']:.2f}s"
+        if 'baseline_wall_time' in result:
+            timing += (
+                f" baseline={result['baseline_wall_time']:.2f}s "
+                f"delta={result['wall_time_delta']:+.2f}s "
+                f"({100 * result['wall_time_delta'] / result['baseline_wall_time']:+.1f}%)"
+            )
+
+        print(
+            f"{'PASS' if result['passed'] else 'FAIL'} "
+            f"{config['motion_model']:>9} headings={config['num_of_headings']:<3} "
+            f"resolution={config['grid_resolution']:<6} " + timing
+        )
+
+        for difference in result['differences'][:MAX_DIFFERENCES]:
+            print(f'    {difference}')
+
+        if len(result['differences']) > MAX_DIFFERENCES:
+            print(f"    ... {len(result['differences']) - MAX_DIFFERENCES} more")
+
+    if args.report is not None:
+        with open(args.report, 'w') as report_file:
+            json.dump(results, report_file, indent='\t')
+
+    if not all(result['passed'] for result in results):
+        sys.exit(1)
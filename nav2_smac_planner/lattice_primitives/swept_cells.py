@@ -0,0 +1,274 @@
+# Copyright (c) 2021, Matthew Booker
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License. Reserved.
+
+"""
+Cells swept by a robot footprint as it follows a primitive.
+
+Cells are offsets from the cell the primitive starts in. Cell (i, j)
+covers the square of one grid resolution centered on
+(i * grid_resolution, j * grid_resolution), so the start of every
+primitive lies at the center of cell (0, 0). A cell is swept if the
+footprint outline passes through it or its center lies inside the
+footprint at any pose along the primitive.
+
+The swept cells are stored as runs of consecutive cells along y. Each run
+is an [x, y, length] list covering cells (x, y) to (x, y + length - 1).
+"""
+
+import json
+
+import numpy as np
+
+
+def parse_footprint(footprint: str) -> np.array:
+    """
+    Parse a footprint polygon in the format of a nav2 footprint parameter.
+
+    Args:
+    ----
+    footprint: str
+        The points of the polygon in meters, e.g.
+        "[[0.5, 0.3], [0.5, -0.3], [-0.5, -0.3], [-0.5, 0.3]]"
+
+    Returns
+    -------
+    np.array(V, 2)
+        The x and y of each point of the polygon
+
+    """
+    try:
+        points = np.array(json.loads(footprint), dtype=np.float64)
+    except (ValueError, TypeError) as error:
+        raise ValueError(f'Could not parse footprint: {footprint}') from error
+
+    if points.ndim != 2 or points.shape[1] != 2 or len(points) < 3:
+        raise ValueError(
+            f'A footprint needs at least 3 points of x and y, got: {footprint}'
+        )
+
+    return points
+
+
+def _unique_cells(cells: np.array) -> np.array:
+    """
+    Return the unique cells sorted by x and then y.
+
+    The cells are marked in a dense grid over their bounding box, which is
+    considerably faster than np.unique along an axis.
+
+    Args:
+    ----
+    cells: np.array(N, 2)
+        The integer x and y of each cell
+
+    Returns
+    -------
+    np.array(M, 2)
+        The unique cells
+
+    """
+    if len(cells) == 0:
+        return cells.reshape(0, 2)
+
+    lower = cells.min(axis=0)
+    grid = np.zeros(cells.max(axis=0) - lower + 1, dtype=bool)
+    grid[cells[:, 0] - lower[0], cells[:, 1] - lower[1]] = True
+
+    return np.argwhere(grid) + lower
+
+
+def _sample_poses(
+    poses: np.array, footprint: np.array, grid_resolution: float
+) -> np.array:
+    """
+    Add poses between the poses of a primitive.
+
+    Poses are added until no point of the footprint moves by more than
+    half a cell between two consecutive poses, so that rotating a large
+    footprint does not skip over cells.
+
+    Args:
+    ----
+    poses: np.array(P, 3)
+        The x, y and yaw of the poses of the primitive
+    footprint: np.array(V, 2)
+        The points of the footprint polygon in meters
+    grid_resolution: float
+        The size of a cell in meters
+
+    Returns
+    -------
+    np.array(S, 3)
+        The poses of the primitive along with the added poses
+
+    """
+    if len(poses) < 2:
+        return poses
+
+    radius = np.linalg.norm(footprint, axis=1).max()
+
+    deltas = np.diff(poses, axis=0)
+    yaw_deltas = np.mod(deltas[:, 2] + np.pi, 2 * np.pi) - np.pi
+
+    # The movement of any point of the footprint is at most the movement
+    # of its center plus the arc length swept at the largest radius
+    movement = np.hypot(deltas[:, 0], deltas[:, 1]) + np.abs(yaw_deltas) * radius
+    steps = np.maximum(np.ceil(movement / (0.5 * grid_resolution)), 1).astype(int)
+
+    segment_idx = np.repeat(np.arange(len(steps)), steps)
+    fractions = (
+        np.arange(steps.sum()) - np.repeat(np.cumsum(steps) - steps, steps)
+    ) / np.repeat(steps, steps)
+
+    sampled = np.empty((len(segment_idx) + 1, 3))
+    sampled[:-1, :2] = (
+        poses[segment_idx, :2] + fractions[:, np.newaxis] * deltas[segment_idx, :2]
+    )
+    sampled[:-1, 2] = poses[segment_idx, 2] + fractions * yaw_deltas[segment_idx]
+    sampled[-1] = poses[-1]
+
+    return sampled
+
+
+def get_swept_cells(
+    poses: np.array, footprint: np.array, grid_resolution: float
+) -> np.array:
+    """
+    Find the cells swept by a footprint following the poses of a primitive.
+
+    Args:
+    ----
+    poses: np.array(P, 3)
+        The x, y and yaw of the poses of the primitive
+    footprint: np.array(V, 2)
+        The points of the footprint polygon in meters
+    grid_resolution: float
+        The size of a cell in meters
+
+    Returns
+    -------
+    np.array(N, 2)
+        The x and y offsets of the swept cells, sorted by x and then y
+
+    """
+    poses = _sample_poses(np.asarray(poses, dtype=np.float64), footprint, grid_resolution)
+
+    cos_yaws = np.cos(poses[:, 2])[:, np.newaxis]
+    sin_yaws = np.sin(poses[:, 2])[:, np.newaxis]
+
+    # The points of the footprint at every pose in cells (S, V)
+    xs = (poses[:, 0:1] + cos_yaws * footprint[:, 0] - sin_yaws * footprint[:, 1]) / (
+        grid_resolution
+    )
+    ys = (poses[:, 1:2] + sin_yaws * footprint[:, 0] + cos_yaws * footprint[:, 1]) / (
+        grid_resolution
+    )
+
+    # Cells along the outline, sampled at most half a cell apart
+    edge_xs = np.roll(xs, -1, axis=1) - xs
+    edge_ys = np.roll(ys, -1, axis=1) - ys
+    num_of_samples = int(np.ceil(2 * max(np.abs(edge_xs).max(), np.abs(edge_ys).max())))
+    fractions = np.linspace(0, 1, num_of_samples + 1)
+
+    outline_xs = np.round(xs[..., np.newaxis] + fractions * edge_xs[..., np.newaxis])
+    outline_ys = np.round(ys[..., np.newaxis] + fractions * edge_ys[..., np.newaxis])
+
+    # Cells with their center inside the footprint, found with an even-odd
+    # test of every cell in a square around each pose
+    half_width = int(np.ceil(np.linalg.norm(footprint, axis=1).max() / grid_resolution))
+    window = np.arange(-half_width, half_width + 1)
+    window_xs, window_ys = np.meshgrid(window, window, indexing='ij')
+
+    center_xs = np.round(poses[:, 0:1] / grid_resolution) + window_xs.ravel()
+    center_ys = np.round(poses[:, 1:2] / grid_resolution) + window_ys.ravel()
+
+    # Shapes are (S, K, V) for the K cells in the window and V edges
+    px = center_xs[..., np.newaxis]
+    py = center_ys[..., np.newaxis]
+    x1 = xs[:, np.newaxis, :]
+    y1 = ys[:, np.newaxis, :]
+    x2 = np.roll(xs, -1, axis=1)[:, np.newaxis, :]
+    y2 = np.roll(ys, -1, axis=1)[:, np.newaxis, :]
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        crosses = ((y1 > py) != (y2 > py)) & (
+            px < x1 + (py - y1) * (x2 - x1) / (y2 - y1)
+        )
+
+    inside = np.count_nonzero(crosses, axis=2) % 2 == 1
+
+    cells = np.concatenate(
+        (
+            np.column_stack((outline_xs.ravel(), outline_ys.ravel())),
+            np.column_stack((center_xs[inside], center_ys[inside])),
+        )
+    ).astype(np.int64)
+
+    return _unique_cells(cells)
+
+
+def encode_runs(cells: np.array) -> list:
+    """
+    Compress cells into runs of consecutive cells along y.
+
+    Args:
+    ----
+    cells: np.array(N, 2)
+        The x and y of each cell
+
+    Returns
+    -------
+    list
+        The [x, y, length] of each run, sorted by x and then y
+
+    """
+    cells = _unique_cells(np.asarray(cells, dtype=np.int64).reshape(-1, 2))
+
+    if len(cells) == 0:
+        return []
+
+    # A run starts wherever a cell does not directly follow the previous one
+    starts = np.ones(len(cells), dtype=bool)
+    starts[1:] = (cells[1:, 0] != cells[:-1, 0]) | (cells[1:, 1] != cells[:-1, 1] + 1)
+
+    start_idx = np.flatnonzero(starts)
+    lengths = np.diff(np.append(start_idx, len(cells)))
+
+    return np.column_stack((cells[start_idx], lengths)).tolist()
+
+
+def decode_runs(runs: list) -> np.array:
+    """
+    Expand runs of cells back into the cells they cover.
+
+    Args:
+    ----
+    runs: list
+        The [x, y, length] of each run
+
+    Returns
+    -------
+    np.array(N, 2)
+        The x and y of each cell
+
+    """
+    runs = np.asarray(runs, dtype=np.int64).reshape(-1, 3)
+    lengths = runs[:, 2]
+
+    xs = np.repeat(runs[:, 0], lengths)
+    ys = np.repeat(runs[:, 1], lengths) + (
+        np.arange(lengths.sum()) - np.repeat(np.cumsum(lengths) - lengths, lengths)
+    )
+
+    return np.column_stack((xs, ys))
@@ -0,0 +1,83 @@
+# Copyright (c) 2021, Matthew Booker
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License. Reserved.
+
+from pathlib import Path
+import pstats
+import tempfile
+import unittest
+
+from benchmark import benchmark_config, create_config_matrix, run_benchmark
+
+CONFIG = {
+    'motion_model': 'ackermann',
+    'turning_radius': 0.5,
+    'grid_resolution': 0.1,
+    'stopping_threshold': 2,
+    'num_of_headings': 16,
+}
+
+
+class TestBenchmark(unittest.TestCase):
+    """Contains the unit tests for the benchmark harness."""
+
+    def test_config_matrix_covers_every_combination(self):
+        configs = create_config_matrix([16, 32], [0.1, 0.05], ['diff', 'omni'], 0.5, 5)
+
+        self.assertEqual(len(configs), 8)
+        self.assertEqual(
+            {
+                (c['num_of_headings'], c['grid_resolution'], c['motion_model'])
+                for c in configs
+            },
+            {
+                (headings, resolution, motion_model)
+                for headings in [16, 32]
+                for resolution in [0.1, 0.05]
+                for motion_model in ['diff', 'omni']
+            },
+        )
+
+    def test_run_benchmark_records_statistics(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            profile_path = Path(temp_dir) / 'profile.prof'
+            result = run_benchmark(CONFIG, profiler='cprofile', profile_path=profile_path)
+
+            # The profile can be loaded for inspection
+            pstats.Stats(str(profile_path))
+
+        self.assertGreater(result['wall_time'], 0)
+        self.assertGreater(result['peak_rss_mb'], 0)
+        self.assertGreater(result['kept_trajectories'], 0)
+        self.assertGreaterEqual(
+            result['candidate_trajectories'], result['kept_trajectories']
+        )
+        self.assertGreater(result['rtree_queries'], 0)
+
+    def test_benchmark_config_matches_in_process_run(self):
+        # Test that the counts measured in a separate process match
+        result = benchmark_config(CONFIG)
+        in_process_result = run_benchmark(CONFIG)
+
+        for key in [
+            'candidate_trajectories',
+            'kept_trajectories',
+            'rtree_queries',
+            'rtree_candidates',
+            'number_of_trajectories',
+        ]:
+            self.assertEqual(result[key], in_process_result[key])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,139 @@
+# Copyright (c) 2021, Matthew Booker
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License. Reserved.
+
+import unittest
+
+from generate_motion_primitives import create_heading_angle_list, create_output_dict
+from heading_table import create_heading_table, get_square_headings, HeadingTable
+from lattice_generator import LatticeGenerator
+import numpy as np
+
+CONFIG = {
+    'motion_model': 'ackermann',
+    'turning_radius': 0.5,
+    'grid_resolution': 0.1,
+    'stopping_threshold': 3,
+    'num_of_headings': 16,
+}
+
+
+class TestHeadingTable(unittest.TestCase):
+    """Contains the unit tests for the heading table."""
+
+    def test_square_flips_match_index_arithmetic(self):
+        # The square headings were previously flipped by offsetting their
+        # index in the sorted list of headings
+        index_flips = {
+            HeadingTable.Flip.X: lambda idx, n: n / 2 - 2 - idx,
+            HeadingTable.Flip.Y: lambda idx, n: n - idx - 2,
+            HeadingTable.Flip.BOTH: lambda idx, n: (idx - n / 2) % n,
+            HeadingTable.Flip.DIAGONAL: lambda idx, n: (5 * n / 4 - 2 - idx) % n,
+        }
+
+        for num_of_headings in [8, 16, 24, 32]:
+            headings = get_square_headings(num_of_headings)
+            heading_table = HeadingTable(headings)
+
+            self.assertTrue(heading_table.is_symmetric())
+            self.assertEqual(heading_table.get_off_grid_headings(num_of_headings), [])
+
+            for idx, heading in enumerate(headings):
+                self.assertEqual(heading_table.index[heading], idx)
+
+                for flip_type, index_flip in index_flips.items():
+                    self.assertEqual(
+                        heading_table.flip(heading, flip_type),
+                        headings[int(index_flip(idx, num_of_headings))],
+                    )
+
+                self.assertEqual(
+                    heading_table.rotate(heading, 1),
+                    headings[(idx + num_of_headings // 4) % num_of_headings],
+                )
+                self.assertEqual(heading_table.step(heading, -1), headings[idx - 1])
+
+    def test_output_index_follows_output_order(self):
+        heading_table = create_heading_table(CONFIG)
+        heading_angle_list = create_heading_angle_list(heading_table.headings)
+
+        self.assertEqual(heading_table.output_headings, heading_angle_list)
+        self.assertEqual(heading_angle_list[0], 0.0)
+
+        for idx, heading in enumerate(heading_angle_list):
+            self.assertEqual(heading_table.output_index[heading], idx)
+
+    def test_rounded_custom_headings_match_square(self):
+        # Custom headings written with limited precision are snapped onto
+        # the grid directions and give the same lattice as the square ones
+        custom_config = dict(
+            CONFIG,
+            heading_scheme='custom',
+            headings=[round(heading, 7) for heading in get_square_headings(16)],
+        )
+
+        square_output = create_output_dict(LatticeGenerator(CONFIG).run(), CONFIG)
+        custom_output = create_output_dict(
+            LatticeGenerator(custom_config).run(), custom_config
+        )
+
+        self.assertEqual(square_output['primitives'], custom_output['primitives'])
+        self.assertEqual(
+            square_output['lattice_metadata']['heading_angles'],
+            custom_output['lattice_metadata']['heading_angles'],
+        )
+
+    def test_rejects_invalid_headings(self):
+        # Missing the reflection of atan(1/2) across the diagonal
+        asymmetric_headings = [
+            np.arctan2(j, i)
+            for i, j in [(1, 0), (2, 1), (0, 1), (-2, 1), (-1, 0), (-2, -1), (0, -1), (2, -1)]
+        ]
+
+        with self.assertRaisesRegex(ValueError, 'symmetric'):
+            LatticeGenerator(
+                dict(
+                    CONFIG,
+                    num_of_headings=8,
+                    heading_scheme='custom',
+                    headings=asymmetric_headings,
+                )
+            )
+
+        # Evenly spaced headings between the multiples of 45 degrees do not
+        # point at a grid point, so the search along them would not end
+        uniform_headings = 2 * np.pi * np.arange(16) / 16
+        uniform_table = create_heading_table(
+            dict(CONFIG, heading_scheme='custom', headings=uniform_headings)
+        )
+
+        self.assertTrue(uniform_table.is_symmetric())
+        self.assertEqual(len(uniform_table.get_off_grid_headings(16)), 8)
+
+        with self.assertRaisesRegex(ValueError, 'grid point'):
+            LatticeGenerator(
+                dict(CONFIG, heading_scheme='custom', headings=uniform_headings)
+            )
+
+        with self.assertRaises(ValueError):
+            create_heading_table(dict(CONFIG, heading_scheme='custom', headings=[0.0]))
+
+        with self.assertRaises(ValueError):
+            create_heading_table(dict(CONFIG, heading_scheme='uniform'))
+
+        with self.assertRaises(ValueError):
+            create_heading_table(dict(CONFIG, heading_scheme='spiral'))
+
+
+if __name__ == '__main__':
+    unittest.main()
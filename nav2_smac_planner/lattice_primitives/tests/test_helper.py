@@ -0,0 +1,95 @@
+# Copyright (c) 2021, Matthew Booker
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License. Reserved.
+
+import unittest
+
+from helper import angle_difference, interpolate_yaws, normalize_angle
+import numpy as np
+
+ANGLES = np.linspace(-np.pi, np.pi, 17)
+
+
+class TestHelper(unittest.TestCase):
+    """Contains the unit tests for the angle helpers."""
+
+    def test_normalize_angle(self):
+        self.assertAlmostEqual(normalize_angle(-np.pi / 2), 3 * np.pi / 2)
+        self.assertAlmostEqual(normalize_angle(5 * np.pi / 2), np.pi / 2)
+        self.assertEqual(normalize_angle(0.0), 0.0)
+
+        normalized = normalize_angle(ANGLES)
+
+        self.assertTrue(np.all((normalized >= 0) & (normalized < 2 * np.pi)))
+        np.testing.assert_allclose(np.cos(normalized), np.cos(ANGLES), atol=1e-12)
+        np.testing.assert_allclose(np.sin(normalized), np.sin(ANGLES), atol=1e-12)
+
+    def test_angle_difference(self):
+        self.assertAlmostEqual(angle_difference(0.1, -0.1), 0.2)
+        self.assertAlmostEqual(angle_difference(3, -3), 2 * np.pi - 6)
+        self.assertAlmostEqual(angle_difference(0, np.pi / 2, True), np.pi / 2)
+        self.assertAlmostEqual(angle_difference(0, np.pi / 2, False), 3 * np.pi / 2)
+        self.assertIsInstance(angle_difference(0.1, 0.2), float)
+
+    def test_angle_difference_matches_element_wise(self):
+        # Test that broadcasting arrays gives the same result as scalars
+        angles_1 = ANGLES[:, np.newaxis]
+        angles_2 = ANGLES[np.newaxis, :]
+
+        for left_turn in [None, True, False]:
+            differences = angle_difference(angles_1, angles_2, left_turn)
+
+            self.assertEqual(differences.shape, (len(ANGLES), len(ANGLES)))
+
+            for i, angle_1 in enumerate(ANGLES):
+                for j, angle_2 in enumerate(ANGLES):
+                    self.assertEqual(
+                        differences[i, j], angle_difference(angle_1, angle_2, left_turn)
+                    )
+
+        left_turns = np.arange(len(ANGLES)) % 2 == 0
+        differences = angle_difference(ANGLES, ANGLES[::-1], left_turns)
+
+        for i, left_turn in enumerate(left_turns):
+            self.assertEqual(
+                differences[i], angle_difference(ANGLES[i], ANGLES[::-1][i], left_turn)
+            )
+
+    def test_interpolate_yaws(self):
+        # Left turn across 0
+        yaws = interpolate_yaws(-np.pi / 4, np.pi / 4, True, 3)
+        np.testing.assert_allclose(yaws, [7 * np.pi / 4, 0, np.pi / 4], atol=1e-12)
+
+        # Right turn across 0
+        yaws = interpolate_yaws(np.pi / 4, -np.pi / 4, False, 3)
+        np.testing.assert_allclose(yaws, [np.pi / 4, 0, 7 * np.pi / 4], atol=1e-12)
+
+    def test_interpolate_yaws_matches_element_wise(self):
+        # Test that interpolating arrays of angles matches each pair
+        start_angles = ANGLES
+        end_angles = np.roll(ANGLES, 3)
+        left_turns = np.arange(len(ANGLES)) % 2 == 0
+
+        yaws = interpolate_yaws(start_angles, end_angles, left_turns, 5)
+
+        self.assertEqual(yaws.shape, (len(ANGLES), 5))
+
+        for i in range(len(ANGLES)):
+            np.testing.assert_array_equal(
+                yaws[i],
+                interpolate_yaws(start_angles[i], end_angles[i], left_turns[i], 5),
+            )
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,115 @@
+# Copyright (c) 2021, Matthew Booker
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License. Reserved.
+
+import unittest
+
+from generate_motion_primitives import create_output_dict
+from lattice_analyzer import (
+    analyze,
+    compute_reachability,
+    get_branching_factors,
+    get_primitive_offsets,
+    get_reachable_cells,
+)
+from lattice_generator import LatticeGenerator
+
+CONFIG = {
+    'motion_model': 'diff',
+    'turning_radius': 0.5,
+    'grid_resolution': 0.1,
+    'stopping_threshold': 3,
+    'num_of_headings': 16,
+}
+
+
+class TestLatticeAnalyzer(unittest.TestCase):
+    """Contains the unit tests for the lattice analyzer."""
+
+    @classmethod
+    def setUpClass(cls) -> None:
+        minimal_set_trajectories = LatticeGenerator(CONFIG).run()
+        cls.output = create_output_dict(minimal_set_trajectories, CONFIG)
+
+    def test_branching_factor_covers_every_primitive(self):
+        branching_factors = get_branching_factors(self.output)
+
+        self.assertEqual(len(branching_factors), CONFIG['num_of_headings'])
+        self.assertEqual(branching_factors.sum(), len(self.output['primitives']))
+        self.assertTrue((branching_factors > 0).all())
+
+    def test_reachability_matches_simple_search(self):
+        # Test the vectorized search against a breadth first search over
+        # python sets
+        start_angle_indices, offsets, end_angle_indices = get_primitive_offsets(
+            self.output
+        )
+        window = 15
+        expansions = 4
+
+        visited = {(0, 0, 0)}
+        frontier = set(visited)
+        expected = [len(visited)]
+
+        for _ in range(expansions):
+            new_cells = set()
+
+            for x, y, heading in frontier:
+                for idx in range(len(start_angle_indices)):
+                    if start_angle_indices[idx] != heading:
+                        continue
+
+                    cell = (
+                        x + offsets[idx, 0],
+                        y + offsets[idx, 1],
+                        end_angle_indices[idx],
+                    )
+
+                    if max(abs(cell[0]), abs(cell[1])) <= window:
+                        new_cells.add(cell)
+
+            frontier = new_cells - visited
+            visited |= frontier
+            expected.append(len(visited))
+
+        reachable = compute_reachability(self.output, expansions, window)
+        cells = get_reachable_cells(self.output, expansions, window)
+
+        self.assertEqual(reachable.tolist(), expected)
+        self.assertEqual({tuple(cell) for cell in cells.tolist()}, visited)
+
+    def test_reachability_of_straight_lattice(self):
+        output = {
+            'lattice_metadata': {'grid_resolution': 0.1, 'heading_angles': [0.0]},
+            'primitives': [
+                {
+                    'start_angle_index': 0,
+                    'end_angle_index': 0,
+                    'trajectory_length': 0.2,
+                    'poses': [[0.1, 0.0, 0.0], [0.2, 0.0, 0.0]],
+                }
+            ],
+        }
+
+        self.assertEqual(compute_reachability(output, 3).tolist(), [1, 2, 3, 4])
+
+        report = analyze(output, expansions=3, window=2)
+
+        # Only the cells at x = 0 and x = 2 lie in the window
+        self.assertEqual(report['reachable_cells'], [1, 2, 2, 2])
+        self.assertAlmostEqual(report['coverage'], 2 / 25)
+        self.assertAlmostEqual(report['trajectory_length']['total'], 0.2)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,166 @@
+# Copyright (c) 2021, Matthew Booker
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License. Reserved.
+
+import json
+from pathlib import Path
+import tempfile
+import unittest
+
+from generate_motion_primitives import create_output_dict
+from lattice_binary import binary_to_json, json_to_binary, read_binary, write_binary
+from lattice_generator import LatticeGenerator
+import numpy as np
+from swept_cells import parse_footprint
+
+CONFIG = {
+    'motion_model': 'ackermann',
+    'turning_radius': 0.5,
+    'grid_resolution': 0.05,
+    'stopping_threshold': 5,
+    'num_of_headings': 16,
+}
+
+
+class TestLatticeBinary(unittest.TestCase):
+    """Contains the unit tests for the binary lattice format."""
+
+    @classmethod
+    def setUpClass(cls) -> None:
+        minimal_set_trajectories = LatticeGenerator(CONFIG).run()
+        cls.output_dict = create_output_dict(minimal_set_trajectories, CONFIG)
+
+    def setUp(self) -> None:
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.output_dir = Path(self.temp_dir.name)
+
+    def tearDown(self) -> None:
+        self.temp_dir.cleanup()
+
+    def test_binary_matches_output_dict(self):
+        # Test that every primitive can be read back from the binary file
+        binary_path = self.output_dir / 'output.bin'
+        write_binary(binary_path, self.output_dict)
+
+        lattice = read_binary(binary_path)
+
+        self.assertEqual(len(lattice), len(self.output_dict['primitives']))
+        self.assertEqual(
+            lattice.metadata['lattice_metadata'], self.output_dict['lattice_metadata']
+        )
+
+        for idx, primitive in enumerate(self.output_dict['primitives']):
+            row = lattice.primitives[idx]
+
+            self.assertEqual(row['trajectory_id'], primitive['trajectory_id'])
+            self.assertEqual(row['start_angle_index'], primitive['start_angle_index'])
+            self.assertEqual(row['end_angle_index'], primitive['end_angle_index'])
+            self.assertEqual(bool(row['left_turn']), primitive['left_turn'])
+            self.assertAlmostEqual(
+                row['trajectory_length'], primitive['trajectory_length'], places=5
+            )
+            np.testing.assert_allclose(
+                lattice.get_poses(idx), primitive['poses'], atol=1e-5
+            )
+
+    def test_json_round_trip(self):
+        # Test that converting to binary and back preserves the lattice
+        json_path = self.output_dir / 'output.json'
+        binary_path = self.output_dir / 'output.bin'
+        round_trip_path = self.output_dir / 'round_trip.json'
+
+        with open(json_path, 'w') as json_file:
+            json.dump(self.output_dict, json_file, indent='\t')
+
+        json_to_binary(json_path, binary_path)
+        binary_to_json(binary_path, round_trip_path)
+
+        with open(round_trip_path) as json_file:
+            round_trip = json.load(json_file)
+
+        self.assertEqual(round_trip['version'], self.output_dict['version'])
+        self.assertEqual(
+            round_trip['lattice_metadata'], self.output_dict['lattice_metadata']
+        )
+
+        for original, converted in zip(
+            self.output_dict['primitives'], round_trip['primitives']
+        ):
+            # Positions are stored exactly to the precision of the JSON file
+            poses = np.array(original['poses']).reshape(-1, 3)
+            converted_poses = np.array(converted['poses']).reshape(-1, 3)
+
+            np.testing.assert_array_equal(converted_poses[:, :2], poses[:, :2])
+            np.testing.assert_allclose(converted_poses[:, 2], poses[:, 2], atol=1e-6)
+
+            self.assertEqual(converted['trajectory_length'], original['trajectory_length'])
+
+    def test_swept_cells_round_trip(self):
+        # Test that the swept cells of a footprint are kept in the binary file
+        footprint = parse_footprint('[[0.1, 0.05], [0.1, -0.05], [-0.1, -0.05], [-0.1, 0.05]]')
+        output_dict = create_output_dict(
+            LatticeGenerator(CONFIG).run(), CONFIG, footprint
+        )
+        binary_path = self.output_dir / 'output.bin'
+        write_binary(binary_path, output_dict)
+
+        lattice = read_binary(binary_path)
+        round_trip = lattice.to_dict()
+
+        self.assertTrue(lattice.has_swept_cells)
+        self.assertEqual(
+            round_trip['lattice_metadata']['footprint'], footprint.tolist()
+        )
+
+        for original, converted in zip(output_dict['primitives'], round_trip['primitives']):
+            self.assertEqual(converted['swept_cells'], original['swept_cells'])
+
+        # Files without a footprint do not gain swept cells
+        write_binary(binary_path, self.output_dict)
+
+        self.assertNotIn('swept_cells', read_binary(binary_path).to_dict()['primitives'][0])
+
+        # Swept cells can not be stored for only some of the primitives
+        output_dict['primitives'][0] = dict(output_dict['primitives'][0])
+        del output_dict['primitives'][0]['swept_cells']
+
+        with self.assertRaises(ValueError):
+            write_binary(binary_path, output_dict)
+
+    def test_rejects_unsupported_fields(self):
+        # Test that fields the binary format does not store are not dropped
+        json_path = self.output_dir / 'output.json'
+        output_dict = dict(self.output_dict)
+        output_dict['primitives'] = [
+            dict(primitive, extra_field=1) for primitive in self.output_dict['primitives']
+        ]
+
+        with open(json_path, 'w') as json_file:
+            json.dump(output_dict, json_file)
+
+        with self.assertRaisesRegex(ValueError, 'extra_field'):
+            json_to_binary(json_path, self.output_dir / 'output.bin')
+
+    def test_rejects_other_files(self):
+        # Test that a file without the binary header is rejected
+        json_path = self.output_dir / 'output.json'
+
+        with open(json_path, 'w') as json_file:
+            json.dump(self.output_dict, json_file)
+
+        with self.assertRaises(ValueError):
+            read_binary(json_path)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -12,8 +12,12 @@
 # See the License for the specific language governing permissions and
 # limitations under the License. Reserved.
 
+import json
+from pathlib import Path
+import tempfile
 import unittest
 
+from generate_motion_primitives import write_to_json, write_to_json_stream
 from lattice_generator import LatticeGenerator
 import numpy as np
 
@@ -36,9 +40,11 @@ class TestLatticeGenerator(unittest.TestCase):
             'num_of_headings': NUM_OF_HEADINGS,
         }
 
-        lattice_gen = LatticeGenerator(config)
+        self.config = config
 
-        self.minimal_set = lattice_gen.run()
+        self.lattice_gen = LatticeGenerator(config)
+
+        self.minimal_set = self.lattice_gen.run()
 
     def test_minimal_set_lengths_are_positive(self):
         # Test that lengths are all positive
@@ -87,6 +93,324 @@ class TestLatticeGenerator(unittest.TestCase):
                     self.assertGreaterEqual(angle, 0)
                     self.assertLessEqual(angle, 2 * np.pi)
 
+    def test_parallel_search_matches_serial(self):
+        # Test that searching headings in parallel gives the same set
+
+        parallel_set = LatticeGenerator(self.config).run(jobs=2)
+
+        self.assertEqual(list(self.minimal_set.keys()), list(parallel_set.keys()))
+
+        for start_angle in self.minimal_set.keys():
+            serial_trajectories = self.minimal_set[start_angle]
+            parallel_trajectories = parallel_set[start_angle]
+
+            self.assertEqual(len(serial_trajectories), len(parallel_trajectories))
+
+            for serial, parallel in zip(serial_trajectories, parallel_trajectories):
+                np.testing.assert_array_equal(serial.path.xs, parallel.path.xs)
+                np.testing.assert_array_equal(serial.path.ys, parallel.path.ys)
+                np.testing.assert_array_equal(serial.path.yaws, parallel.path.yaws)
+
+    def test_batched_segment_distance_matches_single(self):
+        # Test that the batched distance agrees with the single segment distance
+
+        rng = np.random.default_rng(0)
+        p1s = rng.uniform(-1, 1, (20, 2))
+        p2s = rng.uniform(-1, 1, (20, 2))
+        qs = rng.uniform(-1, 1, (7, 2))
+
+        # Include a segment of zero length
+        p2s[0] = p1s[0]
+
+        distances = self.lattice_gen._points_to_segments_distance(p1s, p2s, qs)
+
+        for i, (p1, p2) in enumerate(zip(p1s, p2s)):
+            for j, q in enumerate(qs):
+                self.assertAlmostEqual(
+                    distances[i, j],
+                    self.lattice_gen._point_to_line_distance(p1, p2, q),
+                    delta=0.00001,
+                )
+
+    def test_screen_agrees_with_sampled_path(self):
+        # Test that screening from parameters never contradicts the check
+        # against the sampled path
+
+        prior_end_poses = self.lattice_gen._create_end_pose_index(
+            [((0.3, 0.0), 0.0), ((0.4, 0.2), np.pi / 4)]
+        )
+
+        end_poses = self.lattice_gen._query_prior_end_poses(
+            (-10, -10, 10, 10), (-np.pi, np.pi), prior_end_poses
+        )
+        primitive_resolution = 0.1 * GRID_RESOLUTION
+        decided = 0
+
+        for target_point in self.lattice_gen._get_wave_front_points(16):
+            for target_heading in self.lattice_gen.headings:
+                params = self.lattice_gen.trajectory_generator.generate_trajectory_parameters(
+                    target_point, 0.0, target_heading
+                )
+
+                if params is None:
+                    continue
+
+                trajectory = (
+                    self.lattice_gen.trajectory_generator.generate_trajectory_from_parameters(
+                        params, primitive_resolution
+                    )
+                )
+                sample_spacing = params.total_length / (len(trajectory.path.xs))
+
+                screened = self.lattice_gen._screen_trajectory(
+                    params, end_poses, sample_spacing
+                )
+
+                if screened is not None:
+                    decided += 1
+                    self.assertEqual(
+                        screened,
+                        self.lattice_gen._is_minimal_trajectory(
+                            trajectory, prior_end_poses
+                        ),
+                    )
+
+        self.assertGreater(decided, 0)
+
+    def test_query_returns_only_angle_compatible_poses(self):
+        end_poses = [((0.3, 0.0), 0.0), ((0.3, 0.0), np.pi / 2), ((0.3, 0.0), np.pi)]
+        prior_end_poses = self.lattice_gen._create_end_pose_index(end_poses)
+
+        candidates = self.lattice_gen._query_prior_end_poses(
+            (-1, -1, 1, 1), (0.0, np.pi / 4), prior_end_poses
+        )
+        self.assertEqual(sorted(candidates[:, 2]), [0.0])
+
+        # Ranges that wrap past pi also match the poses on the other side
+        candidates = self.lattice_gen._query_prior_end_poses(
+            (-1, -1, 1, 1), (3 * np.pi / 4, 5 * np.pi / 4), prior_end_poses
+        )
+        self.assertEqual(sorted(candidates[:, 2]), [np.pi])
+
+        candidates = self.lattice_gen._query_prior_end_poses(
+            (-1, -1, 1, 1), (-2 * np.pi, 0.0), prior_end_poses
+        )
+        self.assertEqual(len(candidates), 3)
+
+        # Poses outside the region are never returned
+        self.assertIsNone(
+            self.lattice_gen._query_prior_end_poses(
+                (1, 1, 2, 2), (-np.pi, np.pi), prior_end_poses
+            )
+        )
+
+    def test_resume_matches_fresh_run(self):
+        # Test that resuming from an output with a lower stopping threshold
+        # and a different motion model gives the same set as a fresh run
+
+        prior_config = dict(self.config, stopping_threshold=3, motion_model='omni')
+        prior_set = LatticeGenerator(prior_config).run()
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            output_path = Path(temp_dir) / 'output.json'
+            write_to_json(output_path, prior_set, prior_config)
+
+            with open(output_path) as output_file:
+                prior_output = json.load(output_file)
+
+        resumed_set = LatticeGenerator(self.config).run(resume_from=prior_output)
+
+        self.assertEqual(list(self.minimal_set.keys()), list(resumed_set.keys()))
+
+        for start_angle in self.minimal_set.keys():
+            fresh_trajectories = self.minimal_set[start_angle]
+            resumed_trajectories = resumed_set[start_angle]
+
+            self.assertEqual(len(fresh_trajectories), len(resumed_trajectories))
+
+            for fresh, resumed in zip(
+                sorted(fresh_trajectories, key=lambda x: x.parameters.end_angle),
+                sorted(resumed_trajectories, key=lambda x: x.parameters.end_angle),
+            ):
+                np.testing.assert_array_equal(fresh.path.xs, resumed.path.xs)
+                np.testing.assert_array_equal(fresh.path.ys, resumed.path.ys)
+
+    def test_resume_rejects_different_lattice(self):
+        # Test that resuming from an output of a different lattice fails
+
+        output = {
+            'lattice_metadata': dict(self.config, turning_radius=1.0),
+            'primitives': [],
+        }
+
+        with self.assertRaises(ValueError):
+            self.lattice_gen.run(resume_from=output)
+
+    def test_diagonal_flip_is_a_reflection(self):
+        # Test that flipping across y = x maps a heading to pi/2 - heading
+        for heading in self.lattice_gen.headings:
+            flipped = self.lattice_gen._flip_angle(
+                heading, LatticeGenerator.Flip.DIAGONAL
+            )
+
+            self.assertAlmostEqual(np.cos(flipped), np.sin(heading))
+            self.assertAlmostEqual(np.sin(flipped), np.cos(heading))
+            self.assertEqual(
+                self.lattice_gen._flip_angle(flipped, LatticeGenerator.Flip.DIAGONAL),
+                heading,
+            )
+
+    def test_reflected_minimal_set_matches_search(self):
+        # Test that reflecting the minimal set of a heading below 45 degrees
+        # gives the same set, in the same order, as searching its reflection
+
+        for num_of_headings in [16, 24]:
+            lattice_gen = LatticeGenerator(
+                dict(self.config, num_of_headings=num_of_headings)
+            )
+
+            for start_heading in lattice_gen._get_initial_headings():
+                reflected_heading = lattice_gen._get_reflection_source(start_heading)
+
+                if reflected_heading is None:
+                    continue
+
+                reflected_set = lattice_gen._reflect_minimal_set_for_heading(
+                    start_heading,
+                    lattice_gen._generate_minimal_set_for_heading(reflected_heading),
+                )
+                searched_set = lattice_gen._generate_minimal_set_for_heading(
+                    start_heading
+                )
+
+                self.assertEqual(len(reflected_set), len(searched_set))
+
+                for (reflected_point, reflected_angle), (
+                    searched_point,
+                    searched_angle,
+                ) in zip(reflected_set, searched_set):
+                    np.testing.assert_allclose(reflected_point, searched_point)
+                    self.assertEqual(reflected_angle, searched_angle)
+
+    def test_reflection_source_needs_reflected_targets(self):
+        # Test that a start heading is only reflected when the target
+        # headings of its search are the reflections of those of its source
+        lattice_gen = LatticeGenerator(dict(self.config, num_of_headings=32))
+
+        reflected_count = 0
+        for start_heading in lattice_gen._get_initial_headings():
+            reflected_heading = lattice_gen._get_reflection_source(start_heading)
+
+            if start_heading <= np.pi / 4:
+                self.assertIsNone(reflected_heading)
+                continue
+
+            target_headings = set(lattice_gen._get_target_headings(start_heading))
+            reflected_target_headings = {
+                lattice_gen._flip_angle(heading, LatticeGenerator.Flip.DIAGONAL)
+                for heading in lattice_gen._get_target_headings(
+                    lattice_gen._flip_angle(
+                        start_heading, LatticeGenerator.Flip.DIAGONAL
+                    )
+                )
+            }
+
+            self.assertEqual(
+                reflected_heading is not None,
+                target_headings == reflected_target_headings,
+            )
+            reflected_count += reflected_heading is not None
+
+        # Most of the start headings above 45 degrees are still reflected,
+        # but with 32 headings the one at 75.96 degrees is searched
+        upper_headings = [
+            start_heading
+            for start_heading in lattice_gen._get_initial_headings()
+            if start_heading > np.pi / 4
+        ]
+        self.assertEqual(reflected_count, len(upper_headings) - 1)
+
+    def test_streaming_output_matches_json(self):
+        # Test that streaming the output gives the same file as writing
+        # the complete set, for every motion model
+
+        for motion_model in ['ackermann', 'diff', 'omni']:
+            config = dict(self.config, motion_model=motion_model)
+
+            with tempfile.TemporaryDirectory() as temp_dir:
+                json_path = Path(temp_dir) / 'output.json'
+                stream_path = Path(temp_dir) / 'stream.json'
+
+                write_to_json(json_path, LatticeGenerator(config).run(), config)
+
+                lattice_gen = LatticeGenerator(config)
+                write_to_json_stream(
+                    stream_path,
+                    lattice_gen.run_streaming(),
+                    config,
+                    lattice_gen.headings,
+                )
+
+                self.assertEqual(json_path.read_text(), stream_path.read_text())
+
+    def test_run_heading_matches_run(self):
+        # Test that generating single start angles gives the same
+        # trajectories as generating the whole lattice
+
+        for motion_model in ['ackermann', 'diff', 'omni']:
+            config = dict(self.config, motion_model=motion_model)
+            minimal_set = LatticeGenerator(config).run()
+            lattice_gen = LatticeGenerator(config)
+
+            for start_angle in lattice_gen.headings:
+                trajectories = lattice_gen.run_heading(start_angle)
+
+                self.assertEqual(len(trajectories), len(minimal_set[start_angle]))
+
+                for trajectory, expected in zip(trajectories, minimal_set[start_angle]):
+                    self.assertEqual(
+                        trajectory.path.to_output_format(),
+                        expected.path.to_output_format(),
+                    )
+                    self.assertEqual(
+                        trajectory.parameters.end_angle, expected.parameters.end_angle
+                    )
+
+    def test_run_heading_only_searches_needed_headings(self):
+        lattice_gen = LatticeGenerator(self.config)
+
+        trajectories = lattice_gen.run_heading(np.pi)
+
+        # pi is a flip of 0, so no other start heading is searched
+        self.assertEqual(list(lattice_gen._quadrant1_end_poses.keys()), [0.0])
+
+        # Repeated calls and flips of a searched heading do not search again
+        candidate_trajectories = lattice_gen.statistics['candidate_trajectories']
+        self.assertIs(lattice_gen.run_heading(np.pi), trajectories)
+        lattice_gen.run_heading(0.0)
+        self.assertEqual(
+            lattice_gen.statistics['candidate_trajectories'], candidate_trajectories
+        )
+
+        with self.assertRaises(ValueError):
+            lattice_gen.run_heading(0.1)
+
+    def test_run_does_not_reuse_earlier_searches(self):
+        # Test that minimal sets searched before a run with another
+        # stopping threshold are searched again by the run
+        lattice_gen = LatticeGenerator(dict(self.config, stopping_threshold=1))
+        lattice_gen.run_heading(0.0)
+
+        lattice_gen.stopping_threshold = STOPPING_THRESHOLD
+        minimal_set = lattice_gen.run()
+        expected_set = LatticeGenerator(self.config).run()
+
+        for start_angle, trajectories in expected_set.items():
+            self.assertEqual(
+                [t.path.to_output_format() for t in minimal_set[start_angle]],
+                [t.path.to_output_format() for t in trajectories],
+            )
+
 
 if __name__ == '__main__':
     unittest.main()
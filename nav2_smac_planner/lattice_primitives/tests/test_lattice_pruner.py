@@ -0,0 +1,131 @@
+# Copyright (c) 2021, Matthew Booker
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License. Reserved.
+
+from collections import Counter
+import unittest
+
+from generate_motion_primitives import create_output_dict
+from lattice_analyzer import get_branching_factors
+from lattice_generator import LatticeGenerator
+from lattice_pruner import (
+    create_pruning_report,
+    get_required_primitives,
+    prune,
+    rank_primitives,
+)
+import numpy as np
+
+CONFIG = {
+    'motion_model': 'omni',
+    'turning_radius': 0.5,
+    'grid_resolution': 0.1,
+    'stopping_threshold': 3,
+    'num_of_headings': 16,
+}
+
+
+class TestLatticePruner(unittest.TestCase):
+    """Contains the unit tests for the lattice pruner."""
+
+    @classmethod
+    def setUpClass(cls) -> None:
+        minimal_set_trajectories = LatticeGenerator(CONFIG).run()
+        cls.output = create_output_dict(minimal_set_trajectories, CONFIG)
+        cls.required = get_required_primitives(cls.output)
+
+    def test_required_primitives(self):
+        # Every start heading has one straight primitive and two in place
+        # turns
+        start_angle_indices = np.array(
+            [primitive['start_angle_index'] for primitive in self.output['primitives']]
+        )
+        self.assertTrue((np.bincount(start_angle_indices[self.required]) == 3).all())
+
+        for primitive in np.array(self.output['primitives'])[self.required]:
+            if primitive['trajectory_length'] > 0:
+                self.assertEqual(
+                    primitive['start_angle_index'], primitive['end_angle_index']
+                )
+
+    def test_marginal_coverage_never_increases(self):
+        rankings = rank_primitives(self.output, expansions=3)
+
+        self.assertEqual(
+            sorted(idx for ranking in rankings for idx, _ in ranking),
+            list(range(len(self.output['primitives']))),
+        )
+
+        for ranking in rankings:
+            # The required primitives are ranked first, then the others by
+            # decreasing marginal coverage
+            num_of_required = sum(self.required[idx] for idx, _ in ranking)
+            self.assertTrue(
+                all(self.required[idx] for idx, _ in ranking[:num_of_required])
+            )
+
+            marginal_coverage = [coverage for _, coverage in ranking[num_of_required:]]
+            self.assertEqual(marginal_coverage, sorted(marginal_coverage, reverse=True))
+
+    def test_prune_respects_budget(self):
+        pruned_output = prune(self.output, 4, expansions=3)
+        primitives = pruned_output['primitives']
+
+        # The budget does not include the straight and in place turn
+        # primitives
+        self.assertTrue((get_branching_factors(pruned_output) == 4 + 3).all())
+        self.assertEqual(
+            [primitive['trajectory_id'] for primitive in primitives],
+            list(range(len(primitives))),
+        )
+        self.assertEqual(
+            pruned_output['lattice_metadata']['number_of_trajectories'], len(primitives)
+        )
+
+        # Kept primitives are unchanged apart from their id
+        original = Counter(
+            str(dict(primitive, trajectory_id=0)) for primitive in self.output['primitives']
+        )
+        for primitive in primitives:
+            self.assertIn(str(dict(primitive, trajectory_id=0)), original)
+
+        report = create_pruning_report(self.output, pruned_output, 3)
+
+        self.assertGreater(report['coverage_lost'], 0)
+        self.assertLess(report['coverage_lost'], 1)
+
+    def test_zero_budget_keeps_required_primitives(self):
+        pruned_output = prune(self.output, 0, expansions=3)
+
+        self.assertEqual(
+            pruned_output['primitives'],
+            [
+                dict(primitive, trajectory_id=trajectory_id)
+                for trajectory_id, primitive in enumerate(
+                    np.array(self.output['primitives'])[self.required]
+                )
+            ],
+        )
+
+    def test_large_budget_keeps_everything(self):
+        budget = get_branching_factors(self.output).max()
+        pruned_output = prune(self.output, budget, expansions=3)
+
+        self.assertEqual(pruned_output['primitives'], self.output['primitives'])
+        self.assertEqual(
+            create_pruning_report(self.output, pruned_output, 3)['coverage_lost'], 0
+        )
+
+
+if __name__ == '__main__':
+    unittest.main()
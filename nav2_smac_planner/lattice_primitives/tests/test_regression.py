@@ -0,0 +1,149 @@
+# Copyright (c) 2021, Matthew Booker
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License. Reserved.
+
+import copy
+import json
+from pathlib import Path
+import tempfile
+import unittest
+
+import numpy as np
+from regression import (
+    check_golden_outputs,
+    compare_outputs,
+    DEFAULT_GOLDEN_DIR,
+    generate_output,
+    get_golden_name,
+    read_baseline_report,
+    read_golden_output,
+    read_manifest,
+    record_golden_outputs,
+)
+
+CONFIG = {
+    'motion_model': 'diff',
+    'turning_radius': 0.5,
+    'grid_resolution': 0.1,
+    'stopping_threshold': 2,
+    'num_of_headings': 16,
+}
+
+
+class TestRegression(unittest.TestCase):
+    """Contains the unit tests for the regression check."""
+
+    @classmethod
+    def setUpClass(cls) -> None:
+        cls.output, _ = generate_output(CONFIG)
+
+    def test_compare_finds_changed_primitives(self):
+        self.assertEqual(compare_outputs(self.output, copy.deepcopy(self.output)), [])
+
+        # Differences within the tolerance are accepted
+        output = copy.deepcopy(self.output)
+        output['primitives'][3]['poses'][-1][0] += 1e-6
+        self.assertEqual(compare_outputs(self.output, output), [])
+
+        output['primitives'][3]['poses'][-1][0] += 1e-3
+        differences = compare_outputs(self.output, output)
+        self.assertEqual(len(differences), 1)
+        self.assertIn('trajectory 3 positions', differences[0])
+
+        output = copy.deepcopy(self.output)
+        output['primitives'][5]['end_angle_index'] += 1
+        del output['primitives'][7]
+        differences = compare_outputs(self.output, output)
+        self.assertIn('trajectory ids missing: [7]', differences)
+        self.assertTrue(
+            any(
+                difference.startswith('trajectory 5 end_angle_index')
+                for difference in differences
+            )
+        )
+
+    def test_yaws_wrap_around(self):
+        output = copy.deepcopy(self.output)
+
+        for primitive in output['primitives']:
+            for pose in primitive['poses']:
+                if pose[2] == 0:
+                    pose[2] = 2 * np.pi - 1e-7
+
+        self.assertEqual(compare_outputs(self.output, output), [])
+
+    def test_record_and_check(self):
+        other_config = dict(CONFIG, motion_model='omni')
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            golden_dir = Path(temp_dir)
+            record_golden_outputs([CONFIG, other_config], golden_dir)
+            record_golden_outputs([other_config], golden_dir, note='re-recorded')
+
+            manifest = read_manifest(golden_dir)
+            results = check_golden_outputs(golden_dir)
+
+        # Recording a config again keeps the other entries of the manifest
+        self.assertEqual(len(manifest), 2)
+        self.assertNotIn('note', manifest[get_golden_name(CONFIG)])
+        self.assertEqual(manifest[get_golden_name(other_config)]['note'], 're-recorded')
+
+        self.assertEqual(len(results), 2)
+        self.assertTrue(all(result['passed'] for result in results))
+
+    def test_wall_times_compared_with_baseline_report(self):
+        other_config = dict(CONFIG, motion_model='omni')
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            golden_dir = Path(temp_dir)
+            record_golden_outputs([CONFIG, other_config], golden_dir)
+
+            # Reports of benchmark.py hold their results next to the
+            # environment
+            report_path = golden_dir / 'baseline.json'
+            report_path.write_text(
+                json.dumps({'results': [{'config': CONFIG, 'wall_time': 100.0}]})
+            )
+            baseline_wall_times = read_baseline_report(report_path)
+
+            report_path.write_text(json.dumps([{'config': CONFIG, 'wall_time': 100.0}]))
+            self.assertEqual(read_baseline_report(report_path), baseline_wall_times)
+
+            results = check_golden_outputs(
+                golden_dir, baseline_wall_times=baseline_wall_times
+            )
+
+        self.assertEqual(results[0]['baseline_wall_time'], 100.0)
+        self.assertEqual(results[0]['wall_time_delta'], results[0]['wall_time'] - 100.0)
+
+        # Configs missing from the baseline report are not compared
+        self.assertNotIn('wall_time_delta', results[1])
+
+    def test_generator_matches_stored_golden_outputs(self):
+        # The lattices with 32 headings are only checked by running
+        # regression.py since they take several seconds each
+        for name, entry in read_manifest(DEFAULT_GOLDEN_DIR).items():
+            if entry['config']['num_of_headings'] != 16:
+                continue
+
+            output, _ = generate_output(entry['config'])
+
+            self.assertEqual(
+                compare_outputs(read_golden_output(DEFAULT_GOLDEN_DIR / name), output),
+                [],
+                name,
+            )
+
+
+if __name__ == '__main__':
+    unittest.main()
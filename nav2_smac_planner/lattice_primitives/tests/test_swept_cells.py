@@ -0,0 +1,127 @@
+# Copyright (c) 2021, Matthew Booker
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License. Reserved.
+
+from pathlib import Path
+import tempfile
+import unittest
+
+from generate_motion_primitives import (
+    create_output_dict,
+    write_to_json,
+    write_to_json_stream,
+)
+from lattice_generator import LatticeGenerator
+import numpy as np
+from swept_cells import (
+    decode_runs,
+    encode_runs,
+    get_swept_cells,
+    parse_footprint,
+)
+
+CONFIG = {
+    'motion_model': 'diff',
+    'turning_radius': 0.5,
+    'grid_resolution': 0.1,
+    'stopping_threshold': 3,
+    'num_of_headings': 16,
+}
+
+FOOTPRINT = '[[0.3, 0.2], [0.3, -0.2], [-0.3, -0.2], [-0.3, 0.2]]'
+
+
+class TestSweptCells(unittest.TestCase):
+    """Contains the unit tests for the swept cells of a footprint."""
+
+    def test_runs_round_trip(self):
+        cells = np.array([[0, 0], [0, 1], [0, 2], [0, 4], [1, -1], [-2, 3], [0, 1]])
+
+        runs = encode_runs(cells)
+
+        self.assertEqual(runs, [[-2, 3, 1], [0, 0, 3], [0, 4, 1], [1, -1, 1]])
+        self.assertEqual(
+            sorted(map(tuple, decode_runs(runs).tolist())),
+            sorted(set(map(tuple, cells.tolist()))),
+        )
+        self.assertEqual(decode_runs([]).shape, (0, 2))
+
+    def test_straight_motion_sweeps_a_rectangle(self):
+        footprint = parse_footprint('[[0.12, 0.12], [0.12, -0.12], [-0.12, -0.12], [-0.12, 0.12]]')
+        poses = [[0.0, 0.0, 0.0], [0.1, 0.0, 0.0], [0.2, 0.0, 0.0], [0.3, 0.0, 0.0]]
+
+        runs = encode_runs(get_swept_cells(poses, footprint, 0.1))
+
+        self.assertEqual(runs, [[x, -1, 3] for x in range(-1, 5)])
+
+    def test_rotation_sweeps_cells_between_poses(self):
+        footprint = parse_footprint('[[0.5, 0.02], [0.5, -0.02], [-0.02, -0.02], [-0.02, 0.02]]')
+        poses = [[0.0, 0.0, 0.0], [0.0, 0.0, np.pi / 2]]
+
+        cells = set(map(tuple, get_swept_cells(poses, footprint, 0.1).tolist()))
+
+        # The far end of the footprint passes through these cells between
+        # the two poses
+        self.assertIn((4, 2), cells)
+        self.assertIn((3, 3), cells)
+        self.assertIn((2, 4), cells)
+        self.assertNotIn((4, -1), cells)
+        self.assertNotIn((-1, 4), cells)
+
+    def test_parse_footprint_rejects_invalid_polygons(self):
+        with self.assertRaises(ValueError):
+            parse_footprint('[[0.5, 0.3], [0.5, -0.3]]')
+
+        with self.assertRaises(ValueError):
+            parse_footprint('not a footprint')
+
+    def test_output_holds_swept_cells_of_every_primitive(self):
+        footprint = parse_footprint(FOOTPRINT)
+        minimal_set = LatticeGenerator(CONFIG).run()
+
+        output = create_output_dict(minimal_set, CONFIG, footprint)
+
+        self.assertEqual(output['lattice_metadata']['footprint'], footprint.tolist())
+
+        for primitive in output['primitives']:
+            cells = set(map(tuple, decode_runs(primitive['swept_cells']).tolist()))
+            end_cell = tuple(
+                np.round(np.array(primitive['poses'][-1][:2]) / 0.1).astype(int).tolist()
+            )
+
+            self.assertIn((0, 0), cells)
+            self.assertIn(end_cell, cells)
+
+        self.assertNotIn('swept_cells', create_output_dict(minimal_set, CONFIG)['primitives'][0])
+
+        # Streaming gives the same file with swept cells
+        with tempfile.TemporaryDirectory() as temp_dir:
+            json_path = Path(temp_dir) / 'output.json'
+            stream_path = Path(temp_dir) / 'stream.json'
+
+            write_to_json(json_path, minimal_set, CONFIG, footprint)
+
+            lattice_gen = LatticeGenerator(CONFIG)
+            write_to_json_stream(
+                stream_path,
+                lattice_gen.run_streaming(),
+                CONFIG,
+                lattice_gen.headings,
+                footprint,
+            )
+
+            self.assertEqual(json_path.read_text(), stream_path.read_text())
+
+
+if __name__ == '__main__':
+    unittest.main()
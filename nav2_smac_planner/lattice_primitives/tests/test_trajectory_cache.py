@@ -0,0 +1,146 @@
+# Copyright (c) 2021, Matthew Booker
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License. Reserved.
+
+from pathlib import Path
+import tempfile
+import unittest
+
+from lattice_generator import LatticeGenerator
+import numpy as np
+from trajectory_cache import TrajectoryCache
+from trajectory_generator import TrajectoryGenerator
+
+CONFIG = {
+    'motion_model': 'ackermann',
+    'turning_radius': 0.5,
+    'grid_resolution': 0.05,
+    'stopping_threshold': 5,
+    'num_of_headings': 16,
+}
+
+
+class TestTrajectoryCache(unittest.TestCase):
+    """Contains the unit tests for the TrajectoryCache."""
+
+    def setUp(self) -> None:
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.cache_path = Path(self.temp_dir.name) / 'cache.db'
+        self.cache = TrajectoryCache(self.cache_path)
+
+    def tearDown(self) -> None:
+        self.cache.close()
+        self.temp_dir.cleanup()
+
+    def test_trajectory_round_trip(self):
+        # Test that a cached trajectory is identical to the generated one
+        trajectory = TrajectoryGenerator(CONFIG).generate_trajectory(
+            np.array([0.6, 0.2]), 0.0, np.arctan2(1, 1), CONFIG['grid_resolution']
+        )
+
+        key = self.cache.trajectory_key(
+            CONFIG, np.array([0.6, 0.2]), 0.0, np.arctan2(1, 1), 0.05
+        )
+        self.assertIsNone(self.cache.get_trajectory(key))
+
+        self.cache.put_trajectory(key, trajectory)
+        cached = self.cache.get_trajectory(key)
+
+        np.testing.assert_array_equal(cached.path.xs, trajectory.path.xs)
+        np.testing.assert_array_equal(cached.path.ys, trajectory.path.ys)
+        np.testing.assert_array_equal(cached.path.yaws, trajectory.path.yaws)
+        self.assertEqual(cached.parameters.left_turn, trajectory.parameters.left_turn)
+        self.assertEqual(
+            cached.parameters.total_length, trajectory.parameters.total_length
+        )
+
+    def test_keys_depend_on_config(self):
+        # Test that changing a relevant parameter changes the key
+        other_config = dict(CONFIG, turning_radius=1.0)
+
+        self.assertNotEqual(
+            self.cache.end_poses_key(CONFIG, 0.0),
+            self.cache.end_poses_key(other_config, 0.0),
+        )
+
+        self.assertNotEqual(
+            self.cache.end_poses_key(CONFIG, 0.0),
+            self.cache.end_poses_key(
+                dict(CONFIG, heading_scheme='custom', headings=[0.0]), 0.0
+            ),
+        )
+
+        # The motion model does not change the trajectories
+        self.assertEqual(
+            self.cache.end_poses_key(CONFIG, 0.0),
+            self.cache.end_poses_key(dict(CONFIG, motion_model='omni'), 0.0),
+        )
+
+        # Minimal sets are stored with the stopping threshold instead
+        self.assertEqual(
+            self.cache.end_poses_key(CONFIG, 0.0),
+            self.cache.end_poses_key(dict(CONFIG, stopping_threshold=2), 0.0),
+        )
+
+    def assertSameSets(self, expected_set, actual_set):
+        self.assertEqual(list(expected_set.keys()), list(actual_set.keys()))
+
+        for start_angle in expected_set.keys():
+            self.assertEqual(
+                len(expected_set[start_angle]), len(actual_set[start_angle])
+            )
+
+            for expected, actual in zip(
+                expected_set[start_angle], actual_set[start_angle]
+            ):
+                np.testing.assert_array_equal(expected.path.xs, actual.path.xs)
+                np.testing.assert_array_equal(expected.path.ys, actual.path.ys)
+                np.testing.assert_array_equal(expected.path.yaws, actual.path.yaws)
+
+    def test_cached_run_matches_uncached_run(self):
+        # Test that runs with a cold and a warm cache match a run without one
+        uncached_set = LatticeGenerator(CONFIG).run()
+
+        for _ in range(2):
+            self.assertSameSets(uncached_set, LatticeGenerator(CONFIG, self.cache).run())
+
+    def test_cached_run_with_other_stopping_threshold(self):
+        # Test that a cached minimal set is continued for a larger stopping
+        # threshold and cut short for a smaller one
+        small_config = dict(CONFIG, stopping_threshold=2)
+
+        LatticeGenerator(small_config, self.cache).run()
+
+        lattice_gen = LatticeGenerator(CONFIG, self.cache)
+        self.assertSameSets(LatticeGenerator(CONFIG).run(), lattice_gen.run())
+
+        # Only the wave fronts past the cached search are searched
+        uncached_gen = LatticeGenerator(CONFIG)
+        uncached_gen.run()
+        self.assertLess(
+            lattice_gen.statistics['candidate_trajectories'],
+            uncached_gen.statistics['candidate_trajectories'],
+        )
+
+        lattice_gen = LatticeGenerator(small_config, self.cache)
+        self.assertSameSets(LatticeGenerator(small_config).run(), lattice_gen.run())
+        self.assertEqual(lattice_gen.statistics['candidate_trajectories'], 0)
+
+        # The cache keeps the minimal set of the larger stopping threshold
+        lattice_gen = LatticeGenerator(CONFIG, self.cache)
+        lattice_gen.run()
+        self.assertEqual(lattice_gen.statistics['candidate_trajectories'], 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -245,6 +245,84 @@ class TestTrajectoryGenerator(unittest.TestCase):
 
         self.assertEqual(trajectory, None)
 
+    def test_generate_trajectory_path_matches_parameterization(self):
+        # Line to arc to line, turning left and right
+        for end_point, end_angle in [
+            (np.array([3, 2]), np.deg2rad(90)),
+            (np.array([3, -2]), -np.deg2rad(90)),
+        ]:
+            trajectory = self.trajectory_generator.generate_trajectory(
+                end_point, np.deg2rad(0), end_angle, STEP_DISTANCE
+            )
+            params = trajectory.parameters
+
+            # Start of the path lies on the start line
+            x, y = self.trajectory_generator._get_line_point(
+                np.array([0, 0]), params.arc_start_point, 0.1
+            )
+            self.assertAlmostEqual(x, 0.1 * params.arc_start_point[0])
+            self.assertAlmostEqual(y, 0.1 * params.arc_start_point[1])
+            self.assertEqual(trajectory.path.yaws[0], params.start_angle)
+
+            # Every point on the arc is a turning radius away from the center
+            arc_xs, arc_ys, _ = self.trajectory_generator._get_arc_point(
+                params, np.linspace(0, 1, 10)
+            )
+            np.testing.assert_allclose(
+                np.hypot(arc_xs - params.x_offset, arc_ys - params.y_offset),
+                params.turning_radius,
+                atol=0.0001,
+            )
+
+            # End of the path is exactly the end pose
+            self.assertEqual(trajectory.path.xs[-1], end_point[0])
+            self.assertEqual(trajectory.path.ys[-1], end_point[1])
+            self.assertEqual(trajectory.path.yaws[-1], end_angle)
+
+            # Samples are evenly spaced along the path
+            steps = np.hypot(
+                np.diff(trajectory.path.xs), np.diff(trajectory.path.ys)
+            )
+            np.testing.assert_allclose(steps, steps[0], atol=0.01)
+
+    def test_batch_parameters_match_single(self):
+        # Test that solving many end points at once gives the same
+        # parameters as solving them one at a time
+        coords = np.arange(-2, 2.05, 0.25)
+        end_points = np.array([(x, y) for x in coords for y in coords])
+        angles = np.deg2rad([-180, -135, -90, -45, 0, 30, 45, 90, 135])
+
+        for start_angle in angles:
+            for end_angle in angles:
+                batch = self.trajectory_generator.generate_trajectory_parameters_batch(
+                    end_points, start_angle, end_angle
+                )
+
+                self.assertEqual(len(batch), len(end_points))
+
+                for idx, end_point in enumerate(end_points):
+                    params = self.trajectory_generator.generate_trajectory_parameters(
+                        end_point, start_angle, end_angle
+                    )
+                    batch_params = batch.get(idx)
+
+                    self.assertEqual(batch.valid[idx], params is not None)
+
+                    if params is None:
+                        self.assertIsNone(batch_params)
+                        continue
+
+                    self.assertEqual(batch_params.turning_radius, params.turning_radius)
+                    self.assertEqual(batch_params.x_offset, params.x_offset)
+                    self.assertEqual(batch_params.y_offset, params.y_offset)
+                    self.assertEqual(batch_params.left_turn, params.left_turn)
+                    np.testing.assert_array_equal(
+                        batch_params.arc_start_point, params.arc_start_point
+                    )
+                    np.testing.assert_array_equal(
+                        batch_params.arc_end_point, params.arc_end_point
+                    )
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,75 @@
+# Copyright (c) 2021, Matthew Booker
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License. Reserved.
+
+from pathlib import Path
+import tempfile
+import unittest
+import xml.etree.ElementTree as ET
+
+from generate_motion_primitives import save_svg_overview, save_visualizations
+from lattice_generator import LatticeGenerator
+
+CONFIG = {
+    'motion_model': 'ackermann',
+    'turning_radius': 0.5,
+    'grid_resolution': 0.1,
+    'stopping_threshold': 3,
+    'num_of_headings': 16,
+}
+
+
+class TestVisualizations(unittest.TestCase):
+    """Contains the unit tests for saving the visualizations."""
+
+    @classmethod
+    def setUpClass(cls) -> None:
+        cls.minimal_set_trajectories = LatticeGenerator(CONFIG).run()
+
+    def test_parallel_rendering_saves_the_same_images(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            serial_folder = Path(temp_dir) / 'serial'
+            parallel_folder = Path(temp_dir) / 'parallel'
+
+            save_visualizations(serial_folder, self.minimal_set_trajectories)
+            save_visualizations(parallel_folder, self.minimal_set_trajectories, jobs=2)
+
+            serial_images = sorted(path.name for path in serial_folder.iterdir())
+            parallel_images = sorted(path.name for path in parallel_folder.iterdir())
+
+        # One image of every trajectory and one per start angle from 0 to 90
+        self.assertEqual(len(serial_images), 6)
+        self.assertIn('all_trajectories.png', serial_images)
+        self.assertEqual(serial_images, parallel_images)
+
+    def test_svg_overview_draws_every_trajectory(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            output_path = Path(temp_dir) / 'overview.svg'
+
+            save_svg_overview(output_path, self.minimal_set_trajectories)
+
+            root = ET.parse(output_path).getroot()
+
+        polylines = root.findall('.//{http://www.w3.org/2000/svg}polyline')
+
+        self.assertEqual(
+            len(polylines),
+            sum(
+                len(trajectories)
+                for trajectories in self.minimal_set_trajectories.values()
+            ),
+        )
+
+
+if __name__ == '__main__':
+    unittest.main()
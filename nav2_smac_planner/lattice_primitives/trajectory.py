@@ -91,6 +91,60 @@ class TrajectoryParameters:
         )
 
 
+@dataclass(frozen=True)
+class TrajectoryParametersBatch:
+    """
+    A dataclass that holds the trajectory parameters of many end points.
+
+    Every trajectory shares the same start and end angle. The fields of
+    trajectories that are not valid hold meaningless values.
+
+    turning_radius: The radius of the circle of each trajectory
+    x_offset: The x coordinate of the circle of each trajectory
+    y_offset: The y coordinate of the circle of each trajectory
+    end_points: The end coordinates of the paths
+    start_angle: The starting angle shared by the paths
+    end_angle: The end angle shared by the paths
+    left_turn: Whether the arc of each path turns to the left
+    arc_start_points: Coordinates of the starting position of each arc
+    arc_end_points: Coordinates of the ending position of each arc
+    valid: Whether a valid trajectory exists for each end point
+    """
+
+    turning_radius: np.array
+    x_offset: np.array
+    y_offset: np.array
+    end_points: np.array
+    start_angle: float
+    end_angle: float
+    left_turn: np.array
+
+    arc_start_points: np.array
+    arc_end_points: np.array
+    valid: np.array
+
+    def __len__(self):
+        """Return the number of end points in the batch."""
+        return len(self.valid)
+
+    def get(self, idx):
+        """Return the TrajectoryParameters at idx, or None if it is not valid."""
+        if not self.valid[idx]:
+            return None
+
+        return TrajectoryParameters(
+            turning_radius=self.turning_radius[idx],
+            x_offset=self.x_offset[idx],
+            y_offset=self.y_offset[idx],
+            end_point=self.end_points[idx],
+            start_angle=self.start_angle,
+            end_angle=self.end_angle,
+            left_turn=self.left_turn[idx],
+            arc_start_point=self.arc_start_points[idx],
+            arc_end_point=self.arc_end_points[idx],
+        )
+
+
 @dataclass(frozen=True)
 class Path:
     """
@@ -124,10 +178,7 @@ class Path:
         # A bit of a hack but it removes any -0.0
         output_xs = output_xs + 0.0
         output_ys = output_ys + 0.0
-        output_yaws = self.yaws + 0.0
-
-        vectorized_normalize_angle = np.vectorize(normalize_angle)
-        output_yaws = vectorized_normalize_angle(output_yaws)
+        output_yaws = normalize_angle(self.yaws + 0.0)
 
         stacked = np.vstack([output_xs, output_ys, output_yaws]).transpose()
 
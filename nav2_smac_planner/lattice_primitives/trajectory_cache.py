@@ -0,0 +1,325 @@
+# Copyright (c) 2021, Matthew Booker
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License. Reserved.
+
+import hashlib
+from pathlib import Path as FilePath
+import sqlite3
+from typing import Union
+
+import constants
+
+from heading_table import DEFAULT_HEADING_SCHEME
+
+import numpy as np
+
+from trajectory import Path, Trajectory, TrajectoryParameters
+
+# Number of values used to store the TrajectoryParameters of a trajectory
+PARAMETERS_SIZE = 12
+
+
+class TrajectoryCache:
+    """
+    A persistent on-disk cache of generated lattice data.
+
+    Entries are stored in an SQLite database and are addressed by a hash
+    of everything that determines their content, so a cache file can be
+    shared between runs with different configurations. The cache version
+    is part of every key so entries from older versions of the generator
+    are never reused.
+    """
+
+    def __init__(self, cache_path: FilePath):
+        """Init the cache from the path of its database file."""
+        self.cache_path = cache_path
+        self._connection = None
+
+    def __getstate__(self) -> dict:
+        """Drop the database connection when pickling the cache."""
+        state = self.__dict__.copy()
+        state['_connection'] = None
+        return state
+
+    @property
+    def connection(self) -> sqlite3.Connection:
+        """Lazily open the database connection."""
+        if self._connection is None:
+            self._connection = sqlite3.connect(self.cache_path)
+            self._connection.execute(
+                'CREATE TABLE IF NOT EXISTS entries (key TEXT PRIMARY KEY, data BLOB)'
+            )
+
+        return self._connection
+
+    def _make_key(self, *values) -> str:
+        """
+        Create a content address from the values that define an entry.
+
+        Floats are hashed through their exact hexadecimal representation.
+
+        Returns
+        -------
+        str
+            The hex digest identifying the entry
+
+        """
+        parts = [str(constants.CACHE_VERSION)]
+
+        for value in values:
+            if isinstance(value, (float, np.floating)):
+                parts.append(float(value).hex())
+            else:
+                parts.append(str(value))
+
+        return hashlib.sha256('|'.join(parts).encode()).hexdigest()
+
+    def _get(self, key: str) -> Union[np.array, None]:
+        """Return the array stored at key or None if it is missing."""
+        row = self.connection.execute(
+            'SELECT data FROM entries WHERE key = ?', (key,)
+        ).fetchone()
+
+        if row is None:
+            return None
+
+        return np.frombuffer(row[0], dtype=np.float64)
+
+    def _put(self, key: str, data: np.array) -> None:
+        """Store an array at key."""
+        self.connection.execute(
+            'INSERT OR REPLACE INTO entries (key, data) VALUES (?, ?)',
+            (key, np.ascontiguousarray(data, dtype=np.float64).tobytes()),
+        )
+
+    def trajectory_key(
+        self,
+        config: dict,
+        end_point: np.array,
+        start_angle: float,
+        end_angle: float,
+        primitive_resolution: float,
+    ) -> str:
+        """
+        Return the key of a trajectory generated with the given config.
+
+        Args:
+        config: dict
+            The user supplied config the trajectory was generated with
+        end_point: np.array(2,)
+            The end point of the trajectory
+        start_angle: float
+            The start angle of the trajectory in radians
+        end_angle: float
+            The end angle of the trajectory in radians
+        primitive_resolution: float
+            The spacing between points along the trajectory
+
+        Returns
+        -------
+        str
+            The key of the trajectory
+
+        """
+        return self._make_key(
+            'trajectory',
+            config['turning_radius'],
+            config['grid_resolution'],
+            end_point[0],
+            end_point[1],
+            start_angle,
+            end_angle,
+            primitive_resolution,
+        )
+
+    def get_trajectory(self, key: str) -> Union[Trajectory, None]:
+        """
+        Return the cached trajectory stored at key.
+
+        Args:
+        key: str
+            The key returned by trajectory_key
+
+        Returns
+        -------
+        Trajectory or None
+            The cached trajectory, or None if it is not in the cache
+
+        """
+        data = self._get(key)
+
+        if data is None:
+            return None
+
+        (
+            turning_radius,
+            x_offset,
+            y_offset,
+            end_x,
+            end_y,
+            start_angle,
+            end_angle,
+            left_turn,
+            arc_start_x,
+            arc_start_y,
+            arc_end_x,
+            arc_end_y,
+        ) = data[:PARAMETERS_SIZE]
+
+        parameters = TrajectoryParameters(
+            turning_radius=turning_radius,
+            x_offset=x_offset,
+            y_offset=y_offset,
+            end_point=np.array([end_x, end_y]),
+            start_angle=start_angle,
+            end_angle=end_angle,
+            left_turn=np.bool_(left_turn),
+            arc_start_point=np.array([arc_start_x, arc_start_y]),
+            arc_end_point=np.array([arc_end_x, arc_end_y]),
+        )
+
+        xs, ys, yaws = data[PARAMETERS_SIZE:].reshape(3, -1).copy()
+
+        return Trajectory(Path(xs, ys, yaws), parameters)
+
+    def put_trajectory(self, key: str, trajectory: Trajectory) -> None:
+        """
+        Store a trajectory at key.
+
+        Args:
+        key: str
+            The key returned by trajectory_key
+        trajectory: Trajectory
+            The trajectory to store
+
+        """
+        params = trajectory.parameters
+
+        data = np.concatenate(
+            (
+                [
+                    params.turning_radius,
+                    params.x_offset,
+                    params.y_offset,
+                    params.end_point[0],
+                    params.end_point[1],
+                    params.start_angle,
+                    params.end_angle,
+                    params.left_turn,
+                    params.arc_start_point[0],
+                    params.arc_start_point[1],
+                    params.arc_end_point[0],
+                    params.arc_end_point[1],
+                ],
+                trajectory.path.xs,
+                trajectory.path.ys,
+                trajectory.path.yaws,
+            )
+        )
+
+        self._put(key, data)
+
+    def end_poses_key(self, config: dict, start_heading: float) -> str:
+        """
+        Return the key of the minimal set searched for a start heading.
+
+        The stopping threshold is not part of the key. A minimal set is
+        stored with the stopping threshold it was searched with, so a search
+        with a different threshold can continue or cut short the stored set.
+
+        Args:
+        config: dict
+            The user supplied config the minimal set was searched with
+        start_heading: float
+            The start heading that was searched
+
+        Returns
+        -------
+        str
+            The key of the minimal set
+
+        """
+        return self._make_key(
+            'end_poses',
+            config['turning_radius'],
+            config['grid_resolution'],
+            config['num_of_headings'],
+            config.get('heading_scheme', DEFAULT_HEADING_SCHEME),
+            config.get('headings'),
+            start_heading,
+        )
+
+    def get_end_poses(self, key: str) -> Union[tuple, None]:
+        """
+        Return the cached minimal set of end poses stored at key.
+
+        Args:
+        key: str
+            The key returned by end_poses_key
+
+        Returns
+        -------
+        tuple or None
+            A list of (end_point, end_angle) tuples and the stopping
+            threshold it was searched with, or None if the minimal set is
+            not in the cache
+
+        """
+        data = self._get(key)
+
+        if data is None:
+            return None
+
+        end_poses = [(pose[:2].copy(), pose[2]) for pose in data[1:].reshape(-1, 3)]
+
+        return end_poses, int(data[0])
+
+    def put_end_poses(self, key: str, end_poses: list, stopping_threshold: int) -> None:
+        """
+        Store a minimal set of end poses at key.
+
+        Args:
+        key: str
+            The key returned by end_poses_key
+        end_poses: list
+            A list of (end_point, end_angle) tuples
+        stopping_threshold: int
+            The stopping threshold the minimal set was searched with
+
+        """
+        data = np.concatenate(
+            (
+                [stopping_threshold],
+                np.reshape(
+                    [
+                        [end_point[0], end_point[1], end_angle]
+                        for end_point, end_angle in end_poses
+                    ],
+                    -1,
+                ),
+            )
+        )
+
+        self._put(key, data)
+
+    def commit(self) -> None:
+        """Write all stored entries to disk."""
+        if self._connection is not None:
+            self._connection.commit()
+
+    def close(self) -> None:
+        """Write all stored entries to disk and close the database."""
+        if self._connection is not None:
+            self._connection.commit()
+            self._connection.close()
+            self._connection = None
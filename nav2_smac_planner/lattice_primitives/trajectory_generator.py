@@ -17,7 +17,7 @@ from typing import Tuple, Union
 
 import numpy as np
 
-from trajectory import Path, Trajectory, TrajectoryParameters
+from trajectory import Path, Trajectory, TrajectoryParameters, TrajectoryParametersBatch
 
 logger = logging.getLogger(__name__)
 
@@ -30,7 +30,7 @@ class TrajectoryGenerator:
         self.turning_radius = config['turning_radius']
 
     def _get_arc_point(
-        self, trajectory_params: TrajectoryParameters, t: float
+        self, trajectory_params: TrajectoryParameters, t: Union[float, np.array]
     ) -> Tuple[float, float, float]:
         """
         Get point on the arc trajectory using the following parameterization.
@@ -45,17 +45,18 @@ class TrajectoryGenerator:
         ----
         trajectory_params: TrajectoryParameters
             The parameters that describe the arc to create
-        t: float
+        t: float or np.array(N,)
             A value between 0 - 1 that denotes where along the arc
-            to calculate the point
+            to calculate the point. An array of values gives arrays
+            of coordinates and yaws
 
         Returns
         -------
-        x: float
+        x: float or np.array(N,)
             x coordinate of generated point
-        y: float
+        y: float or np.array(N,)
             y coordinate of generated point
-        yaw: float
+        yaw: float or np.array(N,)
             angle of tangent line to arc at point (x,y)
 
         """
@@ -101,8 +102,8 @@ class TrajectoryGenerator:
         return x, y, yaw
 
     def _get_line_point(
-        self, start_point: np.array, end_point: np.array, t: float
-    ) -> Tuple[float, float]:
+        self, start_point: np.array, end_point: np.array, t: Union[float, np.array]
+    ) -> np.array:
         """
         Get point on a line segment using the following parameterization.
 
@@ -117,19 +118,18 @@ class TrajectoryGenerator:
             Starting point of the line segment
         end_point: np.array(2,)
             End point of the line segment
-        t: float
+        t: float or np.array(N,)
             A value between 0 - 1 that denotes where along the segment
-            to calculate the point
+            to calculate the point. An array of values gives one point
+            per value
 
         Returns
         -------
-        x: float
-            x coordinate of generated point
-        y: float
-            y coordinate of generated point
+        np.array(2,) or np.array(N, 2)
+            The x and y coordinates of the generated point(s)
 
         """
-        return start_point + t * (end_point - start_point)
+        return start_point + np.multiply.outer(t, end_point - start_point)
 
     def _create_path(
         self, trajectory_params: TrajectoryParameters, primitive_resolution: float
@@ -166,50 +166,49 @@ class TrajectoryGenerator:
             / trajectory_params.total_length,
         ]
 
-        cur_t = t_step
-
-        xs = []
-        ys = []
-        yaws = []
-
-        for i in range(1, number_of_steps + 1):
+        # Accumulate the steps the same way a point by point walk along the
+        # path would and prevent t going over 1 due to rounding issues in t_step
+        ts = np.minimum(np.cumsum(np.full(number_of_steps, t_step)), 1)
 
-            # This prevents cur_t going over 1 due to rounding issues in t_step
-            cur_t = min(cur_t, 1)
-
-            # Handle the initial straight line segment
-            if cur_t <= transition_points[0]:
-                line_t = cur_t / transition_points[0]
-                x, y = self._get_line_point(
-                    np.array([0, 0]), trajectory_params.arc_start_point, line_t
-                )
-                yaw = trajectory_params.start_angle
-
-            # Handle the arc
-            elif cur_t <= transition_points[1]:
-                arc_t = (cur_t - transition_points[0]) / (
-                    transition_points[1] - transition_points[0]
-                )
-                x, y, yaw = self._get_arc_point(trajectory_params, arc_t)
-
-            # Handle the end straight line segment
-            else:
-                line_t = (cur_t - transition_points[1]) / (1 - transition_points[1])
-                x, y = self._get_line_point(
-                    trajectory_params.arc_end_point, trajectory_params.end_point, line_t
-                )
-                yaw = trajectory_params.end_angle
+        xs = np.empty(number_of_steps)
+        ys = np.empty(number_of_steps)
+        yaws = np.empty(number_of_steps)
 
-            xs.append(x)
-            ys.append(y)
-            yaws.append(yaw)
+        start_line_mask = ts <= transition_points[0]
+        arc_mask = ~start_line_mask & (ts <= transition_points[1])
+        end_line_mask = ~start_line_mask & ~arc_mask
 
-            cur_t += t_step
-
-        # Convert to numpy arrays
-        xs = np.array(xs)
-        ys = np.array(ys)
-        yaws = np.array(yaws)
+        # Handle the initial straight line segment
+        if start_line_mask.any():
+            line_ts = ts[start_line_mask] / transition_points[0]
+            points = self._get_line_point(
+                np.array([0, 0]), trajectory_params.arc_start_point, line_ts
+            )
+            xs[start_line_mask] = points[:, 0]
+            ys[start_line_mask] = points[:, 1]
+            yaws[start_line_mask] = trajectory_params.start_angle
+
+        # Handle the arc
+        if arc_mask.any():
+            arc_ts = (ts[arc_mask] - transition_points[0]) / (
+                transition_points[1] - transition_points[0]
+            )
+            x, y, yaw = self._get_arc_point(trajectory_params, arc_ts)
+            xs[arc_mask] = x
+            ys[arc_mask] = y
+            yaws[arc_mask] = yaw
+
+        # Handle the end straight line segment
+        if end_line_mask.any():
+            line_ts = (ts[end_line_mask] - transition_points[1]) / (
+                1 - transition_points[1]
+            )
+            points = self._get_line_point(
+                trajectory_params.arc_end_point, trajectory_params.end_point, line_ts
+            )
+            xs[end_line_mask] = points[:, 0]
+            ys[end_line_mask] = points[:, 1]
+            yaws[end_line_mask] = trajectory_params.end_angle
 
         # The last point may be slightly off due to rounding issues
         # so we correct the last point to be exactly the end point
@@ -251,53 +250,56 @@ class TrajectoryGenerator:
 
         return np.array([x_point, line1(x_point)])
 
-    def _is_left_turn(self, intersection_point: np.array, end_point: np.array) -> bool:
+    def _is_left_turn(
+        self, intersection_point: np.array, end_point: np.array
+    ) -> Union[bool, np.array]:
         """
         Determine if a trajectory will be a left turn.
 
         Uses the determinant to determine whether the arc formed by the
-        intersection and end point turns left or right.
+        intersection and end point turns left or right. Arrays of points
+        are checked row by row.
 
         Args
         ----
-        intersection_point: np.array(2,)
+        intersection_point: np.array(2,) or np.array(N, 2)
             The intersection point of the lines formed from the start
             and end angles
-        end_point: np.array(2,)
+        end_point: np.array(2,) or np.array(N, 2)
             The chosen end point of the trajectory
 
         Returns
         -------
-        bool
+        bool or np.array(N,)
             True if curve turns left, false otherwise
 
         """
-        matrix = np.vstack([intersection_point, end_point])
+        matrix = np.stack([intersection_point, end_point], axis=-2)
         det = np.linalg.det(matrix)
 
         return det >= 0
 
     def _is_dir_vec_correct(
         self, point1: np.array, point2: np.array, line_angle: float
-    ) -> bool:
+    ) -> Union[bool, np.array]:
         """
         Check that the direction vector agrees with the line angle.
 
         The direction vector is defined as the vector from point 1 to
-        point 2.
+        point 2. Arrays of points are checked row by row.
 
         Args
         ----
-        point1: np.array(2,)
+        point1: np.array(2,) or np.array(N, 2)
             The start point of the vector
-        point2: np.array(2,)
+        point2: np.array(2,) or np.array(N, 2)
             The end point of the vector
         line_angle: float
             The angle of a line to compare against the vector
 
         Returns
         -------
-        bool
+        bool or np.array(N,)
             True if both line and vector point in same direction
 
         """
@@ -320,12 +322,31 @@ class TrajectoryGenerator:
         direction_vec_from_gradient = direction_vec_from_gradient.round(5)
         direction_vec_from_points = direction_vec_from_points.round(5)
 
-        if np.all(
-            np.sign(direction_vec_from_points) == np.sign(direction_vec_from_gradient)
-        ):
-            return True
-        else:
-            return False
+        return np.all(
+            np.sign(direction_vec_from_points) == np.sign(direction_vec_from_gradient),
+            axis=-1,
+        )
+
+    def _get_row_norms(self, vectors: np.array) -> np.array:
+        """
+        Calculate the length of every row of an array of vectors.
+
+        Each row is multiplied with itself through matmul, which uses the
+        same dot product as np.linalg.norm of a single vector, so a batch
+        gives every end point the same lengths as a batch of one.
+
+        Args
+        ----
+        vectors: np.array(N, 2)
+            The vectors to measure
+
+        Returns
+        -------
+        np.array(N,)
+            The length of each vector
+
+        """
+        return np.sqrt((vectors[:, np.newaxis, :] @ vectors[:, :, np.newaxis])[:, 0, 0])
 
     def _calculate_trajectory_params(
         self, end_point: np.array, start_angle: float, end_angle: float
@@ -333,9 +354,38 @@ class TrajectoryGenerator:
         """
         Calculate the parameters for a trajectory with the desired constraints.
 
-        The trajectory may consist of an arc and at most two line segments.
-        A straight trajectory will consist of a single line segment. Similarly,
-        a purely curving trajectory will only consist of an arc.
+        The end point is solved as a batch of one by
+        _calculate_trajectory_params_batch.
+
+        Args
+        ----
+        end_point: np.array(2,)
+            The desired end point of the trajectory
+        start_angle: float
+            The start angle of the trajectory in radians
+        end_angle: float
+            The end angle of the trajectory in radians
+
+        Returns
+        -------
+        TrajectoryParameters or None
+            If a valid trajectory exists then the Trajectory parameters
+            are returned, otherwise None
+
+        """
+        return self._calculate_trajectory_params_batch(
+            np.array([end_point]), start_angle, end_angle
+        ).get(0)
+
+    def _calculate_trajectory_params_batch(
+        self, end_points: np.array, start_angle: float, end_angle: float
+    ) -> TrajectoryParametersBatch:
+        """
+        Calculate the parameters of the trajectories to many end points.
+
+        Each trajectory may consist of an arc and at most two line segments.
+        A straight trajectory will consist of a single line segment.
+        Similarly, a purely curving trajectory will only consist of an arc.
 
         Idea:
             1. Extend a line from (0,0) with angle of start_angle
@@ -350,178 +400,129 @@ class TrajectoryGenerator:
         If two segments from the same exterior point are tangent to
         a circle then they are congruent
 
+        Every end point is solved at once. End points without a valid
+        trajectory are marked in the validity mask.
+
         Args
         ----
-        end_point: np.array(2,)
-            The desired end point of the trajectory
+        end_points: np.array(N, 2)
+            The desired end points of the trajectories
         start_angle: float
-            The start angle of the trajectory in radians
+            The start angle of the trajectories in radians
         end_angle: float
-            The end angle of the trajectory in radians
+            The end angle of the trajectories in radians
 
         Returns
         -------
-        TrajectoryParameters or None
-            If a valid trajectory exists then the Trajectory parameters
-            are returned, otherwise None
+        TrajectoryParametersBatch
+            The parameters of the trajectory to each end point along with
+            whether it is valid
 
         """
-        x2, y2 = end_point
-        arc_start_point = np.array([0, 0])
-        arc_end_point = end_point
+        end_points = np.asarray(end_points, dtype=np.float64)
+        x2s, y2s = end_points[:, 0], end_points[:, 1]
+        number_of_points = len(end_points)
 
-        # Find gradient of line 1 passing through (0,0) that makes an angle
-        # of start_angle with x_axis
         m1 = np.tan(start_angle).round(5)
-
-        # Find gradient of line 2 passing through end point that makes an angle
-        # of end_angle with x-axis
         m2 = np.tan(end_angle).round(5)
 
-        # Deal with lines that are parallel
+        # Deal with lines that are parallel. Only end points on line 1
+        # can be reached, with a straight line
         if m1 == m2:
-            # If they are coincident (i.e. y-intercept is same) then simply
-            # return a circle with infinite radius
-            if round(-m2 * x2 + y2, 5) == 0:
-                return TrajectoryParameters.no_arc(
-                    end_point=end_point, start_angle=start_angle, end_angle=end_angle
-                )
+            valid = np.round(-m2 * x2s + y2s, 5) == 0
 
             # Deal with edge case of 90
-            elif (
-                abs(start_angle) == np.pi / 2 and arc_end_point[0] == arc_start_point[0]
-            ):
-                return TrajectoryParameters.no_arc(
-                    end_point=end_point,
-                    start_angle=start_angle,
-                    end_angle=end_angle,
-                )
-
-            else:
-                logger.debug(
-                    'No trajectory possible for equivalent start and '
-                    + f'end angles that also passes through p = {x2, y2}'
-                )
-                return None
-
-        # Find intersection point of lines 1 and 2
-        intersection_point = self._get_intersection_point(m1, 0, m2, -m2 * x2 + y2)
-
-        # Check that the vector from (0,0) to intersection point agrees
-        # with the angle of line 1
-        if not self._is_dir_vec_correct(
-            arc_start_point, intersection_point, start_angle
-        ):
-            logger.debug(
-                'No trajectory possible since intersection point occurs '
-                + 'before start point on line 1'
+            if abs(start_angle) == np.pi / 2:
+                valid |= x2s == 0
+
+            return TrajectoryParametersBatch(
+                turning_radius=np.zeros(number_of_points),
+                x_offset=np.zeros(number_of_points),
+                y_offset=np.zeros(number_of_points),
+                end_points=end_points,
+                start_angle=start_angle,
+                end_angle=end_angle,
+                left_turn=np.ones(number_of_points, dtype=bool),
+                arc_start_points=end_points,
+                arc_end_points=end_points,
+                valid=valid,
             )
-            return None
 
-        # Check that the vector from intersection point to arc start point agrees with
-        # the angle of line 2
-        if not self._is_dir_vec_correct(intersection_point, arc_end_point, end_angle):
-            logger.debug(
-                'No trajectory possible since intersection point occurs '
-                + 'after end point on line 2'
+        # Values of end points without a valid trajectory may divide by zero
+        with np.errstate(divide='ignore', invalid='ignore'):
+            # Find intersection points of lines 1 and 2
+            intersection_points = self._get_intersection_point(
+                m1, 0, m2, -m2 * x2s + y2s
+            ).T
+
+            # The intersection point must lie after the start point on line 1
+            # and before the end point on line 2
+            valid = self._is_dir_vec_correct(
+                np.zeros(2), intersection_points, start_angle
+            ) & self._is_dir_vec_correct(intersection_points, end_points, end_angle)
+
+            dist_a = self._get_row_norms(intersection_points).round(5)
+            dist_b = self._get_row_norms(end_points - intersection_points).round(5)
+
+            angle_between_lines = np.pi - abs(end_angle - start_angle)
+            min_valid_distance = round(
+                self.turning_radius / np.tan(angle_between_lines / 2), 5
             )
-            return None
 
-        # Calculate distance between arc start point and intersection point
-        dist_a = round(np.linalg.norm(arc_start_point - intersection_point), 5)
-
-        # Calculate distance between arc end point and intersection point
-        dist_b = round(np.linalg.norm(arc_end_point - intersection_point), 5)
-
-        # Calculate the angle between start angle and end angle lines
-        angle_between_lines = np.pi - abs(end_angle - start_angle)
-
-        # The closer the arc start and end points are to the intersection point the
-        # smaller the turning radius will be. However, we have a constraint on how
-        # small this turning radius can get. To calculate the minimum allowed
-        # distance we draw a right triangle with height equal to the constrained
-        # radius and angle opposite the height leg as half the angle between the
-        # start and end angle lines. The minimum valid distance is then the
-        # base of this triangle.
-        min_valid_distance = round(
-            self.turning_radius / np.tan(angle_between_lines / 2), 5
-        )
+            valid &= (dist_a >= min_valid_distance) & (dist_b >= min_valid_distance)
 
-        # Both the distance of p along line 2 and intersection point along
-        # line 1 must be greater than the minimum valid distance
-        if dist_a < min_valid_distance or dist_b < min_valid_distance:
-            logger.debug(
-                'No trajectory possible where radius is larger than '
-                + 'minimum turning radius'
+            # Move the farther of the arc start and end point along its line
+            # so both are equidistant from the intersection point
+            vec_line2 = end_points - intersection_points
+            vec_line2 /= self._get_row_norms(vec_line2)[:, np.newaxis]
+            arc_end_points = np.where(
+                (dist_a < dist_b)[:, np.newaxis],
+                intersection_points + dist_a[:, np.newaxis] * vec_line2,
+                end_points,
             )
-            return None
-
-        if dist_a < dist_b:
-            # Find new point on line 2 that is equidistant away from
-            # intersection point as arc start point is on line 1
-            vec_line2 = arc_end_point - intersection_point
-            vec_line2 /= np.linalg.norm(vec_line2)
-            arc_end_point = intersection_point + dist_a * vec_line2
-
-        elif dist_a > dist_b:
-            # Find new point on line 1 that is equidistant away from
-            # intersection point as arc end point is on line 2
-            vec_line1 = arc_start_point - intersection_point
-            vec_line1 /= np.linalg.norm(vec_line1)
-
-            arc_start_point = intersection_point + dist_b * vec_line1
-
-        x1, y1 = arc_start_point
-        x2, y2 = arc_end_point
-
-        # Find intersection point of the perpindicular lines of line 1 and 2
-        # that pass through arc start and arc end point respectively
-        if m1 == 0:
-            # If line 1 has gradient 0 then it is the x-axis.
-
-            def perp_line2(x):
-                return -1 / m2 * (x - x2) + y2
-
-            circle_center = np.array([x1, perp_line2(x1)])
-        elif m2 == 0:
-
-            def perp_line1(x):
-                return -1 / m1 * (x - x1) + y1
 
-            circle_center = np.array([x2, perp_line1(x2)])
-        else:
-            perp_m1 = -1 / m1 if m1 != 0 else 0
-            perp_m2 = -1 / m2 if m2 != 0 else 0
-
-            circle_center = self._get_intersection_point(
-                perp_m1, -perp_m1 * x1 + y1, perp_m2, -perp_m2 * x2 + y2
+            vec_line1 = np.zeros(2) - intersection_points
+            vec_line1 /= self._get_row_norms(vec_line1)[:, np.newaxis]
+            arc_start_points = np.where(
+                (dist_a > dist_b)[:, np.newaxis],
+                intersection_points + dist_b[:, np.newaxis] * vec_line1,
+                0.0,
             )
 
-        # The circles radius is the length from the center to arc start/end point
-        # (both distances are the same)
-        radius = np.linalg.norm(circle_center - arc_end_point).round(5)
-        x_offset = circle_center[0].round(5)
-        y_offset = circle_center[1].round(5)
-
-        if radius < self.turning_radius:
-            logger.debug(
-                'Calculated circle radius is smaller than allowed turning '
-                + f'radius: r = {radius}, min_radius = {self.turning_radius}'
-            )
-            return None
+            x1s, y1s = arc_start_points[:, 0], arc_start_points[:, 1]
+            x2s, y2s = arc_end_points[:, 0], arc_end_points[:, 1]
 
-        left_turn = self._is_left_turn(intersection_point, end_point)
-
-        return TrajectoryParameters(
-            radius,
-            x_offset,
-            y_offset,
-            end_point,
-            start_angle,
-            end_angle,
-            left_turn,
-            arc_start_point,
-            arc_end_point,
+            # Find intersection points of the perpindicular lines of line 1
+            # and 2 that pass through arc start and arc end points
+            if m1 == 0:
+                circle_centers = np.stack([x1s, -1 / m2 * (x1s - x2s) + y2s], axis=1)
+            elif m2 == 0:
+                circle_centers = np.stack([x2s, -1 / m1 * (x2s - x1s) + y1s], axis=1)
+            else:
+                perp_m1 = -1 / m1
+                perp_m2 = -1 / m2
+
+                circle_centers = self._get_intersection_point(
+                    perp_m1, -perp_m1 * x1s + y1s, perp_m2, -perp_m2 * x2s + y2s
+                ).T
+
+            radius = self._get_row_norms(circle_centers - arc_end_points).round(5)
+
+            valid &= radius >= self.turning_radius
+
+        left_turn = self._is_left_turn(intersection_points, end_points)
+
+        return TrajectoryParametersBatch(
+            turning_radius=radius,
+            x_offset=circle_centers[:, 0].round(5),
+            y_offset=circle_centers[:, 1].round(5),
+            end_points=end_points,
+            start_angle=start_angle,
+            end_angle=end_angle,
+            left_turn=left_turn,
+            arc_start_points=arc_start_points,
+            arc_end_points=arc_end_points,
+            valid=valid,
         )
 
     def generate_trajectory(
@@ -555,13 +556,87 @@ class TrajectoryGenerator:
             otherwise None
 
         """
-        trajectory_params = self._calculate_trajectory_params(
+        trajectory_params = self.generate_trajectory_parameters(
             end_point, start_angle, end_angle
         )
 
         if trajectory_params is None:
             return None
 
+        return self.generate_trajectory_from_parameters(
+            trajectory_params, primitive_resolution
+        )
+
+    def generate_trajectory_parameters(
+        self, end_point: np.array, start_angle: float, end_angle: float
+    ) -> Union[TrajectoryParameters, None]:
+        """
+        Calculate the parameters of a trajectory without sampling its path.
+
+        This allows a trajectory to be screened from its analytic geometry
+        before paying for the creation of its path.
+
+        Args
+        ----
+        end_point: np.array(2,)
+            The desired end point of the trajectory
+        start_angle: float
+            The start angle of the trajectory in radians
+        end_angle: float
+            The end angle of the trajectory in radians
+
+        Returns
+        -------
+        TrajectoryParameters or None
+            If a valid trajectory exists then the Trajectory parameters
+            are returned, otherwise None
+
+        """
+        return self._calculate_trajectory_params(end_point, start_angle, end_angle)
+
+    def generate_trajectory_parameters_batch(
+        self, end_points: np.array, start_angle: float, end_angle: float
+    ) -> TrajectoryParametersBatch:
+        """
+        Calculate the parameters of the trajectories to many end points at once.
+
+        Args
+        ----
+        end_points: np.array(N, 2)
+            The desired end points of the trajectories
+        start_angle: float
+            The start angle of the trajectories in radians
+        end_angle: float
+            The end angle of the trajectories in radians
+
+        Returns
+        -------
+        TrajectoryParametersBatch
+            The parameters of the trajectory to each end point along with
+            a mask of the end points that have a valid trajectory
+
+        """
+        return self._calculate_trajectory_params_batch(end_points, start_angle, end_angle)
+
+    def generate_trajectory_from_parameters(
+        self, trajectory_params: TrajectoryParameters, primitive_resolution: float
+    ) -> Trajectory:
+        """
+        Create a trajectory by sampling the path of the given parameters.
+
+        Args
+        ----
+        trajectory_params: TrajectoryParameters
+            The parameters that describe the trajectory to create
+        primitive_resolution: float
+            The spacing between points along the trajectory
+
+        Returns
+        -------
+        Trajectory
+            The trajectory described by the trajectory parameters
+
+        """
         logger.debug('Trajectory found')
 
         trajectory_path = self._create_path(trajectory_params, primitive_resolution)